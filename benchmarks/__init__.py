@@ -0,0 +1 @@
+# headless benchmarks of package_vacuum, run with `python -m benchmarks`
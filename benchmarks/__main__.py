@@ -0,0 +1,89 @@
+import sys
+import json
+import time
+import platform
+import argparse
+
+from . import standins
+
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+
+
+def parseArgs(argv):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description="benchmark package_vacuum outside of Maya")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="synthetic module table sizes")
+    parser.add_argument('--repeat', type=int, default=5, help="runs per benchmark, the median is compared")
+    parser.add_argument('--output', help="write results as json to this file")
+    parser.add_argument('--compare', help="json results of a previous run to check for regressions")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="allowed slowdown ratio when comparing")
+    parser.add_argument('--no-qt', action='store_true', help="skip benchmarks of Qt models and views")
+    return parser.parse_args(argv)
+
+def compareResults(current, baseline, tolerance):
+    # returns lines describing benchmarks slower than baseline beyond tolerance
+    previous = dict(((r['name'], r['size']), r) for r in baseline['results'])
+    regressions = []
+    for result in current['results']:
+        old = previous.get((result['name'], result['size']))
+        if old is None or old['median_ms'] <= 0:
+            continue
+        ratio = result['median_ms'] / old['median_ms']
+        if ratio > 1.0 + tolerance:
+            regressions.append("{0} [{1}]: {2:.3f}ms -> {3:.3f}ms (x{4:.2f})".format(
+                result['name'], result['size'], old['median_ms'], result['median_ms'], ratio))
+    return regressions
+
+def main(argv=None):
+    args = parseArgs(sys.argv[1:] if argv is None else argv)
+
+    standins.installMayaStandins()
+    binding = None
+    if not args.no_qt:
+        binding = standins.findQtBinding()
+        if binding is None:
+            sys.stderr.write("no PySide2 or PySide6 found, skipping Qt benchmarks\n")
+        else:
+            standins.createApplication()
+
+    from . import suite
+
+    results = []
+    for size in args.sizes:
+        benchmarks = suite.runModuleBenchmarks(size, args.repeat)
+        if binding is not None:
+            benchmarks += suite.runQtBenchmarks(size, args.repeat)
+
+        for benchmark in benchmarks:
+            result = benchmark.toDict()
+            results.append(result)
+            print("{0:<40} {1:>7} {2:>12.3f}ms".format(result['name'], result['size'], result['median_ms']))
+
+    report = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'qt': binding,
+            'repeat': args.repeat,
+        },
+        'results': results,
+    }
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compareResults(report, json.load(f), args.tolerance)
+        for line in regressions:
+            sys.stderr.write("regression: {0}\n".format(line))
+        if regressions:
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,77 @@
+import os
+import sys
+import types
+import tempfile
+
+
+def findQtBinding():
+    for binding in ('PySide6', 'PySide2'):
+        try:
+            __import__(binding)
+            return binding
+        except ImportError:
+            pass
+    return None
+
+def _createModule(name, **attrs):
+    mod = types.ModuleType(name)
+    mod.__file__ = '<package_vacuum benchmark stand-in>'
+    for key, value in attrs.items():
+        setattr(mod, key, value)
+    return mod
+
+def installMayaStandins(mayaLocation=None):
+    # local `maya` package good enough for package_vacuum to import outside of
+    # Maya, returns the MAYA_LOCATION in use
+    if 'maya' in sys.modules and not getattr(sys.modules['maya'], '__standin__', False):
+        raise RuntimeError("a real maya package is already imported")
+
+    if mayaLocation is None:
+        mayaLocation = os.environ.get('MAYA_LOCATION') or tempfile.mkdtemp(prefix='maya_standin_')
+    os.environ['MAYA_LOCATION'] = mayaLocation
+
+    # the Qt shim picks the binding from the api version
+    apiVersion = 20250000 if findQtBinding() == 'PySide6' else 20220000
+
+    class MGlobal(object):
+        @staticmethod
+        def apiVersion():
+            return apiVersion
+
+    class MQtUtil(object):
+        @staticmethod
+        def mainWindow():
+            return 0
+
+    maya = _createModule('maya', __standin__=True, __path__=[])
+    openMaya = _createModule('maya.OpenMaya', MGlobal=MGlobal)
+    openMayaUI = _createModule('maya.OpenMayaUI', MQtUtil=MQtUtil)
+    cmds = _createModule('maya.cmds')
+    mel = _createModule('maya.mel')
+
+    maya.OpenMaya = openMaya
+    maya.OpenMayaUI = openMayaUI
+    maya.cmds = cmds
+    maya.mel = mel
+
+    sys.modules.update({
+        'maya': maya,
+        'maya.OpenMaya': openMaya,
+        'maya.OpenMayaUI': openMayaUI,
+        'maya.cmds': cmds,
+        'maya.mel': mel,
+    })
+
+    return mayaLocation
+
+def createApplication():
+    # real Qt widgets rendered offscreen, must run before any widget is created
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+    import package_vacuum.Qt
+    import PySide.QtWidgets as QtWidgets
+
+    app = QtWidgets.QApplication.instance()
+    if app is None:
+        app = QtWidgets.QApplication([sys.argv[0]])
+    return app
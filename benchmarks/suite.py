@@ -0,0 +1,127 @@
+import gc
+import sys
+import time
+
+from .synthetic import SyntheticModuleTable
+
+
+class Benchmark(object):
+    def __init__(self, name, size, times):
+        self.name = name
+        self.size = size
+        self.times = sorted(times)
+
+    def toDict(self):
+        times = self.times
+        return {
+            'name': self.name,
+            'size': self.size,
+            'repeat': len(times),
+            'min_ms': times[0] * 1000.0,
+            'median_ms': times[len(times) // 2] * 1000.0,
+            'mean_ms': sum(times) / len(times) * 1000.0,
+        }
+
+
+def measure(func, repeat, setup=None):
+    times = []
+    gcEnabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            if setup is not None:
+                setup()
+            started = time.perf_counter()
+            func()
+            times.append(time.perf_counter() - started)
+    finally:
+        if gcEnabled:
+            gc.enable()
+    return times
+
+
+def runModuleBenchmarks(size, repeat):
+    import package_vacuum.module as module
+    import package_vacuum.fuzzy as fuzzy
+
+    results = []
+
+    def bench(name, func, setup=None):
+        results.append(Benchmark(name, size, measure(func, repeat, setup)))
+
+    with SyntheticModuleTable(size) as table:
+        module.refreshModules()
+        namespace = table.namespace + '.pkg0'
+        cascadeNames = [n for n in table.names if n == namespace or n.startswith(namespace + '.')]
+        churnNames = table.names[-100:]
+
+        bench('refreshModules.idle', module.refreshModules)
+
+        def unloadChurn():
+            # the timed refresh then finds 100 new modules
+            for name in churnNames:
+                sys.modules.pop(name, None)
+            module.refreshModules()
+            table.install(churnNames)
+        bench('refreshModules.churn100', module.refreshModules, setup=unloadChurn)
+
+        bench('filterModules.text', lambda: module.filterModules('mod5', ignoreInternal=True))
+        bench('filterModules.expression', lambda: module.filterModules(table.namespace + '.pkg1*,!*.mod9', ignoreInternal=True))
+        bench('findModulesByQualifyName', lambda: module.findModulesByQualifyName(namespace, ignoreInternal=True))
+        def reloadCascade():
+            table.install(cascadeNames)
+            module.refreshModules()
+        bench('vacuum.cascade', lambda: module.vacuum(namespace, ignoreInternal=True), setup=reloadCascade)
+        bench('vacuum.dryRun', lambda: module.vacuum(table.namespace, ignoreInternal=True, dryRun=True))
+
+        fuzzy.getFuzzyIndex().snapshot()
+        bench('fuzzySearch', lambda: fuzzy.getFuzzyIndex().snapshot().search('pkg1sub2', 200))
+        bench('fuzzySearch.broad', lambda: fuzzy.getFuzzyIndex().snapshot().search('mod', 200))
+
+    module.refreshModules()
+    return results
+
+
+def runQtBenchmarks(size, repeat):
+    import PySide.QtCore as QtCore
+    from package_vacuum.ui.selectionview import SelectionView
+    from package_vacuum.ui.logview import LogView, LogLevel
+    from .synthetic import generateNames
+
+    app = QtCore.QCoreApplication.instance()
+    results = []
+
+    def bench(name, func, setup=None):
+        def run():
+            func()
+            app.processEvents()
+        results.append(Benchmark(name, size, measure(run, repeat, setup)))
+
+    names = sorted(generateNames(size))
+    shifted = sorted(names[size // 100:] + [n + '_new' for n in names[:size // 100]])
+
+    view = SelectionView()
+    view.resize(400, 600)
+    view.show()
+    model = view.model()
+
+    bench('SelectionListModel.setItems.reset', lambda: model.setItems(names), setup=model.clear)
+    bench('SelectionListModel.setItems.merge', lambda: model.setItems(shifted), setup=lambda: model.setItems(names))
+
+    model.setItems(names)
+    first, last = model.index(0, 0), model.index(size - 1, 0)
+    bench('SelectionListModel.selectAll', model.selectAll)
+    bench('SelectionListModel.invertSelection', model.invertSelection)
+    bench('SelectionListModel.selectRange', lambda: model.selectRange(first, last, True))
+    bench('SelectionListModel.getSelectedItems', model.getSelectedItems)
+    view.close()
+
+    logView = LogView(history=True)
+    logView.resize(400, 300)
+    logView.show()
+    burst = [("cleaned module: [ {0} ]".format(n), LogLevel.NORMAL) for n in names[:500]]
+    bench('LogView.writeLogs.burst500', lambda: logView.writeLogs(burst))
+    bench('LogView.search', lambda: logView.model().setFilter('mod5'))
+    logView.close()
+
+    return results
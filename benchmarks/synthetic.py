@@ -0,0 +1,64 @@
+import os
+import sys
+import types
+import itertools
+
+
+NAMESPACE = 'pvbench'
+BRANCHING = 10
+
+
+def _iterNames(namespace):
+    yield namespace
+    p = 0
+    while True:
+        pkg = '{0}.pkg{1}'.format(namespace, p)
+        yield pkg
+        for s in range(BRANCHING):
+            sub = '{0}.sub{1}'.format(pkg, s)
+            yield sub
+            for m in range(BRANCHING):
+                yield '{0}.mod{1}'.format(sub, m)
+        p += 1
+
+def generateNames(size, namespace=NAMESPACE):
+    # dotted names shaped like real packages: `namespace.pkgN.subN.modN`, every
+    # package is also a module of its own
+    return list(itertools.islice(_iterNames(namespace), size))
+
+
+class SyntheticModuleTable(object):
+    # installs `size` fake modules into sys.modules, about `internalRatio` of
+    # them look like they come from MAYA_LOCATION
+    def __init__(self, size, internalRatio=0.3, namespace=NAMESPACE):
+        self.namespace = namespace
+        self.names = generateNames(size, namespace)
+        self._modules = {}
+
+        mayaLocation = os.environ['MAYA_LOCATION']
+        studioRoot = os.path.join(os.path.dirname(mayaLocation), 'studio_standin')
+        internalEvery = int(round(1.0 / internalRatio)) if internalRatio > 0 else 0
+
+        for i, name in enumerate(self.names):
+            root = mayaLocation if internalEvery and i % internalEvery == 0 else studioRoot
+            mod = types.ModuleType(name)
+            mod.__file__ = os.path.join(root, *name.split('.')) + '.py'
+            self._modules[name] = mod
+
+    def __enter__(self):
+        self.install()
+        return self
+
+    def __exit__(self, *args):
+        self.uninstall()
+
+    def install(self, names=None):
+        modules = self._modules
+        if names is None:
+            sys.modules.update(modules)
+        else:
+            sys.modules.update((n, modules[n]) for n in names)
+
+    def uninstall(self):
+        for name in self.names:
+            sys.modules.pop(name, None)
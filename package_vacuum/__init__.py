@@ -4,23 +4,33 @@ __version__ = '1.0.2'
 import sys
 import os.path
 
-import package_vacuum.Qt
+from . import importprofile
+from . import baseline
 
-from shiboken import wrapInstance
-from PySide.QtCore import Qt
-from PySide.QtWidgets import QMainWindow
+# Qt, Maya and the ui package are only imported once a window or shelf button
+# is asked for, importing this package for the headless `module` api stays cheap
 
-import maya.OpenMayaUI as omui
-import maya.cmds as cmds
-import maya.mel as mel
-
-from .ui import MainWindow
+# imports made after this package, e.g. from userSetup, can be timed from the start
+importprofile.installFromEnvironment()
+# modules loaded by the time startup finished, the usual target to clean back to
+baseline.recordFromEnvironment()
 
 
 gToolWindowInstance = None
 
 
+def _getMainWindowClass():
+    import package_vacuum.Qt
+    from .ui import MainWindow
+
+    return MainWindow
+
 def getMayaMainWindow():
+    import package_vacuum.Qt
+    from shiboken import wrapInstance
+    from PySide.QtWidgets import QMainWindow
+    import maya.OpenMayaUI as omui
+
     if sys.version_info.major >= 3:
         return wrapInstance(int(omui.MQtUtil.mainWindow()), QMainWindow)
     else:
@@ -33,6 +43,9 @@ def resetGlobalWindowReference():
 def showToolWindow(singleInstance=False):
     global gToolWindowInstance
 
+    MainWindow = _getMainWindowClass()
+    from PySide.QtCore import Qt
+
     if singleInstance:
         if not gToolWindowInstance:
             gToolWindowInstance = MainWindow(parent=getMayaMainWindow())
@@ -48,6 +61,9 @@ def showToolWindow(singleInstance=False):
         return uiwindow
 
 def saveToShelf():
+    import maya.cmds as cmds
+    import maya.mel as mel
+
     shelf = mel.eval("$__tempShelf = $gShelfTopLevel")
     shelfTab = cmds.tabLayout(shelf, query=True, selectTab=True)
 
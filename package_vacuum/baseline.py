@@ -0,0 +1,80 @@
+import os
+import time
+
+import package_vacuum.module as module
+
+
+# baseline recorded once the host application finished starting
+STARTUP_BASELINE = 'startup'
+ENV_RECORD_BASELINE = 'PACKAGE_VACUUM_BASELINE'
+
+
+class BaselineNotFoundException(Exception):
+    pass
+
+
+class Baseline(object):
+    __slots__ = ('name', 'modules', 'created')
+
+    def __init__(self, name, modules, created):
+        self.name = name
+        # frozenset of module names loaded when recorded
+        self.modules = modules
+        self.created = created
+
+    def __len__(self):
+        return len(self.modules)
+
+    def __repr__(self):
+        return '<Baseline {0} modules={1}>'.format(self.name, len(self.modules))
+
+
+# baselines of this session by name, in recording order
+gBaselines = {}
+
+
+def record(name=STARTUP_BASELINE):
+    # snapshot of loaded module names, replaces a baseline of the same name
+    module.refreshModules()
+
+    baseline = Baseline(name, frozenset(module.gModuleTable.names()), time.time())
+    gBaselines.pop(name, None)
+    gBaselines[name] = baseline
+    return baseline
+
+def recordFromEnvironment():
+    # in maya the snapshot waits for startup to finish, userSetup runs before
+    # most of it is loaded
+    if os.environ.get(ENV_RECORD_BASELINE, '').strip() in ('', '0'):
+        return
+
+    try:
+        import maya.utils
+    except ImportError:
+        record()
+        return
+    maya.utils.executeDeferred(record)
+
+def getBaseline(name=STARTUP_BASELINE):
+    return gBaselines.get(name)
+
+def getBaselineNames():
+    return list(gBaselines)
+
+def removeBaseline(name):
+    return gBaselines.pop(name, None) is not None
+
+def findNewModules(name=STARTUP_BASELINE):
+    # names loaded since the baseline was recorded, sorted, this tool's own
+    # modules imported lazily since then are left out
+    baseline = gBaselines.get(name)
+    if baseline is None:
+        raise BaselineNotFoundException(name)
+
+    module.refreshModules()
+    return sorted(n for n in module.gModuleTable.names() if n not in baseline.modules and not module.isSelfModule(n))
+
+def vacuumToBaseline(name=STARTUP_BASELINE, ignoreInternal=True, dryRun=False, reclaim=False):
+    # cleans every module loaded since the baseline in one batch, internal
+    # ones are skipped with `ignoreInternal` as for any other clean
+    return module.vacuum(findNewModules(name), cascade=False, ignoreInternal=ignoreInternal, dryRun=dryRun, reclaim=reclaim)
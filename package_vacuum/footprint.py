@@ -0,0 +1,162 @@
+import gc
+import sys
+import types
+import weakref
+import threading
+
+import package_vacuum.module as module
+
+
+# objects walked per estimate at most, huge caches would stall the analysis
+MAX_OBJECTS = 200000
+
+
+def _isForeign(obj, owners):
+    # functions and classes defined in other modules are only referenced, they
+    # are retained by the module defining them
+    if isinstance(obj, (type, types.FunctionType, types.BuiltinFunctionType)):
+        return getattr(obj, '__module__', None) not in owners
+    return False
+
+def getModuleIds():
+    # ids of loaded modules and their globals, estimates stop at them
+    ids = set()
+    for m in list(sys.modules.values()):
+        ids.add(id(m))
+        ids.add(id(getattr(m, '__dict__', None)))
+    return ids
+
+def deepSize(modules, moduleIds=None, limit=MAX_OBJECTS):
+    # estimated bytes retained by `modules` together, every object reachable
+    # from their globals is counted once, other modules and what they define
+    # are left out, `moduleIds` can be shared by estimates made in a row
+    if moduleIds is None:
+        moduleIds = getModuleIds()
+    owners = set(getattr(m, '__name__', None) for m in modules)
+
+    seen = set()
+    total = 0
+    stack = []
+    for m in modules:
+        seen.add(id(m))
+        seen.add(id(m.__dict__))
+        total += sys.getsizeof(m) + sys.getsizeof(m.__dict__)
+        stack.extend(gc.get_referents(m.__dict__))
+
+    while stack and len(seen) < limit:
+        obj = stack.pop()
+        objId = id(obj)
+        if objId in seen or objId in moduleIds:
+            continue
+        seen.add(objId)
+
+        if isinstance(obj, types.ModuleType) or _isForeign(obj, owners):
+            continue
+
+        try:
+            total += sys.getsizeof(obj)
+        except TypeError:
+            continue
+        stack.extend(gc.get_referents(obj))
+
+    return total
+
+
+# size estimates by module identity, a module reloaded under the same name is
+# measured again, estimates of removed modules and their packages are dropped
+# from module table deltas
+#
+# estimates are computed on a worker thread and read from the gui thread, cache
+# access is locked
+class FootprintAnalyzer(object):
+    def __init__(self, table):
+        self._lock = threading.Lock()
+        # name: (weak reference to module, bytes)
+        self._modules = {}
+        # top-level package name: bytes
+        self._packages = {}
+
+        table.addListener(self.applyDelta)
+
+    def applyDelta(self, delta):
+        with self._lock:
+            for name in delta.removed:
+                self._modules.pop(name, None)
+            for name in delta.added:
+                self._modules.pop(name, None)
+            for name in delta.removed + delta.added:
+                self._packages.pop(name.partition('.')[0], None)
+
+    def invalidate(self):
+        with self._lock:
+            self._modules = {}
+            self._packages = {}
+
+    def cachedModuleSize(self, name, mod):
+        with self._lock:
+            entry = self._modules.get(name)
+        if entry is not None and entry[0]() is mod:
+            return entry[1]
+        return None
+
+    def cachedPackageSize(self, top):
+        with self._lock:
+            return self._packages.get(top)
+
+    def moduleSize(self, name, mod, moduleIds=None):
+        size = self.cachedModuleSize(name, mod)
+        if size is not None or not isinstance(mod, types.ModuleType):
+            return size
+
+        size = deepSize([mod], moduleIds)
+        with self._lock:
+            self._modules[name] = (weakref.ref(mod), size)
+        return size
+
+    def packageSize(self, top, modules, moduleIds=None):
+        # `modules` are every loaded module of the package, shared objects
+        # between them count once
+        size = self.cachedPackageSize(top)
+        if size is not None:
+            return size
+
+        size = deepSize([m for m in modules if isinstance(m, types.ModuleType)], moduleIds)
+        with self._lock:
+            self._packages[top] = size
+        return size
+
+
+gFootprintAnalyzer = None
+
+
+def getFootprintAnalyzer():
+    global gFootprintAnalyzer
+
+    module.refreshModules()
+    if gFootprintAnalyzer is None:
+        gFootprintAnalyzer = FootprintAnalyzer(module.gModuleTable)
+    return gFootprintAnalyzer
+
+def getPackageModules(top):
+    return [module.gModuleTable.get(n) for n in module.gModuleIndex.iterNamespace(top)]
+
+def getModuleSizes(names):
+    # {name: (module bytes, top-level package bytes)} of loaded modules
+    analyzer = getFootprintAnalyzer()
+    moduleIds = getModuleIds()
+
+    sizes = {}
+    for name in names:
+        mod = module.gModuleTable.get(name)
+        if mod is None:
+            continue
+        top = name.partition('.')[0]
+        sizes[name] = (analyzer.moduleSize(name, mod, moduleIds), analyzer.packageSize(top, getPackageModules(top), moduleIds))
+    return sizes
+
+def formatSize(size):
+    for unit in ('B', 'KB', 'MB'):
+        if size < 1024:
+            return '{0:.0f} {1}'.format(size, unit) if unit == 'B' else '{0:.1f} {1}'.format(size, unit)
+        size /= 1024.0
+    return '{0:.1f} GB'.format(size)
@@ -0,0 +1,298 @@
+import re
+import heapq
+import operator
+import itertools
+import threading
+from array import array
+
+import package_vacuum.module as module
+
+
+SEGMENT_BONUS = 16
+WORD_BONUS = 8
+CONSECUTIVE_BONUS = 10
+LAST_COMPONENT_BONUS = 4
+MAX_GAP_PENALTY = 8
+CHECK_INTERVAL = 1000
+
+
+def getBoundaries(lower):
+    # positions starting a dotted segment or a word inside one
+    return tuple(i for i in range(len(lower)) if i == 0 or lower[i - 1] in '._')
+
+def _findLimits(lower, query):
+    # latest position each query character can take with the rest of the query
+    # still fitting after it, None when `query` isn't a subsequence
+    limits = []
+    end = len(lower)
+    for c in reversed(query):
+        end = lower.rfind(c, 0, end)
+        if end < 0:
+            return None
+        limits.append(end)
+    limits.reverse()
+    return limits
+
+def matchPositions(lower, boundaries, query):
+    # greedy match preferring segment starts, then consecutive characters, then
+    # the leftmost occurrence, as long as the rest of the query still fits
+    limits = _findLimits(lower, query)
+    if limits is None:
+        return None
+
+    positions = []
+    pos = 0
+    start = 0
+    count = len(boundaries)
+    for c, limit in zip(query, limits):
+        chosen = -1
+
+        while start < count and boundaries[start] < pos:
+            start += 1
+        for k in range(start, count):
+            b = boundaries[k]
+            if b > limit:
+                break
+            if lower[b] == c:
+                chosen = b
+                break
+
+        if chosen < 0:
+            if positions and lower[pos] == c:
+                chosen = pos
+            else:
+                chosen = lower.find(c, pos)
+
+        positions.append(chosen)
+        pos = chosen + 1
+
+    return positions
+
+def score(lower, boundaries, query):
+    positions = matchPositions(lower, boundaries, query)
+    if positions is None:
+        return None
+
+    lastComponent = lower.rfind('.') + 1
+    result = 0
+    prev = -1
+    for p in positions:
+        if p == 0 or lower[p - 1] == '.':
+            result += SEGMENT_BONUS
+        elif lower[p - 1] == '_':
+            result += WORD_BONUS
+
+        if prev >= 0:
+            if p == prev + 1:
+                result += CONSECUTIVE_BONUS
+            else:
+                result -= min(p - prev - 1, MAX_GAP_PENALTY)
+
+        if p >= lastComponent:
+            result += LAST_COMPONENT_BONUS
+        prev = p
+
+    # prefer shallow names on equal matches
+    return result - lower.count('.')
+
+
+def getBoundKey(lower, boundaries):
+    # what the best possible score of a name depends on, the characters its
+    # segments and words start with, the ones of its last component and its
+    # depth
+    return (frozenset(lower[b] for b in boundaries), frozenset(lower[lower.rfind('.') + 1:]), lower.count('.'))
+
+def scoreBound(key, query):
+    # no name of bound `key` scores higher on `query`
+    starts, last, depth = key
+    result = CONSECUTIVE_BONUS * (len(query) - 1) - depth
+    for c in query:
+        if c in starts:
+            result += SEGMENT_BONUS
+        if c in last:
+            result += LAST_COMPONENT_BONUS
+    return result
+
+def compileCandidatePattern(query):
+    # matches names `query` is a subsequence of, each character class skips
+    # ahead to the next occurrence so no backtracking is needed
+    return re.compile(''.join('[^{0}]*{0}'.format(re.escape(c)) for c in query))
+
+
+# prefix cache of one searching thread, a query extending the previous one
+# only rechecks the previous candidates
+class FuzzySearchCache(object):
+    def __init__(self):
+        self.snapshot = None
+        self.query = None
+        self.candidates = None
+
+    def clear(self):
+        self.snapshot = self.query = self.candidates = None
+
+
+# immutable view of the fuzzy index, safe to search from any thread, state
+# kept between searches lives in the caller's `FuzzySearchCache`
+#
+# names sharing a bound key share a score bound, candidates are scored best
+# bound first and scoring stops once no remaining bound can enter the results
+class FuzzySnapshot(object):
+    def __init__(self, names, lowers, boundaries, boundKeys=None):
+        self._names = names
+        self._lowers = lowers
+        self._boundaries = boundaries
+
+        if boundKeys is None:
+            boundKeys = map(getBoundKey, lowers, boundaries)
+        groups = {}
+        self._groupOf = array('L', (groups.setdefault(key, len(groups)) for key in boundKeys))
+        self._boundKeys = list(groups)
+
+    def __len__(self):
+        return len(self._names)
+
+    def _findCandidates(self, query, cache):
+        # candidate indices in name order, the scan runs at C speed
+        match = compileCandidatePattern(query).match
+        lowers = self._lowers
+
+        if (cache is not None and cache.snapshot is self and
+                cache.query is not None and query.startswith(cache.query)):
+            return [i for i in cache.candidates if match(lowers[i]) is not None]
+        return list(itertools.compress(range(len(lowers)), map(match, lowers)))
+
+    def search(self, query, limit=200, accept=None, isCancelled=None, cache=None):
+        # returns up to `limit` (name, score) pairs, best first, or None when
+        # cancelled, `accept(name)` can veto names before ranking
+        query = ''.join(query.lower().split())
+        if not query:
+            return []
+
+        candidates = self._findCandidates(query, cache)
+        if cache is not None:
+            cache.snapshot = self
+            cache.query = query
+            cache.candidates = candidates
+
+        if limit <= 0:
+            return []
+
+        groupBounds = [scoreBound(key, query) for key in self._boundKeys]
+        bounds = list(map(groupBounds.__getitem__, map(self._groupOf.__getitem__, candidates)))
+        # characters of a pair missing from a name can't be consecutive, the
+        # bonus is lost and a gap paid, checked at C speed
+        lowers = self._lowers
+        candidateLowers = list(map(lowers.__getitem__, candidates))
+        for j in range(1, len(query)):
+            missing = map(operator.not_, map(operator.contains, candidateLowers, itertools.repeat(query[j - 1:j + 1])))
+            bounds = list(map(operator.sub, bounds, map((CONSECUTIVE_BONUS + 1).__mul__, missing)))
+        # a stable sort keeps candidates of equal bound in name order
+        order = sorted(range(len(candidates)), key=bounds.__getitem__, reverse=True)
+
+        names = self._names
+        boundaries = self._boundaries
+        # min heap of (score, -index), equal scores rank by name
+        best = []
+        for n, k in enumerate(order):
+            if isCancelled is not None and n % CHECK_INTERVAL == 0 and isCancelled():
+                return None
+
+            i = candidates[k]
+            # the rest is of lower bound or, at an equal one, later by name
+            if len(best) == limit and best[0] > (bounds[k], -i):
+                break
+
+            if accept is not None and not accept(names[i]):
+                continue
+
+            s = score(lowers[i], boundaries[i], query)
+            if s is None:
+                continue
+            entry = (s, -i)
+            if len(best) < limit:
+                heapq.heappush(best, entry)
+            elif entry > best[0]:
+                heapq.heapreplace(best, entry)
+
+        best.sort(reverse=True)
+        return [(names[-i], s) for s, i in best]
+
+
+# lowercased names and segment offsets of loaded modules, kept current from
+# module table deltas
+#
+# deltas are applied on the thread refreshing the table, snapshots are built
+# by whichever thread asks for one so a worker can take that cost
+class FuzzyIndex(object):
+    def __init__(self, table):
+        self._lock = threading.Lock()
+        # serializes snapshot builds, they run outside of `_lock`
+        self._buildLock = threading.Lock()
+        self._names = set(table.names())
+        self._version = 0
+        self._snapshot = None
+        self._snapshotVersion = -1
+        # name: (lower, boundaries, bound key), only touched while holding
+        # `_buildLock`
+        self._entries = {}
+
+        table.addListener(self.applyDelta)
+
+    def applyDelta(self, delta):
+        if not delta.removed and not delta.added:
+            return
+
+        with self._lock:
+            self._names.difference_update(delta.removed)
+            self._names.update(delta.added)
+            self._version += 1
+
+    def snapshot(self):
+        with self._buildLock:
+            with self._lock:
+                if self._snapshotVersion == self._version:
+                    return self._snapshot
+                version = self._version
+                names = sorted(self._names)
+
+            entries = self._entries
+            if len(entries) > 2 * len(names):
+                entries = self._entries = {n: entries[n] for n in names if n in entries}
+
+            lowers = []
+            boundaries = []
+            boundKeys = []
+            for name in names:
+                entry = entries.get(name)
+                if entry is None:
+                    lower = name.lower()
+                    nameBoundaries = getBoundaries(lower)
+                    entry = entries[name] = (lower, nameBoundaries, getBoundKey(lower, nameBoundaries))
+                lowers.append(entry[0])
+                boundaries.append(entry[1])
+                boundKeys.append(entry[2])
+            snapshot = FuzzySnapshot(names, lowers, boundaries, boundKeys)
+
+            with self._lock:
+                self._snapshot = snapshot
+                self._snapshotVersion = version
+            return snapshot
+
+
+gFuzzyIndex = None
+
+
+def getFuzzyIndex():
+    global gFuzzyIndex
+
+    module.refreshModules()
+    if gFuzzyIndex is None:
+        gFuzzyIndex = FuzzyIndex(module.gModuleTable)
+    return gFuzzyIndex
+
+def fuzzySearch(query, limit=200, ignoreInternal=False):
+    accept = None
+    if ignoreInternal:
+        accept = lambda name: not module.isInternalModule(module.gModuleTable.get(name))
+
+    return [name for name, _ in getFuzzyIndex().snapshot().search(query, limit, accept)]
@@ -0,0 +1,215 @@
+import os
+import sys
+import time
+import threading
+from array import array
+
+
+ENV_PROFILE_IMPORTS = 'PACKAGE_VACUUM_PROFILE_IMPORTS'
+
+
+# import times by module name in parallel arrays, a few bytes per module no
+# matter how many get imported, a re-import overwrites the previous row
+class ImportTimeTable(object):
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._rows = {}
+        self._names = []
+        # seconds
+        self._inclusive = array('d')
+        self._exclusive = array('d')
+        # times the module was imported while profiling
+        self._counts = array('L')
+
+    def __len__(self):
+        return len(self._names)
+
+    def __contains__(self, name):
+        return name in self._rows
+
+    def record(self, name, inclusive, exclusive):
+        with self._lock:
+            row = self._rows.get(name)
+            if row is None:
+                self._rows[name] = len(self._names)
+                self._names.append(name)
+                self._inclusive.append(inclusive)
+                self._exclusive.append(exclusive)
+                self._counts.append(1)
+            else:
+                self._inclusive[row] = inclusive
+                self._exclusive[row] = exclusive
+                self._counts[row] += 1
+
+    def get(self, name):
+        # (inclusive, exclusive) seconds or None
+        with self._lock:
+            row = self._rows.get(name)
+            if row is None:
+                return None
+            return (self._inclusive[row], self._exclusive[row])
+
+    def count(self, name):
+        with self._lock:
+            row = self._rows.get(name)
+            return self._counts[row] if row is not None else 0
+
+    def items(self):
+        # [(name, inclusive, exclusive)]
+        with self._lock:
+            return list(zip(self._names, self._inclusive, self._exclusive))
+
+    def clear(self):
+        with self._lock:
+            self._rows = {}
+            self._names = []
+            self._inclusive = array('d')
+            self._exclusive = array('d')
+            self._counts = array('L')
+
+
+# stands in for the real loader while a module executes, the spec and the
+# module get the real loader back afterwards
+class TimedLoader(object):
+    def __init__(self, loader, profiler, findTime):
+        self._loader = loader
+        self._profiler = profiler
+        self._findTime = findTime
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        create = getattr(self._loader, 'create_module', None)
+        return create(spec) if create is not None else None
+
+    def exec_module(self, mod):
+        spec = mod.__spec__
+        try:
+            self._profiler._timeExec(spec.name, self._loader.exec_module, mod, self._findTime)
+        finally:
+            spec.loader = self._loader
+            if getattr(mod, '__loader__', None) is self:
+                mod.__loader__ = self._loader
+
+
+# meta path finder timing every import made while installed, inclusive time
+# covers finding and executing a module and everything it imports, exclusive
+# time leaves out nested imports
+class ImportProfiler(object):
+    def __init__(self, table):
+        self._table = table
+        self._local = threading.local()
+
+    def _stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _finding(self):
+        return getattr(self._local, 'finding', False)
+
+    def find_spec(self, fullname, path=None, target=None):
+        # asks the finders behind this one, never recursing into itself
+        if self._finding():
+            return None
+
+        started = time.perf_counter()
+        self._local.finding = True
+        try:
+            spec = None
+            for finder in sys.meta_path:
+                if finder is self:
+                    continue
+                find = getattr(finder, 'find_spec', None)
+                if find is None:
+                    continue
+                spec = find(fullname, path, target)
+                if spec is not None:
+                    break
+        finally:
+            self._local.finding = False
+
+        if spec is None or spec.loader is None or not hasattr(spec.loader, 'exec_module'):
+            return spec
+
+        spec.loader = TimedLoader(spec.loader, self, time.perf_counter() - started)
+        return spec
+
+    def invalidate_caches(self):
+        pass
+
+    def _timeExec(self, name, execModule, mod, findTime):
+        stack = self._stack()
+        stack.append(0.0)
+        started = time.perf_counter()
+        try:
+            execModule(mod)
+        finally:
+            elapsed = time.perf_counter() - started + findTime
+            nested = stack.pop()
+            self._table.record(name, elapsed, max(0.0, elapsed - nested))
+            if stack:
+                stack[-1] += elapsed
+
+
+gImportTimes = ImportTimeTable()
+gProfiler = None
+
+
+def isInstalled():
+    return gProfiler is not None and gProfiler in sys.meta_path
+
+def install():
+    # modules imported from now on are timed, already loaded ones are only
+    # timed once they are cleaned and imported again
+    global gProfiler
+
+    if isInstalled():
+        return
+    gProfiler = ImportProfiler(gImportTimes)
+    sys.meta_path.insert(0, gProfiler)
+
+def uninstall():
+    global gProfiler
+
+    if gProfiler is not None:
+        try:
+            sys.meta_path.remove(gProfiler)
+        except ValueError:
+            pass
+        gProfiler = None
+
+def installFromEnvironment():
+    if os.environ.get(ENV_PROFILE_IMPORTS, '').strip() not in ('', '0'):
+        install()
+
+def getImportTime(name):
+    return gImportTimes.get(name)
+
+def getImportTimes(names):
+    # {name: (inclusive, exclusive)} of the given modules that were timed
+    times = {}
+    for name in names:
+        t = gImportTimes.get(name)
+        if t is not None:
+            times[name] = t
+    return times
+
+def slowestImports(namespace=None, limit=20, exclusive=False):
+    # [(name, inclusive, exclusive)] slowest first, `namespace` limits the
+    # report to a module and its sub-modules, `limit` None reports all
+    rows = gImportTimes.items()
+    if namespace:
+        prefix = namespace + '.'
+        rows = [r for r in rows if r[0] == namespace or r[0].startswith(prefix)]
+
+    rows.sort(key=lambda r: r[2] if exclusive else r[1], reverse=True)
+    return rows[:limit]
+
+def formatReport(rows):
+    lines = ['{0:<50} {1:>12} {2:>12}'.format('module', 'total ms', 'own ms')]
+    for name, inclusive, exclusive in rows:
+        lines.append('{0:<50} {1:>12.2f} {2:>12.2f}'.format(name, inclusive * 1000.0, exclusive * 1000.0))
+    return '\n'.join(lines)
@@ -0,0 +1,237 @@
+import os
+import os.path
+import sys
+import json
+import time
+import hashlib
+import threading
+
+try:
+    import sqlite3
+except ImportError:
+    # some embedded interpreters ship without it, the cache is skipped then
+    sqlite3 = None
+
+import package_vacuum.module as module
+
+
+ENV_CACHE_PATH = 'PACKAGE_VACUUM_CACHE'
+# set to 1 to neither read nor write the cache
+ENV_NO_CACHE = 'PACKAGE_VACUUM_NO_CACHE'
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.package_vacuum', 'metadata.sqlite')
+SCHEMA_VERSION = 1
+# fingerprints kept in the file, the least recently saved ones go first
+MAX_FINGERPRINTS = 8
+# seconds a restore waits for metadata still being stored
+STORE_WAIT = 2.0
+
+
+class ModuleMetadata(object):
+    __slots__ = ('name', 'path', 'directory', 'internal', 'parent')
+
+    def __init__(self, name, path, directory, internal, parent):
+        self.name = name
+        # `__file__` as found on the module
+        self.path = path
+        # normalized directory of `path`
+        self.directory = directory
+        self.internal = internal
+        # name of the package holding the module, '' for top-level modules
+        self.parent = parent
+
+    def __repr__(self):
+        return '<ModuleMetadata {0} internal={1}>'.format(self.name, self.internal)
+
+
+# None follows `PACKAGE_VACUUM_NO_CACHE`, `setEnabled` overrides it
+gEnabled = None
+
+
+def isEnabled():
+    if gEnabled is not None:
+        return gEnabled
+    return os.environ.get(ENV_NO_CACHE, '').strip() in ('', '0')
+
+def setEnabled(enabled):
+    global gEnabled
+    gEnabled = enabled
+
+def getCachePath():
+    return os.environ.get(ENV_CACHE_PATH) or DEFAULT_CACHE_PATH
+
+def computeFingerprint():
+    # metadata only holds under the same search path and protected roots
+    content = json.dumps([SCHEMA_VERSION, sys.path, module.MAYA_LOCATION, module.getInternalRoots()])
+    return hashlib.sha1(content.encode('utf-8')).hexdigest()
+
+def statDirectory(directory):
+    try:
+        return os.stat(directory).st_mtime_ns
+    except OSError:
+        return None
+
+def describeModule(name, mod):
+    # None for modules not loaded from a file
+    path = getattr(mod, module.KEY_MODULE_PATH, None)
+    if not isinstance(path, str):
+        return None
+    return ModuleMetadata(
+        name,
+        path,
+        os.path.dirname(module.normalizePath(path)),
+        module.isInternalModule(mod),
+        name.rpartition('.')[0])
+
+def collectMetadata(items=None):
+    # `items` are (name, module) pairs, every loaded module by default
+    if items is None:
+        module.refreshModules()
+        items = module.gModuleTable.items()
+
+    entries = (describeModule(name, mod) for name, mod in items)
+    return [e for e in entries if e is not None]
+
+
+# module metadata of previous sessions in a sqlite file, rows are grouped by
+# fingerprint and trusted per directory as long as its mtime is unchanged, so
+# validating a few thousand modules takes a few hundred stat calls
+class MetadataCache(object):
+    def __init__(self, path=None):
+        self._path = path or getCachePath()
+
+    def path(self):
+        return self._path
+
+    def _connect(self):
+        directory = os.path.dirname(self._path)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        connection = sqlite3.connect(self._path)
+        connection.executescript("""
+            CREATE TABLE IF NOT EXISTS fingerprints (
+                fingerprint TEXT PRIMARY KEY, saved REAL);
+            CREATE TABLE IF NOT EXISTS directories (
+                fingerprint TEXT, directory TEXT, mtime INTEGER,
+                PRIMARY KEY (fingerprint, directory));
+            CREATE TABLE IF NOT EXISTS modules (
+                fingerprint TEXT, name TEXT, path TEXT, directory TEXT,
+                internal INTEGER, parent TEXT,
+                PRIMARY KEY (fingerprint, name));
+        """)
+        return connection
+
+    def load(self, fingerprint):
+        # {name: ModuleMetadata} still valid for `fingerprint`
+        if sqlite3 is None or not os.path.exists(self._path):
+            return {}
+
+        try:
+            connection = self._connect()
+            try:
+                valid = set()
+                for directory, mtime in connection.execute(
+                        "SELECT directory, mtime FROM directories WHERE fingerprint = ?", (fingerprint,)):
+                    if statDirectory(directory) == mtime:
+                        valid.add(directory)
+
+                entries = {}
+                for row in connection.execute(
+                        "SELECT name, path, directory, internal, parent FROM modules WHERE fingerprint = ?", (fingerprint,)):
+                    if row[2] in valid:
+                        entries[row[0]] = ModuleMetadata(row[0], row[1], row[2], bool(row[3]), row[4])
+                return entries
+            finally:
+                connection.close()
+        except sqlite3.Error:
+            return {}
+
+    def save(self, fingerprint, entries, saved=0.0):
+        # replaces what was stored for `fingerprint`, returns False when the
+        # file can't be written
+        if sqlite3 is None:
+            return False
+
+        directories = {}
+        for entry in entries:
+            if entry.directory not in directories:
+                directories[entry.directory] = statDirectory(entry.directory)
+
+        try:
+            connection = self._connect()
+            try:
+                with connection:
+                    connection.execute("DELETE FROM modules WHERE fingerprint = ?", (fingerprint,))
+                    connection.execute("DELETE FROM directories WHERE fingerprint = ?", (fingerprint,))
+                    connection.executemany(
+                        "INSERT INTO directories VALUES (?, ?, ?)",
+                        [(fingerprint, d, m) for d, m in directories.items() if m is not None])
+                    connection.executemany(
+                        "INSERT INTO modules VALUES (?, ?, ?, ?, ?, ?)",
+                        [(fingerprint, e.name, e.path, e.directory, int(e.internal), e.parent)
+                         for e in entries if directories[e.directory] is not None])
+                    connection.execute("INSERT OR REPLACE INTO fingerprints VALUES (?, ?)", (fingerprint, saved))
+
+                    stale = [row[0] for row in connection.execute(
+                        "SELECT fingerprint FROM fingerprints ORDER BY saved DESC LIMIT -1 OFFSET ?", (MAX_FINGERPRINTS,))]
+                    for f in stale:
+                        connection.execute("DELETE FROM modules WHERE fingerprint = ?", (f,))
+                        connection.execute("DELETE FROM directories WHERE fingerprint = ?", (f,))
+                        connection.execute("DELETE FROM fingerprints WHERE fingerprint = ?", (f,))
+                return True
+            finally:
+                connection.close()
+        except (sqlite3.Error, OSError):
+            return False
+
+
+# thread of the last `storeInBackground`
+gStoreThread = None
+
+
+def restore(cache=None):
+    # seeds the internal module classifier with flags of a previous session,
+    # returns the number of modules restored
+    if not isEnabled():
+        return 0
+    if gStoreThread is not None:
+        gStoreThread.join(STORE_WAIT)
+
+    cache = cache or MetadataCache()
+    entries = cache.load(computeFingerprint())
+    module.gInternalClassifier.seed(dict((e.path, e.internal) for e in entries.values()))
+    return len(entries)
+
+def store(cache=None):
+    if not isEnabled():
+        return False
+    cache = cache or MetadataCache()
+    return cache.save(computeFingerprint(), collectMetadata(), time.time())
+
+def storeInBackground(cache=None):
+    # only the module list is taken on the calling thread, modules are
+    # described and written on a thread of their own, returns the thread or
+    # None when nothing is stored
+    global gStoreThread
+
+    if not isEnabled():
+        return None
+    if gStoreThread is not None and gStoreThread.is_alive():
+        # the previous session's metadata is still being written, the next
+        # close stores again
+        return None
+
+    module.refreshModules()
+    items = module.gModuleTable.items()
+    fingerprint = computeFingerprint()
+    cache = cache or MetadataCache()
+
+    def run():
+        cache.save(fingerprint, collectMetadata(items), time.time())
+
+    # never holds up quitting Maya, an unfinished write is rolled back by
+    # sqlite
+    gStoreThread = threading.Thread(target=run, name='PackageVacuumMetadata')
+    gStoreThread.daemon = True
+    gStoreThread.start()
+    return gStoreThread
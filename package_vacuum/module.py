@@ -1,57 +1,833 @@
 import sys
 import os
 import os.path
+import re
+import time
+import types
+import weakref
+import threading
+import fnmatch
+import operator
+import itertools
 
 
-MAYA_LOCATION = os.path.normpath(os.environ['MAYA_LOCATION'])
+# None outside of Maya, e.g. plain python running the headless api
+MAYA_LOCATION = os.path.normpath(os.environ['MAYA_LOCATION']) if os.environ.get('MAYA_LOCATION') else None
 KEY_MODULE_PATH = '__file__'
+SELF_MODULE_NAME = 'package_vacuum'
+ENV_INTERNAL_ROOTS = 'PACKAGE_VACUUM_INTERNAL_ROOTS'
+
+# interpreter level modules which are never pulled into a clean as dependents
+PROTECTED_MODULES = frozenset(['__main__', '__builtin__', 'builtins', 'sys'])
 
 
 class ModuleNotFoundException(Exception):
     pass
 
 
-def isInternalModule(module):
-    mpath = getattr(module, KEY_MODULE_PATH, None)
-    if mpath is not None:
-        return MAYA_LOCATION in mpath
-    else:
+class InvalidFilterException(Exception):
+    pass
+
+
+class SkipReason(object):
+    SELF = 'self'
+    INTERNAL = 'internal'
+
+
+class VacuumResult(object):
+    def __init__(self, dryRun=False):
+        self.dryRun = dryRun
+        # names in clean order, with `dryRun` nothing was actually removed
+        self.cleaned = []
+        # (name, SkipReason) pairs
+        self.skipped = []
+        # patterns matching no loaded module
+        self.missing = []
+        # seconds spent per phase: 'resolve', 'clean' and 'total'
+        self.timings = {}
+        # with `reclaim`, weak references to cleaned modules by name and the
+        # memory usage right before cleaning, see `package_vacuum.reclaim`
+        self.released = {}
+        self.memoryBefore = None
+
+    def __repr__(self):
+        return '<VacuumResult cleaned={0} skipped={1} missing={2} total={3:.4f}s>'.format(
+            len(self.cleaned), len(self.skipped), len(self.missing), self.timings.get('total', 0.0))
+
+
+# dotted-name prefix trie kept beside `sys.modules`, answers namespace queries
+# in time proportional to the size of the result
+class ModuleIndex(object):
+    class Node(object):
+        __slots__ = ('children', 'terminal')
+
+        def __init__(self):
+            self.children = {}
+            self.terminal = False
+
+    def __init__(self):
+        self._root = ModuleIndex.Node()
+        self._names = set()
+
+    def __contains__(self, name):
+        return name in self._names
+
+    def __len__(self):
+        return len(self._names)
+
+    def add(self, name):
+        if name in self._names:
+            return
+
+        node = self._root
+        for part in name.split('.'):
+            child = node.children.get(part)
+            if child is None:
+                child = node.children[part] = ModuleIndex.Node()
+            node = child
+
+        node.terminal = True
+        self._names.add(name)
+
+    def remove(self, name):
+        if name not in self._names:
+            return
+
+        path = [self._root]
+        parts = name.split('.')
+        for part in parts:
+            path.append(path[-1].children[part])
+
+        path[-1].terminal = False
+        self._names.discard(name)
+
+        # prune branches that no longer lead to any module
+        for i in range(len(parts), 0, -1):
+            node = path[i]
+            if node.terminal or node.children:
+                break
+            del path[i - 1].children[parts[i - 1]]
+
+    def applyDelta(self, delta):
+        for name in delta.removed:
+            self.remove(name)
+        for name in delta.added:
+            self.add(name)
+
+    def _findNode(self, name):
+        node = self._root
+        for part in name.split('.'):
+            node = node.children.get(part)
+            if node is None:
+                return None
+        return node
+
+    def iterNamespace(self, name):
+        # yields `name` and every name under its namespace, parent before child
+        node = self._findNode(name)
+        if node is None:
+            return
+
+        stack = [(name, node)]
+        while stack:
+            prefix, node = stack.pop()
+            if node.terminal:
+                yield prefix
+
+            # push in reversed order so children are visited alphabetically
+            for part in sorted(node.children, reverse=True):
+                stack.append((prefix + '.' + part, node.children[part]))
+
+
+class ModuleDelta(object):
+    def __init__(self, generation, added=None, removed=None):
+        self.generation = generation
+        self.added = added if added is not None else []
+        self.removed = removed if removed is not None else []
+
+    def isEmpty(self):
+        return not self.added and not self.removed
+
+
+# generation-stamped mirror of `sys.modules`, each refresh only computes the
+# names added and removed since the previous one and pushes them to listeners
+#
+# only module identities are kept, never the modules themselves, so a cleaned
+# package isn't pinned in memory and `get` always returns the live object, a
+# module replaced under the same name, e.g. `del sys.modules[x]; import x` made
+# outside of this tool, shows up as both removed and added
+class ModuleTable(object):
+    HISTORY_SIZE = 32
+
+    def __init__(self):
+        self._generation = 0
+        # name: id of the module object seen by the last refresh
+        self._ids = {}
+        # name: weak reference whose callback reports a collected module, an
+        # id can be reused by the module replacing it
+        self._refs = {}
+        self._collected = set()
+        # name and id lists of the last refresh
+        self._lastNames = None
+        self._lastIds = None
+        self._pendingRemoved = set()
+        self._history = []
+        self._listeners = []
+
+    def __contains__(self, name):
+        return name in self._ids
+
+    def __len__(self):
+        return len(self._ids)
+
+    def generation(self):
+        return self._generation
+
+    def names(self):
+        # a copy, a refresh may run while it is iterated
+        return list(self._ids)
+
+    def items(self):
+        modules = sys.modules
+        return [(name, modules[name]) for name in list(self._ids) if name in modules]
+
+    def get(self, name, default=None):
+        # only reads, safe to call from a worker thread
+        if name not in self._ids:
+            return default
+        return sys.modules.get(name, default)
+
+    def addListener(self, listener):
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def removeListener(self, listener):
+        try:
+            self._listeners.remove(listener)
+        except ValueError:
+            pass
+
+    def _notify(self, delta):
+        for listener in self._listeners:
+            listener(delta)
+
+    def _record(self, added, removed):
+        self._generation += 1
+        delta = ModuleDelta(self._generation, added, removed)
+
+        self._history.append(delta)
+        if len(self._history) > ModuleTable.HISTORY_SIZE:
+            del self._history[0]
+
+        return delta
+
+    def _diff(self, modules, names, objectIds):
+        ids = self._ids
+        current = dict(zip(names, objectIds))
+        added = set(current.keys() - ids.keys())
+        removed = set(ids.keys() - current.keys())
+
+        for name in removed:
+            del ids[name]
+            self._refs.pop(name, None)
+        for name in added:
+            ids[name] = current[name]
+
+        # names on both sides hold another object when their ids differ, or
+        # when the module seen before was collected and its id reused
+        replaced = set()
+        if ids != current:
+            replaced.update(itertools.compress(names, map(operator.ne, objectIds, map(ids.__getitem__, names))))
+        collected = self._collected
+        while collected:
+            name = collected.pop()
+            if name in current and name not in added:
+                replaced.add(name)
+
+        for name in replaced:
+            ids[name] = current[name]
+        for name in added.union(replaced):
+            self._refs[name] = self._watch(name, modules[name])
+
+        return sorted(added.union(replaced)), sorted(removed.union(replaced))
+
+    def _watch(self, name, mod):
+        collected = self._collected
+        try:
+            return weakref.ref(mod, lambda ref, name=name: collected.add(name))
+        except TypeError:
+            # None placeholders and other objects without weak references
+            return None
+
+    def refresh(self):
+        # unchanged modules are told apart by comparing name and id lists at C
+        # speed, python level work only scales with the number of modules
+        # loaded, removed or replaced
+        modules = dict(sys.modules)
+        names = list(modules)
+        objectIds = list(map(id, modules.values()))
+
+        added = []
+        removed = []
+        lastNames = self._lastNames
+        count = len(lastNames) if lastNames is not None else -1
+        if self._collected or names[:count] != lastNames or objectIds[:count] != self._lastIds:
+            added, removed = self._diff(modules, names, objectIds)
+        elif len(names) > count:
+            # plain imports only append to `sys.modules`
+            added = sorted(names[count:])
+            for name in added:
+                self._ids[name] = id(modules[name])
+                self._refs[name] = self._watch(name, modules[name])
+        self._lastNames = names
+        self._lastIds = objectIds
+
+        notified = self._pendingRemoved
+        self._pendingRemoved = set()
+
+        if not added and not removed and not notified:
+            return ModuleDelta(self._generation)
+
+        delta = self._record(added, sorted(notified.union(removed)))
+        if added or removed:
+            self._notify(ModuleDelta(self._generation, added, removed))
+
+        return delta
+
+    def discard(self, name):
+        # removal made through this tool, listeners learn about it immediately
+        # while history records it with the next refresh
+        self._ids.pop(name, None)
+        self._refs.pop(name, None)
+        self._pendingRemoved.add(name)
+        self._notify(ModuleDelta(self._generation, removed=[name]))
+
+    def changesSince(self, generation):
+        # merged delta from `generation` up to now, None if history is too short
+        if generation == self._generation:
+            return ModuleDelta(self._generation)
+        if not self._history or self._history[0].generation > generation + 1:
+            return None
+
+        added = set()
+        removed = set()
+        for delta in self._history:
+            if delta.generation <= generation:
+                continue
+            for name in delta.removed:
+                if name in added:
+                    added.discard(name)
+                else:
+                    removed.add(name)
+            # a name both removed and added was re-imported, consumers apply
+            # removals before additions
+            added.update(delta.added)
+
+        return ModuleDelta(self._generation, sorted(added), sorted(removed))
+
+
+def normalizePath(path):
+    return os.path.normcase(os.path.normpath(os.path.abspath(path)))
+
+
+# tells whether a module lives under one of the protected roots, directories are
+# resolved once through a prefix index and results are memoized per module
+#
+# queries run on a worker thread too, the caches are only touched holding the
+# lock so an answer worked out under old roots can't land in fresh caches
+class InternalModuleClassifier(object):
+    def __init__(self, roots=()):
+        self._lock = threading.Lock()
+        self._roots = set()
+        self._dirCache = {}
+        self._moduleCache = {}
+        # `__file__`: internal flag, seeded from a previous session
+        self._pathCache = {}
+
+        for root in roots:
+            self.addRoot(root)
+
+    def roots(self):
+        with self._lock:
+            return sorted(self._roots)
+
+    def _invalidate(self):
+        self._dirCache = {}
+        self._moduleCache = {}
+        self._pathCache = {}
+
+    def seed(self, paths):
+        # `paths` maps `__file__` values to internal flags worked out under the
+        # same roots, they are trusted until roots change
+        with self._lock:
+            self._pathCache.update(paths)
+
+    def addRoot(self, root):
+        root = normalizePath(root)
+        with self._lock:
+            if root not in self._roots:
+                self._roots.add(root)
+                self._invalidate()
+
+    def removeRoot(self, root):
+        root = normalizePath(root)
+        with self._lock:
+            if root in self._roots:
+                self._roots.discard(root)
+                self._invalidate()
+
+    def setRoots(self, roots):
+        roots = set(normalizePath(r) for r in roots)
+        with self._lock:
+            self._roots = roots
+            self._invalidate()
+
+    def isInternalPath(self, path):
+        with self._lock:
+            return self._isInternalPath(path)
+
+    def _isInternalPath(self, path):
+        directory = os.path.dirname(normalizePath(path))
+        dirCache = self._dirCache
+
+        # walk up until a directory with a known answer or a root is met,
+        # then remember the answer for every directory on the way
+        visited = []
+        result = False
+        while True:
+            cached = dirCache.get(directory)
+            if cached is not None:
+                result = cached
+                break
+            if directory in self._roots:
+                result = True
+                break
+
+            visited.append(directory)
+            parent = os.path.dirname(directory)
+            if parent == directory:
+                break
+            directory = parent
+
+        for d in visited:
+            dirCache[d] = result
+
+        return result
+
+    def isInternal(self, module):
+        mpath = getattr(module, KEY_MODULE_PATH, None)
+        if mpath is None:
+            return True
+
+        # keyed by identity without holding a reference, so cleaned modules can
+        # still be freed, `__file__` guards against a reused id
+        key = id(module)
+        with self._lock:
+            cached = self._moduleCache.get(key)
+            if cached is not None and cached[0] == mpath:
+                return cached[1]
+
+            result = self._pathCache.get(mpath)
+            if result is None:
+                result = self._isInternalPath(mpath)
+            self._moduleCache[key] = (mpath, result)
+            return result
+
+    def prune(self, limit):
+        with self._lock:
+            if len(self._moduleCache) > limit:
+                self._moduleCache = {}
+
+
+# reverse-import graph of loaded modules, built from references found in module
+# globals: imported modules themselves and objects whose `__module__` is another
+# loaded module, e.g. names pulled in by `from pkg import thing`
+class DependencyGraph(object):
+    def __init__(self, table):
+        self._table = table
+        self._deps = {}
+        self._rdeps = {}
+        self._stamps = {}
+        self._dirty = set(table.names())
+
+        table.addListener(self.applyDelta)
+
+    def applyDelta(self, delta):
+        for name in delta.removed:
+            self._dropNode(name)
+            self._dirty.discard(name)
+        self._dirty.update(delta.added)
+
+    def _dropNode(self, name):
+        for dep in self._deps.pop(name, ()):
+            dependents = self._rdeps.get(dep)
+            if dependents is not None:
+                dependents.discard(name)
+        self._stamps.pop(name, None)
+
+    def _stamp(self, module):
+        namespace = getattr(module, '__dict__', None)
+        return (id(module), len(namespace) if namespace is not None else 0)
+
+    def _scan(self, name, module):
+        refs = set()
+        namespace = getattr(module, '__dict__', None)
+        if namespace is not None:
+            for value in list(namespace.values()):
+                try:
+                    if isinstance(value, types.ModuleType):
+                        target = value.__name__
+                    else:
+                        target = getattr(value, '__module__', None)
+                except Exception:
+                    continue
+
+                if target != name and isinstance(target, str) and target in self._table:
+                    refs.add(target)
+
+        self._dropNode(name)
+        self._deps[name] = refs
+        for dep in refs:
+            self._rdeps.setdefault(dep, set()).add(name)
+        self._stamps[name] = self._stamp(module)
+
+    def update(self):
+        # rescan new modules and the ones whose globals grew or shrank since the
+        # last scan, the sweep itself is one cheap stamp comparison per module
+        table = self._table
+        stamps = self._stamps
+        for name, module in table.items():
+            if name not in self._dirty and stamps.get(name) != self._stamp(module):
+                self._dirty.add(name)
+
+        for name in self._dirty:
+            if name in table:
+                self._scan(name, table.get(name))
+        self._dirty = set()
+
+    def dependencies(self, name):
+        return set(self._deps.get(name, ()))
+
+    def dependents(self, name):
+        return set(self._rdeps.get(name, ()))
+
+    def closure(self, names):
+        # `names` plus everything that transitively references them
+        result = set(n for n in names if n in self._table)
+        stack = list(result)
+        while stack:
+            for dependent in self._rdeps.get(stack.pop(), ()):
+                if dependent not in result and dependent not in PROTECTED_MODULES:
+                    result.add(dependent)
+                    stack.append(dependent)
+        return result
+
+    def removalOrder(self, names):
+        # topological order inside `names`, a module always comes before the
+        # modules it depends on, cycles are broken arbitrarily
+        names = set(names)
+        visited = set()
+        order = []
+
+        for start in sorted(names):
+            if start in visited:
+                continue
+            visited.add(start)
+            stack = [(start, iter(sorted(self._deps.get(start, ()))))]
+            while stack:
+                name, deps = stack[-1]
+                for dep in deps:
+                    if dep in names and dep not in visited:
+                        visited.add(dep)
+                        stack.append((dep, iter(sorted(self._deps.get(dep, ())))))
+                        break
+                else:
+                    stack.pop()
+                    order.append(name)
+
+        order.reverse()
+        return order
+
+
+# module name filter compiled from an expression of comma separated terms:
+#
+#   rig          plain text, matches names containing it
+#   rig.*        glob, matches whole names
+#   re:^rig\d    regular expression, matches anywhere in names (also `/^rig\d/`)
+#   !*.tests     negation of any of the above
+#
+# a name passes when it matches any positive term (or there is none) and no
+# negative term, all terms of each kind are joined into a single regex
+class ModuleFilter(object):
+    GLOB_CHARS = ('*', '?', '[')
+
+    def __init__(self, expression):
+        self.expression = expression
+
+        positives = []
+        negatives = []
+        for term in expression.split(','):
+            term = term.strip()
+            negate = term.startswith('!')
+            if negate:
+                term = term[1:].strip()
+            if not term:
+                continue
+            (negatives if negate else positives).append(self._translate(term))
+
+        self._substring = None
+        if len(positives) == 1 and not negatives and positives[0][0] == 'text':
+            # common case of the old plain filter, a substring test beats a regex
+            self._substring = positives[0][1]
+
+        self._positive = self._compile(positives)
+        self._negative = self._compile(negatives)
+
+    def _translate(self, term):
+        if term.startswith('re:'):
+            return ('regex', '.*?(?:{0})'.format(term[3:]))
+        elif len(term) > 1 and term.startswith('/') and term.endswith('/'):
+            return ('regex', '.*?(?:{0})'.format(term[1:-1]))
+        elif any(c in term for c in ModuleFilter.GLOB_CHARS):
+            return ('glob', fnmatch.translate(term))
+        else:
+            return ('text', term)
+
+    def _compile(self, terms):
+        if not terms:
+            return None
+
+        pieces = []
+        for kind, value in terms:
+            if kind == 'text':
+                pieces.append('.*?' + re.escape(value))
+            else:
+                pieces.append(value)
+
+        try:
+            return re.compile('|'.join('(?:{0})'.format(p) for p in pieces), re.DOTALL)
+        except re.error as e:
+            raise InvalidFilterException("invalid filter [ {0} ]: {1}".format(self.expression, e))
+
+    def __call__(self, name):
+        if self._substring is not None:
+            return self._substring in name
+        if self._positive is not None and self._positive.match(name) is None:
+            return False
+        if self._negative is not None and self._negative.match(name) is not None:
+            return False
         return True
 
+
+_filterCache = {}
+
+def compileFilter(expression):
+    moduleFilter = _filterCache.get(expression)
+    if moduleFilter is None:
+        if len(_filterCache) > 64:
+            _filterCache.clear()
+        moduleFilter = _filterCache[expression] = ModuleFilter(expression)
+    return moduleFilter
+
+
+def _getDefaultInternalRoots():
+    roots = [MAYA_LOCATION] if MAYA_LOCATION else []
+    for root in os.environ.get(ENV_INTERNAL_ROOTS, '').split(os.pathsep):
+        if root.strip():
+            roots.append(root.strip())
+    return roots
+
+
+gModuleIndex = ModuleIndex()
+gModuleTable = ModuleTable()
+gModuleTable.addListener(gModuleIndex.applyDelta)
+
+gInternalClassifier = InternalModuleClassifier(_getDefaultInternalRoots())
+
+
+def _pruneClassifierCache(delta):
+    # entries of modules that were removed are dropped wholesale once they
+    # clearly outnumber live modules
+    gInternalClassifier.prune(2 * len(gModuleTable) + 1024)
+
+gModuleTable.addListener(_pruneClassifierCache)
+
+# built on first use, scanning every module's globals is not free
+gDependencyGraph = None
+
+
+def getInternalRoots():
+    return gInternalClassifier.roots()
+
+def setInternalRoots(roots):
+    gInternalClassifier.setRoots(roots)
+
+def addInternalRoot(root):
+    gInternalClassifier.addRoot(root)
+
+def removeInternalRoot(root):
+    gInternalClassifier.removeRoot(root)
+
+def isInternalModule(module):
+    return gInternalClassifier.isInternal(module)
+
 def deregisterModule(name):
     try:
         del sys.modules[name]
     except KeyError:
         raise ModuleNotFoundException
+    finally:
+        gModuleTable.discard(name)
+
+def refreshModules():
+    return gModuleTable.refresh()
+
+def getModuleChanges(generation):
+    gModuleTable.refresh()
+    return gModuleTable.changesSince(generation)
 
 def findModulesByQualifyName(name, ignoreInternal=False):
-    def test(key, value):
-        if key == name or key.startswith(name + '.'):
-            if ignoreInternal:
-                return not isInternalModule(value)
-            else:
-                return True
-        else:
-            return False
+    gModuleTable.refresh()
 
-    names = [m[0] for m in sys.modules.items() if test(m[0], m[1])]
-    names.sort(key=lambda n: len(n))
+    names = []
+    for key in gModuleIndex.iterNamespace(name):
+        if ignoreInternal and isInternalModule(gModuleTable.get(key)):
+            continue
+        names.append(key)
 
     return names
 
-def filterModules(searchKey, ignoreInternal=False):
-    def test(key, value):
-        if searchKey in key:
-            if ignoreInternal:
-                return not isInternalModule(value)
-            else:
-                return True
+def filterModules(searchKey, ignoreInternal=False, names=None):
+    # `searchKey` is a `ModuleFilter` expression, `names` narrows the search to
+    # a subset, e.g. names added by a `ModuleDelta`
+    match = compileFilter(searchKey)
+    if names is None:
+        gModuleTable.refresh()
+        names = gModuleTable.names()
+
+    if ignoreInternal:
+        result = [n for n in names if match(n) and not isInternalModule(gModuleTable.get(n))]
+    else:
+        result = [n for n in names if match(n)]
+
+    result.sort()
+    return result
+
+def getDependencyGraph():
+    global gDependencyGraph
+
+    gModuleTable.refresh()
+    if gDependencyGraph is None:
+        gDependencyGraph = DependencyGraph(gModuleTable)
+    gDependencyGraph.update()
+
+    return gDependencyGraph
+
+def findDependents(names, ignoreInternal=False):
+    # `names` plus every loaded module that transitively references them, in an
+    # order safe for removal: dependents come before what they depend on
+    graph = getDependencyGraph()
+    closure = graph.closure(names)
+    if ignoreInternal:
+        closure = set(n for n in closure if n in names or not isInternalModule(gModuleTable.get(n)))
+
+    return graph.removalOrder(closure)
+
+def isSelfModule(name):
+    return name == SELF_MODULE_NAME or name.startswith(SELF_MODULE_NAME + '.')
+
+def getMemoryUsage():
+    # (allocated blocks, traced bytes), bytes are None unless tracemalloc runs
+    tracedBytes = None
+    tracemalloc = sys.modules.get('tracemalloc')
+    if tracemalloc is not None and tracemalloc.is_tracing():
+        tracedBytes = tracemalloc.get_traced_memory()[0]
+    return (sys.getallocatedblocks(), tracedBytes)
+
+def vacuum(patterns, cascade=True, ignoreInternal=True, dryRun=False, dependents=False, reclaim=False):
+    # headless clean: resolves every namespace in `patterns` through the module
+    # index, never touches this tool's own modules and optionally leaves
+    # internal modules alone, `reclaim` keeps what is needed to measure the
+    # memory given back afterwards
+    if isinstance(patterns, str):
+        patterns = [patterns]
+
+    result = VacuumResult(dryRun)
+    started = time.perf_counter()
+
+    gModuleTable.refresh()
+
+    names = []
+    seen = set()
+    skipped = set()
+
+    def skip(name, reason):
+        if name not in skipped:
+            skipped.add(name)
+            result.skipped.append((name, reason))
+
+    for pattern in patterns:
+        pattern = pattern.strip()
+        if not pattern:
+            continue
+        if isSelfModule(pattern):
+            skip(pattern, SkipReason.SELF)
+            continue
+
+        if cascade:
+            matched = list(gModuleIndex.iterNamespace(pattern))
         else:
-            return False
+            matched = [pattern] if pattern in gModuleTable else []
 
-    names = [m[0] for m in sys.modules.items() if test(m[0], m[1])]
-    names.sort()
-    return names
+        if not matched:
+            result.missing.append(pattern)
+            continue
+
+        for name in matched:
+            if name in seen:
+                continue
+            seen.add(name)
+
+            if isSelfModule(name):
+                skip(name, SkipReason.SELF)
+            elif ignoreInternal and isInternalModule(gModuleTable.get(name)):
+                skip(name, SkipReason.INTERNAL)
+            else:
+                names.append(name)
+
+    if dependents and names:
+        names = findDependents(names, ignoreInternal=ignoreInternal)
+        for name in names:
+            if isSelfModule(name):
+                skip(name, SkipReason.SELF)
+        names = [n for n in names if n not in skipped]
+
+    resolved = time.perf_counter()
+    result.timings['resolve'] = resolved - started
+
+    if reclaim and not dryRun:
+        result.memoryBefore = getMemoryUsage()
+
+    for name in names:
+        if dryRun:
+            result.cleaned.append(name)
+            continue
+        if reclaim:
+            try:
+                result.released[name] = weakref.ref(sys.modules[name])
+            except (KeyError, TypeError):
+                pass
+        try:
+            deregisterModule(name)
+            result.cleaned.append(name)
+        except ModuleNotFoundException:
+            result.missing.append(name)
+
+    finished = time.perf_counter()
+    result.timings['clean'] = finished - resolved
+    result.timings['total'] = finished - started
+
+    return result
 
 def hasModule(name):
     return name in sys.modules
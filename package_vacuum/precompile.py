@@ -0,0 +1,146 @@
+import os
+import os.path
+import sys
+import time
+import importlib.util
+import py_compile
+import multiprocessing
+import multiprocessing.spawn
+import concurrent.futures
+
+import package_vacuum.module as module
+from package_vacuum.watch import getSourcePath
+
+
+# interpreter the compile processes run on, maya.exe can't be one of them
+ENV_PYTHON = 'PACKAGE_VACUUM_PYTHON'
+# below this many stale files starting processes costs more than it saves
+PARALLEL_THRESHOLD = 16
+# chunks per process, a few let fast processes pick up work of slow ones
+CHUNKS_PER_WORKER = 4
+
+
+class CompileReport(object):
+    def __init__(self, stale):
+        # stale source files handed in
+        self.stale = stale
+        self.compiled = 0
+        # (source, error message) of files failing to compile
+        self.failed = []
+        # compile processes used, 0 when compiled in this process
+        self.workers = 0
+        self.duration = 0.0
+
+    def __repr__(self):
+        return '<CompileReport compiled={0}/{1} workers={2} duration={3:.4f}s>'.format(
+            self.compiled, self.stale, self.workers, self.duration)
+
+
+def isBytecodeCurrent(source, cfile):
+    # timestamp based pyc header: magic, flags, source mtime and size
+    try:
+        st = os.stat(source)
+        with open(cfile, 'rb') as f:
+            header = f.read(16)
+    except OSError:
+        return False
+
+    if len(header) < 16 or header[:4] != importlib.util.MAGIC_NUMBER:
+        return False
+    if int.from_bytes(header[4:8], 'little') != 0:
+        # hash based pyc files are checked by the import system itself
+        return True
+    return (int.from_bytes(header[8:12], 'little') == int(st.st_mtime) & 0xFFFFFFFF and
+            int.from_bytes(header[12:16], 'little') == st.st_size & 0xFFFFFFFF)
+
+def getSources(modules):
+    # python source files behind module objects, each once
+    sources = []
+    seen = set()
+    for mod in modules:
+        path = getSourcePath(mod)
+        if path is not None and path.endswith('.py') and path not in seen:
+            seen.add(path)
+            sources.append(path)
+    return sources
+
+def findStaleSources(sources):
+    return [s for s in sources if not isBytecodeCurrent(s, importlib.util.cache_from_source(s))]
+
+def getPythonExecutable():
+    # None when no interpreter is found to start compile processes with
+    path = os.environ.get(ENV_PYTHON)
+    if path:
+        return path
+
+    if os.path.basename(sys.executable).lower().startswith(('python', 'mayapy')):
+        return sys.executable
+    if module.MAYA_LOCATION:
+        path = os.path.join(module.MAYA_LOCATION, 'bin', 'mayapy.exe' if sys.platform == 'win32' else 'mayapy')
+        if os.path.isfile(path):
+            return path
+    return None
+
+def _compileChunk(jobs):
+    # runs in compile processes, [(source, error message or None)]
+    results = []
+    for source, cfile, optimize in jobs:
+        try:
+            py_compile.compile(source, cfile, doraise=True, optimize=optimize,
+                               invalidation_mode=py_compile.PycInvalidationMode.TIMESTAMP)
+            results.append((source, None))
+        except (py_compile.PyCompileError, OSError) as e:
+            results.append((source, str(e).strip()))
+    return results
+
+def _compileInPool(jobs, workers, executable):
+    # spawned processes, forking a host application with threads running is
+    # not safe
+    context = multiprocessing.get_context('spawn')
+    previous = multiprocessing.spawn.get_executable()
+    context.set_executable(executable)
+    try:
+        size = max(1, -(-len(jobs) // (workers * CHUNKS_PER_WORKER)))
+        chunks = [jobs[i:i + size] for i in range(0, len(jobs), size)]
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            results = []
+            for chunk in pool.map(_compileChunk, chunks):
+                results.extend(chunk)
+            return results
+    finally:
+        context.set_executable(previous)
+
+def compileSources(sources, workers=None):
+    # writes bytecode of `sources` on all cores, falls back to this process
+    # for a handful of files or when processes can't be started
+    started = time.perf_counter()
+    report = CompileReport(len(sources))
+    if not sources or sys.dont_write_bytecode:
+        report.duration = time.perf_counter() - started
+        return report
+
+    jobs = [(s, importlib.util.cache_from_source(s), sys.flags.optimize) for s in sources]
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    executable = getPythonExecutable()
+
+    results = None
+    if workers > 1 and len(jobs) >= PARALLEL_THRESHOLD and executable is not None:
+        try:
+            results = _compileInPool(jobs, workers, executable)
+            report.workers = workers
+        except (OSError, concurrent.futures.process.BrokenProcessPool):
+            results = None
+    if results is None:
+        results = _compileChunk(jobs)
+
+    for source, error in results:
+        if error is None:
+            report.compiled += 1
+        else:
+            report.failed.append((source, error))
+    report.duration = time.perf_counter() - started
+    return report
+
+def compileStale(sources, workers=None):
+    # compiles the ones of `sources` whose bytecode is missing or out of date
+    return compileSources(findStaleSources(sources), workers=workers)
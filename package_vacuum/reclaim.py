@@ -0,0 +1,138 @@
+import gc
+import sys
+import time
+import types
+
+import package_vacuum.module as module
+
+
+MAX_SURVIVORS = 20
+MAX_REFERRERS = 5
+# survivors whose referrers are traced, the others are only listed
+MAX_TRACED = 5
+# seconds spent describing referrers before the remaining ones are left out
+TRACE_BUDGET = 0.2
+
+
+class ReclaimReport(object):
+    def __init__(self):
+        # modules cleaned since the last measurement
+        self.modules = 0
+        # unreachable objects found by the collection
+        self.collected = 0
+        # memory blocks and bytes given back, bytes are None unless tracemalloc
+        # was tracing before the clean
+        self.releasedBlocks = 0
+        self.releasedBytes = None
+        # (name, [referrer description]) of cleaned modules still alive
+        self.survivors = []
+        # seconds spent collecting and tracing referrers
+        self.duration = 0.0
+
+    def __repr__(self):
+        return '<ReclaimReport modules={0} collected={1} blocks={2} survivors={3}>'.format(
+            self.modules, self.collected, self.releasedBlocks, len(self.survivors))
+
+
+def describeReferrer(referrer, target, moduleDicts):
+    if isinstance(referrer, dict):
+        keys = [k for k, v in referrer.items() if v is target]
+        key = repr(keys[0]) if keys else '?'
+        owner = moduleDicts.get(id(referrer))
+        if owner is not None:
+            return "global {0} of [ {1} ]".format(key, owner)
+        return "dict key {0}".format(key)
+
+    if isinstance(referrer, types.FrameType):
+        code = referrer.f_code
+        return "frame of {0} ({1}:{2})".format(code.co_name, code.co_filename, referrer.f_lineno)
+
+    if isinstance(referrer, types.FunctionType):
+        return "function {0}".format(getattr(referrer, '__qualname__', referrer.__name__))
+
+    return type(referrer).__name__
+
+
+def findReferrers(survivors, deadline=None):
+    # one heap walk for all survivors, each referrer is then attributed to the
+    # survivors it points at until `deadline`
+    byId = dict((id(mod), name) for name, mod in survivors)
+    moduleDicts = {}
+    for name, mod in list(sys.modules.items()) + survivors:
+        d = getattr(mod, '__dict__', None)
+        if isinstance(d, dict):
+            moduleDicts[id(d)] = name
+
+    modules = [mod for _, mod in survivors]
+    referrers = dict((name, []) for name, _ in survivors)
+    ignored = set([id(survivors), id(modules), id(sys._getframe())])
+    ignored.update(id(pair) for pair in survivors)
+
+    for referrer in gc.get_referrers(*modules):
+        if deadline is not None and time.perf_counter() > deadline:
+            break
+        if id(referrer) in ignored:
+            continue
+        for target in gc.get_referents(referrer):
+            name = byId.get(id(target))
+            if name is not None and len(referrers[name]) < MAX_REFERRERS:
+                referrers[name].append(describeReferrer(referrer, target, moduleDicts))
+
+    del modules
+    return [(name, referrers[name]) for name, _ in survivors]
+
+
+def collect(results):
+    # collects garbage left by the given `VacuumResult`s, cleaned with
+    # `reclaim=True`, and reports what got freed, returns the report and weak
+    # references to the cleaned modules that survived
+    report = ReclaimReport()
+    started = time.perf_counter()
+
+    released = {}
+    before = None
+    for result in results:
+        released.update(result.released)
+        if before is None and result.memoryBefore is not None:
+            before = result.memoryBefore
+    report.modules = len(released)
+
+    # modules are in the oldest generation by the time they get cleaned, a
+    # full collection is needed to break their globals cycles, finalizers run
+    # on the calling thread so Qt objects of cleaned modules die on the gui one
+    report.collected = gc.collect()
+
+    if before is not None:
+        blocks, tracedBytes = module.getMemoryUsage()
+        report.releasedBlocks = max(0, before[0] - blocks)
+        if before[1] is not None and tracedBytes is not None:
+            report.releasedBytes = max(0, before[1] - tracedBytes)
+
+    survivors = [(name, released[name]) for name in sorted(released) if released[name]() is not None][:MAX_SURVIVORS]
+    report.survivors = [(name, []) for name, _ in survivors]
+
+    report.duration = time.perf_counter() - started
+    return report, survivors
+
+def traceSurvivors(report, survivors):
+    # fills in what keeps the first few survivors alive, walks the whole heap
+    # so it is better left to a worker thread
+    started = time.perf_counter()
+
+    # no loop variable may keep a survivor alive while referrers are traced
+    alive = [(name, ref()) for name, ref in survivors[:MAX_TRACED]]
+    alive = [pair for pair in alive if pair[1] is not None]
+
+    traced = {}
+    if alive:
+        traced = dict(findReferrers(alive, started + TRACE_BUDGET))
+    del alive
+
+    report.survivors = [(name, traced.get(name, referrers)) for name, referrers in report.survivors]
+    report.duration += time.perf_counter() - started
+    return report
+
+def measure(results):
+    # both steps at once, for headless use
+    report, survivors = collect(results)
+    return traceSurvivors(report, survivors)
@@ -0,0 +1,177 @@
+import sys
+import time
+import importlib
+import importlib.util
+import py_compile
+
+import package_vacuum.module as module
+import package_vacuum.importprofile as importprofile
+import package_vacuum.precompile as precompile
+
+
+class ReloadPlan(object):
+    def __init__(self, names, entryPoints, sources, preview):
+        # modules to clean, in clean order
+        self.names = names
+        # namespace roots among `names` to import again, dependencies first
+        self.entryPoints = entryPoints
+        # python source files of `names` worth warming up
+        self.sources = sources
+        # dry run `VacuumResult` the plan was made from
+        self.preview = preview
+
+
+class ReloadResult(object):
+    def __init__(self, plan):
+        self.plan = plan
+        self.vacuumResult = None
+        # (name, seconds) per imported entry point, in import order
+        self.reloaded = []
+        # (name, error message) of entry points failing to import
+        self.failed = []
+        # {name: (inclusive, exclusive)} of every module imported on the way
+        self.moduleTimes = {}
+        # (bytecode files written, files read) by the warm-up
+        self.warmed = (0, 0)
+        # seconds per phase: 'warm', 'clean', 'import' and 'total'
+        self.timings = {}
+
+    def __repr__(self):
+        return '<ReloadResult reloaded={0} failed={1} total={2:.4f}s>'.format(
+            len(self.reloaded), len(self.failed), self.timings.get('total', 0.0))
+
+
+def _entryOf(name, entrySet):
+    while name not in entrySet:
+        name = name.rpartition('.')[0]
+    return name
+
+def sortEntryPoints(entryPoints, names):
+    # entry points ordered so that each comes after the ones it imports from,
+    # dependencies of sub-modules count for their entry point, cycles are
+    # broken alphabetically
+    entrySet = set(entryPoints)
+    nameSet = set(names)
+    graph = module.getDependencyGraph()
+
+    requires = dict((e, set()) for e in entryPoints)
+    for name in names:
+        entry = _entryOf(name, entrySet)
+        for dependency in graph.dependencies(name):
+            if dependency in nameSet:
+                other = _entryOf(dependency, entrySet)
+                if other != entry:
+                    requires[entry].add(other)
+
+    ordered = []
+    done = set()
+    pending = sorted(entryPoints)
+    while pending:
+        ready = [e for e in pending if requires[e].issubset(done)]
+        if not ready:
+            ready = pending[:1]
+        for e in ready:
+            ordered.append(e)
+            done.add(e)
+        pending = [e for e in pending if e not in done]
+
+    return ordered
+
+def planReload(patterns, cascade=True, ignoreInternal=True, dependents=False):
+    # works out what a clean would remove and what to import again while every
+    # module is still loaded
+    preview = module.vacuum(patterns, cascade=cascade, ignoreInternal=ignoreInternal, dryRun=True, dependents=dependents)
+    names = preview.cleaned
+    nameSet = set(names)
+
+    entryPoints = [n for n in names if n.rpartition('.')[0] not in nameSet]
+
+    sources = precompile.getSources(module.gModuleTable.get(name) for name in names)
+
+    return ReloadPlan(names, sortEntryPoints(entryPoints, names), sources, preview)
+
+def warmSource(source):
+    # makes sure the import finds current bytecode, already in the page cache,
+    # returns True when bytecode had to be written
+    cfile = importlib.util.cache_from_source(source)
+    if precompile.isBytecodeCurrent(source, cfile):
+        try:
+            with open(cfile, 'rb') as f:
+                f.read()
+        except OSError:
+            pass
+        return False
+
+    if sys.dont_write_bytecode:
+        return False
+    try:
+        py_compile.compile(source, cfile, doraise=True)
+        return True
+    except (py_compile.PyCompileError, OSError):
+        # broken or read-only sources are left for the import to report
+        return False
+
+def warmSources(sources, isCancelled=None, parallel=False):
+    # (bytecode files written, files read), safe to run off the main thread,
+    # `parallel` compiles stale files in a process pool first
+    compiled = precompile.compileStale(sources).compiled if parallel else 0
+    written = 0
+    read = 0
+    for source in sources:
+        if isCancelled is not None and isCancelled():
+            break
+        if warmSource(source):
+            written += 1
+        else:
+            read += 1
+    # files compiled up front are current by now and were only read again
+    return (written + compiled, max(0, read - compiled))
+
+def cleanPlan(plan, result, reclaim=False):
+    started = time.perf_counter()
+    result.vacuumResult = module.vacuum(plan.names, cascade=False, ignoreInternal=False, reclaim=reclaim)
+    result.timings['clean'] = time.perf_counter() - started
+
+def importPlan(plan, result):
+    # imports entry points again on the calling thread, timing each of them and
+    # every module imported on the way, the import profiler is installed for
+    # the time being if it isn't already
+    started = time.perf_counter()
+    before = set(sys.modules)
+    importlib.invalidate_caches()
+
+    profiling = importprofile.isInstalled()
+    if not profiling:
+        importprofile.install()
+    try:
+        for name in plan.entryPoints:
+            entryStarted = time.perf_counter()
+            try:
+                importlib.import_module(name)
+                result.reloaded.append((name, time.perf_counter() - entryStarted))
+            except Exception as e:
+                result.failed.append((name, '{0}: {1}'.format(type(e).__name__, e)))
+    finally:
+        if not profiling:
+            importprofile.uninstall()
+
+    imported = [n for n in sys.modules if n not in before]
+    result.moduleTimes = importprofile.getImportTimes(imported)
+    result.timings['import'] = time.perf_counter() - started
+
+def cleanAndReload(patterns, cascade=True, ignoreInternal=True, dependents=False, warm=True, parallel=False):
+    # headless clean & reload: bytecode is warmed up first, then modules are
+    # cleaned and entry points imported again in dependency order
+    started = time.perf_counter()
+    plan = planReload(patterns, cascade=cascade, ignoreInternal=ignoreInternal, dependents=dependents)
+    result = ReloadResult(plan)
+
+    if warm:
+        warmStarted = time.perf_counter()
+        result.warmed = warmSources(plan.sources, parallel=parallel)
+        result.timings['warm'] = time.perf_counter() - warmStarted
+
+    cleanPlan(plan, result)
+    importPlan(plan, result)
+    result.timings['total'] = time.perf_counter() - started
+    return result
@@ -0,0 +1,192 @@
+import time
+import bisect
+import functools
+import threading
+import inspect
+
+import package_vacuum.module as module
+
+
+# upper bounds of histogram buckets in milliseconds, one more open bucket
+# collects anything slower
+BUCKET_BOUNDS = (0.01, 0.03, 0.1, 0.3, 1.0, 3.0, 10.0, 30.0, 100.0, 300.0, 1000.0, 3000.0)
+
+# public functions of `package_vacuum.module` timed while recording is enabled,
+# anything defined there without a leading underscore
+def getModuleFunctions():
+    return sorted(
+        attr for attr, value in vars(module).items()
+        if inspect.isfunction(value) and value.__module__ == module.__name__ and not attr.startswith('_'))
+
+
+class CallStats(object):
+    __slots__ = ('name', 'count', 'total', 'min', 'max', 'buckets')
+
+    def __init__(self, name):
+        self.name = name
+        self.count = 0
+        # seconds
+        self.total = 0.0
+        self.min = None
+        self.max = 0.0
+        self.buckets = [0] * (len(BUCKET_BOUNDS) + 1)
+
+    def record(self, elapsed):
+        self.count += 1
+        self.total += elapsed
+        if self.min is None or elapsed < self.min:
+            self.min = elapsed
+        if elapsed > self.max:
+            self.max = elapsed
+        self.buckets[bisect.bisect_left(BUCKET_BOUNDS, elapsed * 1000.0)] += 1
+
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, p):
+        # upper bound of the bucket holding the p-th percentile in seconds, the
+        # open bucket reports the slowest call seen
+        if not self.count:
+            return 0.0
+
+        rank = p / 100.0 * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if n and seen >= rank:
+                if i < len(BUCKET_BOUNDS):
+                    return min(BUCKET_BOUNDS[i] / 1000.0, self.max)
+                break
+        return self.max
+
+    def toDict(self):
+        return {
+            'name': self.name,
+            'count': self.count,
+            'total_ms': self.total * 1000.0,
+            'mean_ms': self.mean() * 1000.0,
+            'min_ms': (self.min or 0.0) * 1000.0,
+            'max_ms': self.max * 1000.0,
+            'p95_ms': self.percentile(95) * 1000.0,
+            'buckets': list(self.buckets),
+        }
+
+
+# call statistics by name, recorded from the gui thread and the query worker
+class StatsRecorder(object):
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def record(self, name, elapsed):
+        with self._lock:
+            stats = self._stats.get(name)
+            if stats is None:
+                stats = self._stats[name] = CallStats(name)
+            stats.record(elapsed)
+
+    def snapshot(self):
+        # detached copies sorted by total time, slowest first
+        with self._lock:
+            copies = []
+            for stats in self._stats.values():
+                copy = CallStats(stats.name)
+                copy.count = stats.count
+                copy.total = stats.total
+                copy.min = stats.min
+                copy.max = stats.max
+                copy.buckets = list(stats.buckets)
+                copies.append(copy)
+
+        copies.sort(key=lambda s: (-s.total, s.name))
+        return copies
+
+    def reset(self):
+        with self._lock:
+            self._stats = {}
+
+
+gRecorder = StatsRecorder()
+gEnabled = False
+
+# original functions replaced by timing wrappers while enabled
+gPatched = {}
+
+
+def _timingWrapper(name, func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            gRecorder.record(name, time.perf_counter() - started)
+    return wrapper
+
+def timed(name):
+    # decorator for methods that can't be patched after the fact, e.g. slots
+    # already bound to signals, costs one flag check while disabled
+    def decorator(func):
+        # qt hands a slot every signal argument it can take, judged from the
+        # wrapper's signature, extra ones are dropped for slots without *args
+        code = func.__code__
+        argCount = None if code.co_flags & inspect.CO_VARARGS else code.co_argcount
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if argCount is not None:
+                args = args[:argCount]
+            if not gEnabled:
+                return func(*args, **kwargs)
+
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                gRecorder.record(name, time.perf_counter() - started)
+        return wrapper
+    return decorator
+
+def isEnabled():
+    return gEnabled
+
+def enable():
+    # module functions are swapped for timing wrappers in place, callers look
+    # them up as module attributes so nothing is left running through a
+    # wrapper once disabled again
+    global gEnabled
+
+    if gEnabled:
+        return
+    for attr in getModuleFunctions():
+        func = getattr(module, attr)
+        gPatched[attr] = func
+        setattr(module, attr, _timingWrapper('module.' + attr, func))
+    gEnabled = True
+
+def disable():
+    global gEnabled
+
+    if not gEnabled:
+        return
+    for attr, func in gPatched.items():
+        setattr(module, attr, func)
+    gPatched.clear()
+    gEnabled = False
+
+def reset():
+    gRecorder.reset()
+
+def getStats():
+    return gRecorder.snapshot()
+
+def formatStats(stats=None):
+    if stats is None:
+        stats = getStats()
+
+    lines = ['{0:<40} {1:>8} {2:>11} {3:>10} {4:>10} {5:>10}'.format(
+        'name', 'calls', 'total ms', 'mean ms', 'p95 ms', 'max ms')]
+    for s in stats:
+        lines.append('{0:<40} {1:>8} {2:>11.2f} {3:>10.3f} {4:>10.3f} {5:>10.3f}'.format(
+            s.name, s.count, s.total * 1000.0, s.mean() * 1000.0, s.percentile(95) * 1000.0, s.max * 1000.0))
+    return '\n'.join(lines)
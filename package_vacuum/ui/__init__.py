@@ -1,4 +1,10 @@
 __author__ = 'James.Ni'
 __version__ = '1.2.0'
 
-from .main import MainWindow
+# the window is imported on first use, so helpers of this package that don't
+# need Qt, e.g. `logstore` and `listmerge`, can be used without it
+def __getattr__(name):
+    if name == 'MainWindow':
+        from .main import MainWindow
+        return MainWindow
+    raise AttributeError("module {0!r} has no attribute {1!r}".format(__name__, name))
@@ -0,0 +1,54 @@
+# row operations turning one sorted list of names into another, kept apart from
+# the list model so they can be checked without Qt
+
+
+def isSortedUnique(items):
+    return all(a < b for a, b in zip(items, items[1:]))
+
+def canMerge(items, newItems):
+    # both lists must be sorted, ranked lists, e.g. fuzzy results, are rebuilt
+    return bool(items) and bool(newItems) and isSortedUnique(items) and isSortedUnique(newItems)
+
+def findRemoveRuns(items, keep):
+    # (first, last) row runs of `items` missing from `keep`, top-down, to be
+    # removed bottom-up
+    runs = []
+    row = 0
+    itemCount = len(items)
+    while row < itemCount:
+        if items[row] in keep:
+            row += 1
+            continue
+        first = row
+        while row < itemCount and items[row] not in keep:
+            row += 1
+        runs.append((first, row - 1))
+    return runs
+
+def findInsertRuns(survivors, newItems):
+    # (first, last) rows of `newItems` to insert top-down into `survivors`,
+    # which must be a subsequence of `newItems`
+    runs = []
+    row = 0
+    survivor = 0
+    newItemCount = len(newItems)
+    while row < newItemCount:
+        if survivor < len(survivors) and survivors[survivor] == newItems[row]:
+            row += 1
+            survivor += 1
+            continue
+        first = row
+        nextSurvivor = survivors[survivor] if survivor < len(survivors) else None
+        while row < newItemCount and newItems[row] != nextSurvivor:
+            row += 1
+        runs.append((first, row - 1))
+    return runs
+
+def mergeSorted(items, newItems):
+    # what applying both kinds of runs does to a plain list
+    result = list(items)
+    for first, last in reversed(findRemoveRuns(result, set(newItems))):
+        del result[first:last + 1]
+    for first, last in findInsertRuns(list(result), newItems):
+        result[first:first] = newItems[first:last + 1]
+    return result
@@ -0,0 +1,147 @@
+import os
+import re
+import tempfile
+from array import array
+from collections import OrderedDict
+
+
+def _escape(message):
+    return message.replace('\\', '\\\\').replace('\n', '\\n').replace('\r', '\\r')
+
+_UNESCAPE_PATTERN = re.compile(r'\\(.)')
+_UNESCAPE_MAP = {'n': '\n', 'r': '\r', '\\': '\\'}
+
+def _unescape(text):
+    return _UNESCAPE_PATTERN.sub(lambda m: _UNESCAPE_MAP.get(m.group(1), m.group(1)), text)
+
+
+# append-only log history spilled to a temporary file
+#
+# each record is one `<level>\t<escaped message>` line, only the file offset of
+# every page start is kept in memory, pages are read back on demand and kept in
+# a small LRU cache, so memory stays flat however long the history grows
+class LogStore(object):
+    PAGE_SIZE = 256
+    CACHED_PAGES = 8
+
+    def __init__(self, path=None):
+        if path is None:
+            fd, path = tempfile.mkstemp(prefix='package_vacuum_', suffix='.log')
+            os.close(fd)
+            self._ownsFile = True
+        else:
+            self._ownsFile = False
+
+        self._path = path
+        self._writer = open(path, 'wb')
+        self._reader = open(path, 'rb')
+
+        self._size = 0
+        self._count = 0
+        self._pageOffsets = array('Q')
+        self._tail = []
+        self._pages = OrderedDict()
+
+    def __len__(self):
+        return self._count
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+    def path(self):
+        return self._path
+
+    def append(self, records):
+        # `records` is an iterable of (message, level) pairs
+        chunks = []
+        for message, level in records:
+            if self._count % LogStore.PAGE_SIZE == 0:
+                if self._tail:
+                    self._cachePage(len(self._pageOffsets) - 1, self._tail)
+                    self._tail = []
+                self._pageOffsets.append(self._size)
+
+            line = u'{0}\t{1}\n'.format(level, _escape(message)).encode('utf-8')
+            chunks.append(line)
+            self._size += len(line)
+            self._count += 1
+            self._tail.append((message, level))
+
+        if chunks:
+            self._writer.write(b''.join(chunks))
+            self._writer.flush()
+
+    def _cachePage(self, page, records):
+        self._pages[page] = records
+        self._pages.move_to_end(page)
+        while len(self._pages) > LogStore.CACHED_PAGES:
+            self._pages.popitem(last=False)
+
+    def _decode(self, line):
+        levelText, _, message = line.decode('utf-8').rstrip('\n').partition('\t')
+        return (_unescape(message), int(levelText))
+
+    def _readPage(self, page):
+        records = self._pages.get(page)
+        if records is not None:
+            self._pages.move_to_end(page)
+            return records
+
+        pageCount = min(LogStore.PAGE_SIZE, self._count - page * LogStore.PAGE_SIZE)
+        self._reader.seek(self._pageOffsets[page])
+        records = [self._decode(self._reader.readline()) for _ in range(pageCount)]
+        self._cachePage(page, records)
+        return records
+
+    def get(self, row):
+        page, offset = divmod(row, LogStore.PAGE_SIZE)
+        if page == len(self._pageOffsets) - 1:
+            return self._tail[offset]
+        return self._readPage(page)[offset]
+
+    def matches(self, message, text):
+        return _escape(text).lower() in _escape(message).lower()
+
+    def search(self, text):
+        # streams through the file once, returns rows whose message contains
+        # `text` case-insensitively
+        needle = _escape(text).lower()
+        rows = array('L')
+
+        self._reader.seek(0)
+        for row in range(self._count):
+            line = self._reader.readline().decode('utf-8')
+            if needle in line[line.index('\t') + 1:].lower():
+                rows.append(row)
+
+        return rows
+
+    def clear(self):
+        self._writer.seek(0)
+        self._writer.truncate()
+        # buffered reads may still hold truncated content
+        self._reader.close()
+        self._reader = open(self._path, 'rb')
+
+        self._size = 0
+        self._count = 0
+        self._pageOffsets = array('Q')
+        self._tail = []
+        self._pages = OrderedDict()
+
+    def close(self):
+        if self._writer is None:
+            return
+
+        self._writer.close()
+        self._reader.close()
+        self._writer = self._reader = None
+
+        if self._ownsFile:
+            try:
+                os.remove(self._path)
+            except OSError:
+                pass
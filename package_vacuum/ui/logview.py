@@ -1,8 +1,13 @@
+from array import array
+
 import PySide.QtCore as QtCore
 from PySide.QtCore import Qt, Signal, Slot
 import PySide.QtWidgets as QtWidgets
 import PySide.QtGui as QtGui
 
+from .logstore import LogStore
+from .metrics import TextRowDelegate
+
 
 def constructPen(color, style):
     pen = QtGui.QPen(color)
@@ -17,51 +22,82 @@ class LogLevel(object):
     ERROR = 0x03
 
 
+# log rows live in a fixed-capacity ring buffer when `maxSize` is set, the oldest
+# rows are overwritten in place instead of shifting the whole list
 class LogViewModel(QtCore.QAbstractListModel):
     def __init__(self, maxSize=0, parent=None):
         super(LogViewModel, self).__init__(parent=parent)
 
         self._maxSize = maxSize
-        self._logs = []
+        self._logs = [None] * maxSize
+        self._head = 0
+        self._count = 0
         self._focusIndex = -1
 
     # overrides #
 
     def rowCount(self, parent=QtCore.QModelIndex()):
-        return len(self._logs)
+        return self._count
 
     def data(self, index, role=Qt.DisplayRole):
         if index.isValid() and role == Qt.DisplayRole:
-            return self._logs[index.row()]
+            return self._getLog(index.row())
         else:
             return (None, None)
 
     # custom api #
 
-    def _removeOldestLog(self):
-        self.beginRemoveRows(self.index(0, 0), 0, 1)
-        self._logs.pop(0)
+    def _getLog(self, row):
+        if self._maxSize > 0:
+            return self._logs[(self._head + row) % self._maxSize]
+        else:
+            return self._logs[row]
+
+    def _removeOldestLogs(self, count):
+        self.beginRemoveRows(QtCore.QModelIndex(), 0, count - 1)
+        for i in range(count):
+            self._logs[(self._head + i) % self._maxSize] = None
+        self._head = (self._head + count) % self._maxSize
+        self._count -= count
         self.endRemoveRows()
 
         if self._focusIndex >= 0:
-            self._focusIndex -= 1
+            self._focusIndex = max(self._focusIndex - count, -1)
+
+    def addLogs(self, logs):
+        # inserts a batch of (message, level) pairs in a single transaction
+        logs = list(logs)
+        if self._maxSize > 0 and len(logs) > self._maxSize:
+            logs = logs[-self._maxSize:]
+
+        batchSize = len(logs)
+        if batchSize == 0:
+            return
+
+        if self._maxSize > 0:
+            overflow = self._count + batchSize - self._maxSize
+            if overflow > 0:
+                self._removeOldestLogs(overflow)
+
+        first = self._count
+        self.beginInsertRows(QtCore.QModelIndex(), first, first + batchSize - 1)
+        if self._maxSize > 0:
+            for i, log in enumerate(logs):
+                self._logs[(self._head + first + i) % self._maxSize] = log
+        else:
+            self._logs.extend(logs)
+        self._count += batchSize
+        self.endInsertRows()
 
     def addLog(self, message, level=LogLevel.NORMAL):
-        logCount = len(self._logs)
-
-        if self._maxSize > 0 and logCount >= self._maxSize:
-            self._removeOldestLog()
-            logCount -= 1
-
-        self.beginInsertRows(self.index(0, 0), logCount, logCount + 1)
-        self._logs.append((message, level))
-        self.endInsertRows()
+        self.addLogs([(message, level)])
 
     def clear(self):
-        logCount = len(self._logs)
-        if logCount > 0:
-            self.beginRemoveRows(self.index(0, 0), 0, logCount - 1)
-            self._logs = []
+        if self._count > 0:
+            self.beginRemoveRows(QtCore.QModelIndex(), 0, self._count - 1)
+            self._logs = [None] * self._maxSize
+            self._head = 0
+            self._count = 0
             self.endRemoveRows()
             self._focusIndex = -1
 
@@ -74,7 +110,77 @@ class LogViewModel(QtCore.QAbstractListModel):
             self.dataChanged.emit(index, index)
 
 
-class LogViewDelegate(QtWidgets.QStyledItemDelegate):
+# unlimited log history kept in a `LogStore` file, rows are paged in from disk
+# as the view asks for them and searching streams through the file
+class LogHistoryModel(LogViewModel):
+    def __init__(self, store, parent=None):
+        super(LogHistoryModel, self).__init__(maxSize=0, parent=parent)
+
+        self._store = store
+        self._filterText = ''
+        self._filterRows = None
+        self._widest = ''
+
+    # overrides #
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        if self._filterRows is not None:
+            return len(self._filterRows)
+        else:
+            return len(self._store)
+
+    # custom api #
+
+    def _getLog(self, row):
+        if self._filterRows is not None:
+            row = self._filterRows[row]
+        return self._store.get(row)
+
+    def widestText(self):
+        return self._widest
+
+    def addLogs(self, logs):
+        logs = list(logs)
+        if len(logs) == 0:
+            return
+
+        for message, _ in logs:
+            if len(message) > len(self._widest):
+                self._widest = message
+
+        first = len(self._store)
+        if self._filterRows is None:
+            self.beginInsertRows(QtCore.QModelIndex(), first, first + len(logs) - 1)
+            self._store.append(logs)
+            self.endInsertRows()
+        else:
+            matched = [first + i for i, log in enumerate(logs) if self._store.matches(log[0], self._filterText)]
+            self._store.append(logs)
+
+            if matched:
+                row = len(self._filterRows)
+                self.beginInsertRows(QtCore.QModelIndex(), row, row + len(matched) - 1)
+                self._filterRows.extend(matched)
+                self.endInsertRows()
+
+    def clear(self):
+        self.beginResetModel()
+        self._store.clear()
+        if self._filterRows is not None:
+            self._filterRows = array('L')
+        self._widest = ''
+        self._focusIndex = -1
+        self.endResetModel()
+
+    def setFilter(self, text):
+        self.beginResetModel()
+        self._filterText = text
+        self._filterRows = self._store.search(text) if text else None
+        self._focusIndex = -1
+        self.endResetModel()
+
+
+class LogViewDelegate(TextRowDelegate):
     LOG_NORMAL_BRUSH = QtGui.QBrush(Qt.transparent)
     LOG_NORMAL_PEN = QtGui.QPen(Qt.white)
     LOG_WARNING_BRUSH = QtGui.QBrush(QtGui.QColor('#FFF26E'))
@@ -89,14 +195,8 @@ class LogViewDelegate(QtWidgets.QStyledItemDelegate):
     def __init__(self, parent=None):
         super(LogViewDelegate, self).__init__(parent=parent)
 
-    def sizeHint(self, option, index):
-        content = index.data(Qt.DisplayRole)[0]
-        if content is not None:
-            metrics = QtGui.QFontMetrics(self.parent().font())
-            contentWidth = metrics.horizontalAdvance(content) + LogViewDelegate.TEXT_PADDING * 2
-            return QtCore.QSize(max(contentWidth, option.rect.width()), 20)
-        else:
-            return QtCore.QSize(0, 0)
+    def rowText(self, index):
+        return index.data(Qt.DisplayRole)[0]
 
     def editorEvent(self, event, model, option, index):
         if (event.type() == QtCore.QEvent.MouseButtonPress and event.button() == Qt.LeftButton):
@@ -144,25 +244,68 @@ class LogViewDelegate(QtWidgets.QStyledItemDelegate):
         painter.restore()
 
 class LogView(QtWidgets.QListView):
-    def __init__(self, maxSize=20, parent=None):
+    SEARCH_DELAY = 200
+
+    def __init__(self, maxSize=20, history=False, parent=None):
         super(LogView, self).__init__(parent=parent)
 
         self.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
         self.setHorizontalScrollBarPolicy(Qt.ScrollBarAsNeeded)
 
-        model = LogViewModel(maxSize=maxSize, parent=self)
+        # with `history` logs are unlimited and spilled to disk, `maxSize` is ignored
+        if history:
+            model = LogHistoryModel(LogStore(), parent=self)
+        else:
+            model = LogViewModel(maxSize=maxSize, parent=self)
         self.setModel(model)
 
+        self._searchText = ''
+        self._searchTimer = QtCore.QTimer(self)
+        self._searchTimer.setSingleShot(True)
+        self._searchTimer.setInterval(LogView.SEARCH_DELAY)
+        self._searchTimer.timeout.connect(self._applySearch)
+
         delegate = LogViewDelegate(self)
         self.setItemDelegate(delegate)
 
+        self._scrollPending = False
+
+        self.setUniformRows(True)
+
+    def setUniformRows(self, enabled):
+        self.setUniformItemSizes(enabled)
+        self.itemDelegate().setUniformRows(enabled, self.model())
+
     def _logViewToBottom(self):
+        self._scrollPending = False
         scrollbar = self.verticalScrollBar()
         scrollbar.setValue(scrollbar.maximum())
 
+    def writeLogs(self, logs):
+        # `logs` is a batch of (message, level) pairs, the whole batch shares one
+        # model transaction and one deferred scroll
+        self.model().addLogs(logs)
+
+        if not self._scrollPending:
+            self._scrollPending = True
+            QtCore.QTimer.singleShot(40, self._logViewToBottom)
+
     def writeLog(self, message, logLevel=LogLevel.NORMAL):
-        self.model().addLog(message, logLevel)
-        QtCore.QTimer.singleShot(40, self._logViewToBottom)
+        self.writeLogs([(message, logLevel)])
 
     def clearLog(self):
         self.model().clear()
+
+    def isSearchable(self):
+        return hasattr(self.model(), 'setFilter')
+
+    def search(self, text):
+        # only shows logs containing `text`, applied once typing pauses
+        if self.isSearchable():
+            self._searchText = text
+            self._searchTimer.start()
+
+    @Slot()
+    def _applySearch(self):
+        self.model().setFilter(self._searchText)
+        self._logViewToBottom()
@@ -1,4 +1,5 @@
 import sys
+import time
 import os.path
 
 import PySide.QtCore as QtCore
@@ -7,26 +8,79 @@ import PySide.QtWidgets as QtWidgets
 import PySide.QtGui as QtGui
 
 from .logview import LogLevel, LogView
+from .modulequery import ModuleQueryPipeline
 from .selectionview import SelectionView
+from .sizeanalysis import SizeAnalysisPipeline
+from .reloadpipeline import ReloadPipeline
+from .precompilepipeline import PrecompilePipeline
+from .reclaimpipeline import ReclaimPipeline
+from .treeview import ModuleTreeView
+from .sourcewatcher import SourceWatcher
+from .statsview import StatsView
 
 import package_vacuum.module as module
+import package_vacuum.stats as stats
+import package_vacuum.reclaim as reclaim
+import package_vacuum.metacache as metacache
+import package_vacuum.importprofile as importprofile
+import package_vacuum.reloader as reloader
+import package_vacuum.precompile as precompile
+import package_vacuum.baseline as baseline
 
 
-SELF_MODULE_NAME = 'package_vacuum'
-PHYSICAL_PIXEL_SCALE = QtGui.QGuiApplication.primaryScreen().logicalDotsPerInch() / 96.0
+FILTER_TOOLTIP = ("comma separated terms, e.g. rig.*,anim.*,!*.tests\n"
+                  "text: names containing it\n"
+                  "glob (* ? []): whole names\n"
+                  "re:pattern or /pattern/: regular expression\n"
+                  "!term: exclude matches")
+# delay before measuring reclaimed memory, cleans in quick succession are
+# measured together once things settle down
+RECLAIM_DELAY = 500
+# rows of the slowest imports report
+SLOWEST_IMPORTS_LIMIT = 20
+# modules listed per clean & reload, slowest first
+RELOAD_REPORT_LIMIT = 10
+
+# screen dpi is read on first use, there may be no application at import time
+gPhysicalPixelScale = None
+
+
+def getPhysicalPixelScale():
+    global gPhysicalPixelScale
+
+    if gPhysicalPixelScale is None:
+        gPhysicalPixelScale = QtGui.QGuiApplication.primaryScreen().logicalDotsPerInch() / 96.0
+    return gPhysicalPixelScale
 
 
 class ClearByNameWidgets(object):
     def __init__(self):
         self.userInput = None
         self.casecadeCheck = None
+        self.dependentsCheck = None
         self.ignoreInternalCheck = None
+        self.autoCleanCheck = None
+        self.reloadButton = None
 
 class ClearBySelectionWidgets(object):
     def __init__(self):
         self.filterInput = None
+        self.fuzzyCheck = None
         self.ignoreInternalCheck = None
+        self.sizesBtn = None
+        self.sortBySizeBtn = None
+        self.treeBtn = None
+        self.importTimesBtn = None
         self.selectionView = None
+        self.treeView = None
+        self.viewStack = None
+
+class ClearToBaselineWidgets(object):
+    def __init__(self):
+        self.nameInput = None
+        self.baselineCombo = None
+        self.ignoreInternalCheck = None
+        self.newModulesLabel = None
 
 class AutoFittingTab(QtWidgets.QTabWidget):
     def __init__(self, *args, **kwargs):
@@ -78,14 +132,53 @@ class MainWindow(QtWidgets.QWidget):
 
         self._clearByNameWidgets = None
         self._clearBySelectionWidgets = None
+        self._clearToBaselineWidgets = None
 
         self._tabs = None
         self._logView = None
+        self._statsView = None
+        self._reclaimCheck = None
+        self._precompileCheck = None
+
+        # query and module table generation the selection list was built from
+        self._listQuery = None
+        self._listGeneration = -1
+
+        self._queryPipeline = ModuleQueryPipeline(self)
+        self._queryPipeline.resultsReady.connect(self.onModuleQueryResults)
+
+        self._sizePipeline = SizeAnalysisPipeline(self)
+        self._sizePipeline.sizesReady.connect(self.onSizesReady)
+
+        self._reloadPipeline = ReloadPipeline(self)
+        self._reloadPipeline.warmedUp.connect(self.onReloadWarmedUp)
+
+        self._precompilePipeline = PrecompilePipeline(self)
+        self._precompilePipeline.compiled.connect(self.onPrecompiled)
+
+        self._sourceWatcher = SourceWatcher(excludes=[module.SELF_MODULE_NAME], parent=self)
+        self._sourceWatcher.modulesChanged.connect(self.onSourcesChanged)
+
+        self._reclaimPipeline = ReclaimPipeline(self)
+        self._reclaimPipeline.reportReady.connect(self.onReclaimReport)
+
+        # clean results waiting for their memory report
+        self._pendingReclaims = []
+        self._reclaimTimer = QtCore.QTimer(self)
+        self._reclaimTimer.setSingleShot(True)
+        self._reclaimTimer.setInterval(RECLAIM_DELAY)
+        self._reclaimTimer.timeout.connect(self.reportReclaim)
 
         self._windowOpened = False
 
         self._initUI()
 
+        # metadata of the previous session makes the first list population
+        # skip classifying modules loaded from unchanged directories
+        restored = metacache.restore()
+        if restored:
+            self._logView.writeLog("restored metadata of {0} modules".format(restored))
+
     def _getImagePath(self, name):
         dir = os.path.dirname(__file__)
         return os.path.join(dir, 'image', name)
@@ -101,9 +194,11 @@ class MainWindow(QtWidgets.QWidget):
 
         # tabs
         tabs = AutoFittingTab(self)
-        tabs.setStyleSheet("QTabBar::tab {{ height: {0}px }}".format(25 * PHYSICAL_PIXEL_SCALE))
+        tabs.setStyleSheet("QTabBar::tab {{ height: {0}px }}".format(25 * getPhysicalPixelScale()))
         tabs.addTab(self._initExplicitInput(), 'Clean By Name')
         tabs.addTab(self._initModuleSelection(), 'Clean By Selection')
+        tabs.addTab(self._initBaseline(), 'Clean To Baseline')
+        tabs.currentChanged.connect(self.updateBaselineStatus)
         tabs.setSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Fixed)
         self._tabs = tabs
         layout.addWidget(tabs)
@@ -112,6 +207,25 @@ class MainWindow(QtWidgets.QWidget):
         logToolbar = SimpleToolbar('Logs', self)
         layout.addWidget(logToolbar)
 
+        # log search
+        logSearchInput = QtWidgets.QLineEdit(logToolbar)
+        logSearchInput.setPlaceholderText("search logs")
+        logSearchInput.setFixedHeight(20)
+        logSearchInput.setMaximumWidth(160)
+        logToolbar.addTool(logSearchInput)
+
+        # memory report checkbox
+        reclaimCheck = QtWidgets.QCheckBox('Memory report', logToolbar)
+        reclaimCheck.setToolTip("collect garbage after each clean and report memory released\nand modules still referenced")
+        logToolbar.addTool(reclaimCheck)
+        self._reclaimCheck = reclaimCheck
+
+        # precompile checkbox
+        precompileCheck = QtWidgets.QCheckBox('Precompile', logToolbar)
+        precompileCheck.setToolTip("after each clean, compile out of date bytecode of cleaned modules\non all cores so importing them again is faster")
+        logToolbar.addTool(precompileCheck)
+        self._precompileCheck = precompileCheck
+
         # clear log button
         clearLogBtn = QtWidgets.QPushButton(QtGui.QIcon(self._getImagePath('clean.svg')), '', logToolbar)
         clearLogBtn.setFixedSize(20, 20)
@@ -119,15 +233,45 @@ class MainWindow(QtWidgets.QWidget):
         clearLogBtn.clicked.connect(self.clearLog)
         logToolbar.addTool(clearLogBtn)
 
+        # stats toggle button
+        statsBtn = QtWidgets.QPushButton('Stats', logToolbar)
+        statsBtn.setCheckable(True)
+        statsBtn.setFixedHeight(20)
+        statsBtn.setToolTip("show call statistics")
+        logToolbar.addTool(statsBtn)
+
         # log view
-        logView = LogView(maxSize=20, parent=self)
+        logView = LogView(history=True, parent=self)
+        logSearchInput.textChanged.connect(logView.search)
         layout.addWidget(logView)
         self._logView = logView
 
+        # stats panel, hidden until asked for
+        statsView = StatsView(self)
+        statsView.setVisible(False)
+        statsBtn.toggled.connect(statsView.setVisible)
+        layout.addWidget(statsView)
+        self._statsView = statsView
+
     def showEvent(self, event):
         if not self._windowOpened:
             self._windowOpened = True
 
+    def closeEvent(self, event):
+        self._queryPipeline.shutdown()
+        self._sizePipeline.shutdown()
+        # a cancelled warm-up never reports back, the button is freed here
+        self._reloadPipeline.shutdown()
+        self._clearByNameWidgets.reloadButton.setEnabled(True)
+        self._precompilePipeline.shutdown()
+        # written on a thread, classifying every module takes a while
+        metacache.storeInBackground()
+        self._reclaimTimer.stop()
+        self._pendingReclaims = []
+        self._reclaimPipeline.shutdown()
+        self._clearByNameWidgets.autoCleanCheck.setChecked(False)
+        super(MainWindow, self).closeEvent(event)
+
     def _createHeaderLabel(self, header, parent):
         headerLabel = QtWidgets.QLabel(header, parent)
         headerLabel.setAlignment(Qt.AlignLeft|Qt.AlignVCenter)
@@ -186,6 +330,12 @@ class MainWindow(QtWidgets.QWidget):
         cascadeCheckbox.setChecked(True)
         widgetsSet.casecadeCheck = cascadeCheckbox
 
+        # dependents checkbox
+        dependentsCheck = QtWidgets.QCheckBox('Dependents', container)
+        dependentsCheck.setToolTip("also clear modules holding references to cleared ones")
+        dependentsCheck.setChecked(False)
+        widgetsSet.dependentsCheck = dependentsCheck
+
         # ignore internal checkbox
         ignoreInternalCheck = QtWidgets.QCheckBox('Ignore internal modules', container)
         ignoreInternalCheck.setChecked(True)
@@ -195,14 +345,32 @@ class MainWindow(QtWidgets.QWidget):
         checkboxGroup = QtWidgets.QHBoxLayout(container)
         checkboxGroup.setSpacing(20)
         checkboxGroup.addWidget(cascadeCheckbox)
+        checkboxGroup.addWidget(dependentsCheck)
         checkboxGroup.addWidget(ignoreInternalCheck)
         formLayout.addRow(self._createFormLabel('', container), checkboxGroup)
 
-        # clean action button
+        # auto clean checkbox
+        autoCleanCheck = QtWidgets.QCheckBox('Auto clean modules when their source changes', container)
+        autoCleanCheck.setToolTip("watch source files of non-internal modules")
+        autoCleanCheck.toggled.connect(self.setAutoClean)
+        widgetsSet.autoCleanCheck = autoCleanCheck
+        formLayout.addRow(self._createFormLabel('', container), autoCleanCheck)
+
+        # clean action buttons
         button = QtWidgets.QPushButton('Clean', container)
         button.clicked.connect(self.cleanByUserInput)
-        button.setFixedHeight(30 * PHYSICAL_PIXEL_SCALE)
-        layout.addWidget(button)
+        button.setFixedHeight(30 * getPhysicalPixelScale())
+
+        reloadButton = QtWidgets.QPushButton('Clean && Reload', container)
+        reloadButton.setToolTip("clean modules and import their top-level packages again,\nbytecode is warmed up in the background first")
+        reloadButton.clicked.connect(self.cleanAndReloadByUserInput)
+        reloadButton.setFixedHeight(30 * getPhysicalPixelScale())
+        widgetsSet.reloadButton = reloadButton
+
+        buttonGroup = QtWidgets.QHBoxLayout()
+        buttonGroup.addWidget(button)
+        buttonGroup.addWidget(reloadButton)
+        layout.addLayout(buttonGroup)
 
         self._clearByNameWidgets = widgetsSet
         return container
@@ -227,7 +395,8 @@ class MainWindow(QtWidgets.QWidget):
 
         filterInput = QtWidgets.QLineEdit(container)
         filterInput.setFixedHeight(30)
-        filterInput.textChanged.connect(self.updateModuleList)
+        filterInput.setToolTip(FILTER_TOOLTIP)
+        filterInput.textChanged.connect(self.onFilterChanged)
         layout.addWidget(filterInput)
         widgetSet.filterInput = filterInput
 
@@ -235,9 +404,22 @@ class MainWindow(QtWidgets.QWidget):
         ignoreInternalCheck = QtWidgets.QCheckBox('Ignore internal modules', container)
         ignoreInternalCheck.setChecked(True)
         ignoreInternalCheck.stateChanged.connect(self.updateModuleList)
-        layout.addWidget(ignoreInternalCheck)
         widgetSet.ignoreInternalCheck = ignoreInternalCheck
 
+        # fuzzy checkbox
+        fuzzyCheck = QtWidgets.QCheckBox('Fuzzy search', container)
+        fuzzyCheck.setToolTip("rank modules by fuzzy match of the filter, best first")
+        fuzzyCheck.stateChanged.connect(self.updateModuleList)
+        widgetSet.fuzzyCheck = fuzzyCheck
+
+        # checkbox set
+        checkboxGroup = QtWidgets.QHBoxLayout()
+        checkboxGroup.setSpacing(20)
+        checkboxGroup.addWidget(ignoreInternalCheck)
+        checkboxGroup.addWidget(fuzzyCheck)
+        checkboxGroup.addStretch()
+        layout.addLayout(checkboxGroup)
+
         # module list toolbar
         moduleListToolbar = SimpleToolbar(container)
         layout.addWidget(moduleListToolbar)
@@ -249,77 +431,533 @@ class MainWindow(QtWidgets.QWidget):
         refreshListBtn.clicked.connect(self.updateModuleList)
         moduleListToolbar.addTool(refreshListBtn)
 
+        # size column buttons
+        sizesBtn = QtWidgets.QPushButton('Sizes', moduleListToolbar)
+        sizesBtn.setCheckable(True)
+        sizesBtn.setFixedHeight(20)
+        sizesBtn.setToolTip("estimate memory retained by listed modules")
+        sizesBtn.toggled.connect(self.setShowSizes)
+        moduleListToolbar.addTool(sizesBtn)
+        widgetSet.sizesBtn = sizesBtn
+
+        sortBySizeBtn = QtWidgets.QPushButton('Sort by size', moduleListToolbar)
+        sortBySizeBtn.setCheckable(True)
+        sortBySizeBtn.setEnabled(False)
+        sortBySizeBtn.setFixedHeight(20)
+        sortBySizeBtn.setToolTip("heaviest packages first")
+        moduleListToolbar.addTool(sortBySizeBtn)
+        widgetSet.sortBySizeBtn = sortBySizeBtn
+
+        # import time column buttons
+        importTimesBtn = QtWidgets.QPushButton('Import times', moduleListToolbar)
+        importTimesBtn.setCheckable(True)
+        importTimesBtn.setFixedHeight(20)
+        importTimesBtn.setToolTip("show how long listed modules took to import, modules are timed\nwhile the import profiler is installed")
+        importTimesBtn.toggled.connect(self.setShowImportTimes)
+        moduleListToolbar.addTool(importTimesBtn)
+        widgetSet.importTimesBtn = importTimesBtn
+
+        slowestBtn = QtWidgets.QPushButton('Slowest', moduleListToolbar)
+        slowestBtn.setFixedHeight(20)
+        slowestBtn.setToolTip("log the slowest imports among listed modules")
+        slowestBtn.clicked.connect(self.reportSlowestImports)
+        moduleListToolbar.addTool(slowestBtn)
+
+        # tree mode button
+        treeBtn = QtWidgets.QPushButton('Tree', moduleListToolbar)
+        treeBtn.setCheckable(True)
+        treeBtn.setFixedHeight(20)
+        treeBtn.setToolTip("group modules by package, a selected package selects everything under it")
+        treeBtn.toggled.connect(self.setTreeMode)
+        moduleListToolbar.addTool(treeBtn)
+        widgetSet.treeBtn = treeBtn
+
         # module list
         selectionView = SelectionView(container)
-        selectionView.setSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding)
-
-        layout.addWidget(selectionView)
         widgetSet.selectionView = selectionView
+        sortBySizeBtn.toggled.connect(selectionView.setSortBySize)
+
+        # query results go to whichever of the list and the tree is shown,
+        # the other one stays empty
+        treeView = ModuleTreeView(container)
+        widgetSet.treeView = treeView
+
+        viewStack = QtWidgets.QStackedWidget(container)
+        viewStack.setSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding)
+        viewStack.addWidget(selectionView)
+        viewStack.addWidget(treeView)
+        layout.addWidget(viewStack)
+        widgetSet.viewStack = viewStack
 
         # clean action button
         button = QtWidgets.QPushButton('Clean', container)
         button.clicked.connect(self.cleanBySelection)
-        button.setFixedHeight(30 * PHYSICAL_PIXEL_SCALE)
+        button.setFixedHeight(30 * getPhysicalPixelScale())
         layout.addWidget(button)
 
         self._clearBySelectionWidgets = widgetSet
         return container
 
+    def _initBaseline(self):
+        widgetSet = ClearToBaselineWidgets()
+        container = QtWidgets.QWidget(self)
+
+        layout = QtWidgets.QVBoxLayout()
+        container.setLayout(layout)
+
+        # description
+        description = "clean every module imported since a baseline"
+        layout.addWidget(self._createHeaderLabel(description, container))
+
+        # separator
+        layout.addWidget(self._createHeaderSeparator(container))
+
+        # form
+        formLayout = QtWidgets.QFormLayout()
+        layout.addLayout(formLayout)
+
+        # record a baseline under a name
+        nameInput = QtWidgets.QLineEdit(container)
+        nameInput.setFixedHeight(25)
+        nameInput.setPlaceholderText(baseline.STARTUP_BASELINE)
+        nameInput.returnPressed.connect(self.recordBaseline)
+        widgetSet.nameInput = nameInput
+
+        recordBtn = QtWidgets.QPushButton('Record', container)
+        recordBtn.setFixedHeight(25)
+        recordBtn.setToolTip("remember modules loaded right now under this name")
+        recordBtn.clicked.connect(self.recordBaseline)
+
+        recordGroup = QtWidgets.QHBoxLayout()
+        recordGroup.addWidget(nameInput)
+        recordGroup.addWidget(recordBtn)
+        formLayout.addRow(self._createFormLabel('New Baseline', container), recordGroup)
+
+        # recorded baselines
+        baselineCombo = QtWidgets.QComboBox(container)
+        baselineCombo.setFixedHeight(25)
+        baselineCombo.currentIndexChanged.connect(self.updateBaselineStatus)
+        widgetSet.baselineCombo = baselineCombo
+
+        removeBtn = QtWidgets.QPushButton('Remove', container)
+        removeBtn.setFixedHeight(25)
+        removeBtn.clicked.connect(self.removeBaseline)
+
+        baselineGroup = QtWidgets.QHBoxLayout()
+        baselineGroup.addWidget(baselineCombo, 1)
+        baselineGroup.addWidget(removeBtn)
+        formLayout.addRow(self._createFormLabel('Baseline', container), baselineGroup)
+
+        # ignore internal checkbox
+        ignoreInternalCheck = QtWidgets.QCheckBox('Ignore internal modules', container)
+        ignoreInternalCheck.setChecked(True)
+        widgetSet.ignoreInternalCheck = ignoreInternalCheck
+        formLayout.addRow(self._createFormLabel('', container), ignoreInternalCheck)
+
+        # modules loaded since
+        newModulesLabel = QtWidgets.QLabel(container)
+        widgetSet.newModulesLabel = newModulesLabel
+        formLayout.addRow(self._createFormLabel('', container), newModulesLabel)
+
+        # clean action button
+        button = QtWidgets.QPushButton('Clean', container)
+        button.clicked.connect(self.cleanToBaseline)
+        button.setFixedHeight(30 * getPhysicalPixelScale())
+        layout.addWidget(button)
+
+        self._clearToBaselineWidgets = widgetSet
+        self._updateBaselineList()
+        return container
+
+    def _formatVacuumLogs(self, result, missingMessage):
+        logs = []
+        for name, reason in result.skipped:
+            if reason == module.SkipReason.SELF:
+                logs.append(("skipped module of this tool: [ {0} ]".format(name), LogLevel.NORMAL))
+        for name in result.cleaned:
+            logs.append(("cleaned module: [ {0} ]".format(name), LogLevel.NORMAL))
+        for name in result.missing:
+            logs.append((missingMessage.format(name), LogLevel.WARNING))
+
+        internal = sum(1 for _, reason in result.skipped if reason == module.SkipReason.INTERNAL)
+        if internal > 0 and not result.cleaned:
+            logs.append(("nothing cleaned, {0} matching modules are internal".format(internal), LogLevel.WARNING))
+
+        return logs
+
+    def _vacuum(self, patterns, **kwargs):
+        # memory is measured later, the clean itself only keeps weak references
+        reclaimEnabled = self._reclaimCheck.isChecked()
+        # cleaned module objects are only found in a copy taken beforehand
+        loaded = dict(sys.modules) if self._precompileCheck.isChecked() else None
+        result = module.vacuum(patterns, reclaim=reclaimEnabled, **kwargs)
+        self._queueReclaim(result)
+        if loaded is not None:
+            self._precompilePipeline.submit(precompile.getSources(loaded[n] for n in result.cleaned if n in loaded))
+        return result
+
+    def _queueReclaim(self, result):
+        if self._reclaimCheck.isChecked() and result.released:
+            self._pendingReclaims.append(result)
+            self._reclaimTimer.start()
+
     @Slot()
+    @stats.timed('MainWindow.cleanByUserInput')
     def cleanByUserInput(self):
-        logView = self._logView
-
         moduleName = self._clearByNameWidgets.userInput.text().strip()
         cascade = self._clearByNameWidgets.casecadeCheck.isChecked()
+        dependents = self._clearByNameWidgets.dependentsCheck.isChecked()
         ignoreInternal = self._clearByNameWidgets.ignoreInternalCheck.isChecked()
 
-        if moduleName.startswith(SELF_MODULE_NAME):
-            logView.writeLog("cannot clean module of this tool", LogLevel.ERROR)
-            return
-
         if len(moduleName) > 0:
+            result = self._vacuum(moduleName, cascade=cascade, ignoreInternal=ignoreInternal, dependents=dependents)
             if cascade:
-                modules = module.findModulesByQualifyName(moduleName, ignoreInternal=ignoreInternal)
-                if len(modules) > 0:
-                    for m in modules:
-                        module.deregisterModule(m)
-                        logView.writeLog("cleaned module: [ {0} ]".format(m))
-                else:
-                    logView.writeLog("no module matches prefix: [ {0} ]".format(moduleName), LogLevel.WARNING)
+                missingMessage = "no module matches prefix: [ {0} ]"
             else:
-                if module.hasModule(moduleName):
-                    module.deregisterModule(moduleName)
-                    logView.writeLog("cleaned module: [ {0} ]".format(moduleName))
-                else:
-                    logView.writeLog("module [ {0} ] is not loaded".format(moduleName), LogLevel.WARNING)
+                missingMessage = "module [ {0} ] is not loaded"
+
+            self._logView.writeLogs(self._formatVacuumLogs(result, missingMessage))
 
     @Slot()
-    def cleanBySelection(self):
-        logView = self._logView
+    @stats.timed('MainWindow.cleanAndReloadByUserInput')
+    def cleanAndReloadByUserInput(self):
+        moduleName = self._clearByNameWidgets.userInput.text().strip()
+        cascade = self._clearByNameWidgets.casecadeCheck.isChecked()
+        dependents = self._clearByNameWidgets.dependentsCheck.isChecked()
+        ignoreInternal = self._clearByNameWidgets.ignoreInternalCheck.isChecked()
 
-        modules = self._clearBySelectionWidgets.selectionView.getSelection()
+        if len(moduleName) == 0:
+            return
+        if self._reloadPipeline.isBusy():
+            self._logView.writeLog("a reload is already running, [ {0} ] is not reloaded".format(moduleName), LogLevel.WARNING)
+            return
+
+        # planned while everything is loaded, modules are only cleaned once
+        # their bytecode is warm so they are missing as briefly as possible
+        plan = reloader.planReload(moduleName, cascade=cascade, ignoreInternal=ignoreInternal, dependents=dependents)
+        if not plan.names:
+            missingMessage = "no module matches prefix: [ {0} ]" if cascade else "module [ {0} ] is not loaded"
+            self._logView.writeLogs(self._formatVacuumLogs(plan.preview, missingMessage))
+            return
+
+        self._clearByNameWidgets.reloadButton.setEnabled(False)
+        self._logView.writeLog("warming up bytecode of {0} modules".format(len(plan.names)))
+        self._reloadPipeline.submit(plan, parallel=self._precompileCheck.isChecked())
+
+    @Slot(object)
+    @stats.timed('MainWindow.onReloadWarmedUp')
+    def onReloadWarmedUp(self, result):
+        self._clearByNameWidgets.reloadButton.setEnabled(True)
+
+        plan = result.plan
+        reloader.cleanPlan(plan, result, reclaim=self._reclaimCheck.isChecked())
+        self._queueReclaim(result.vacuumResult)
+        reloader.importPlan(plan, result)
+
+        logs = self._formatVacuumLogs(result.vacuumResult, "module [ {0} ] is not loaded")
+        for name, secs in result.reloaded:
+            logs.append(("reloaded [ {0} ] in {1:.1f} ms".format(name, secs * 1000.0), LogLevel.NORMAL))
+        for name, error in result.failed:
+            logs.append(("failed to reload [ {0} ]: {1}".format(name, error), LogLevel.ERROR))
+
+        slowest = sorted(result.moduleTimes.items(), key=lambda item: item[1][1], reverse=True)[:RELOAD_REPORT_LIMIT]
+        if slowest:
+            logs.append(("slowest of {0} imported modules:".format(len(result.moduleTimes)), LogLevel.NORMAL))
+            for name, (inclusive, exclusive) in slowest:
+                logs.append(("  {0:.1f} ms ({1:.1f} ms own): [ {2} ]".format(inclusive * 1000.0, exclusive * 1000.0, name), LogLevel.NORMAL))
+
+        written, read = result.warmed
+        logs.append(("warm-up {0:.1f} ms ({1} bytecode files written, {2} read), clean {3:.1f} ms, import {4:.1f} ms".format(
+            result.timings.get('warm', 0.0) * 1000.0, written, read,
+            result.timings['clean'] * 1000.0, result.timings['import'] * 1000.0), LogLevel.NORMAL))
+        self._logView.writeLogs(logs)
+
+    @Slot()
+    @stats.timed('MainWindow.cleanBySelection')
+    def cleanBySelection(self):
+        modules = self._getModuleView().getSelection()
         if len(modules) > 0:
-            for m in modules:
-                if m.startswith(SELF_MODULE_NAME):
-                    logView.writeLog("cannot clean module or sub-module of this tool: [ {0} ]".format(m), LogLevel.ERROR)
-                else:
-                    try:
-                        module.deregisterModule(m)
-                        logView.writeLog("cleaned module: [ {0} ]".format(m))
-                    except module.ModuleNotFoundException:
-                        logView.writeLog("module [ {0} ] is not found".format(m), LogLevel.WARNING)
+            # the list only shows modules passing the filter already
+            result = self._vacuum(modules, cascade=False, ignoreInternal=False)
+            self._logView.writeLogs(self._formatVacuumLogs(result, "module [ {0} ] is not found"))
+
+    def _updateBaselineList(self, current=None):
+        combo = self._clearToBaselineWidgets.baselineCombo
+        current = current or combo.currentData()
+
+        combo.blockSignals(True)
+        combo.clear()
+        for name in baseline.getBaselineNames():
+            recorded = baseline.getBaseline(name)
+            combo.addItem("{0}  ({1} modules, {2})".format(
+                name, len(recorded), time.strftime('%H:%M:%S', time.localtime(recorded.created))), name)
+        index = combo.findData(current)
+        combo.setCurrentIndex(index if index >= 0 else combo.count() - 1)
+        combo.blockSignals(False)
+
+        self.updateBaselineStatus()
 
     @Slot()
+    @stats.timed('MainWindow.updateBaselineStatus')
+    def updateBaselineStatus(self):
+        widgetSet = self._clearToBaselineWidgets
+        name = widgetSet.baselineCombo.currentData()
+        if name is None:
+            widgetSet.newModulesLabel.setText("no baseline recorded yet")
+        else:
+            count = len(baseline.findNewModules(name))
+            widgetSet.newModulesLabel.setText("{0} modules loaded since".format(count))
+
+    @Slot()
+    @stats.timed('MainWindow.recordBaseline')
+    def recordBaseline(self):
+        nameInput = self._clearToBaselineWidgets.nameInput
+        name = nameInput.text().strip() or baseline.STARTUP_BASELINE
+        recorded = baseline.record(name)
+        nameInput.clear()
+
+        self._updateBaselineList(name)
+        self._logView.writeLog("recorded baseline [ {0} ] of {1} modules".format(name, len(recorded)))
+
+    @Slot()
+    @stats.timed('MainWindow.removeBaseline')
+    def removeBaseline(self):
+        name = self._clearToBaselineWidgets.baselineCombo.currentData()
+        if name is not None and baseline.removeBaseline(name):
+            self._updateBaselineList()
+            self._logView.writeLog("removed baseline [ {0} ]".format(name))
+
+    @Slot()
+    @stats.timed('MainWindow.cleanToBaseline')
+    def cleanToBaseline(self):
+        widgetSet = self._clearToBaselineWidgets
+        name = widgetSet.baselineCombo.currentData()
+        if name is None:
+            self._logView.writeLog("record a baseline first", LogLevel.WARNING)
+            return
+
+        # one batch, self and internal modules are skipped by the clean itself
+        names = baseline.findNewModules(name)
+        if names:
+            result = self._vacuum(names, cascade=False, ignoreInternal=widgetSet.ignoreInternalCheck.isChecked())
+            logs = self._formatVacuumLogs(result, "module [ {0} ] is not loaded")
+            logs.append(("cleaned {0} of {1} modules loaded since baseline [ {2} ]".format(
+                len(result.cleaned), len(names), name), LogLevel.NORMAL))
+            self._logView.writeLogs(logs)
+        else:
+            self._logView.writeLog("no module loaded since baseline [ {0} ]".format(name))
+        self.updateBaselineStatus()
+
+    @Slot(object)
+    @stats.timed('MainWindow.onPrecompiled')
+    def onPrecompiled(self, report):
+        if report.stale == 0:
+            return
+
+        where = "on {0} processes".format(report.workers) if report.workers else "in process"
+        logs = [("precompiled {0} of {1} out of date bytecode files in {2:.1f} ms {3}".format(
+            report.compiled, report.stale, report.duration * 1000.0, where), LogLevel.NORMAL)]
+        for source, error in report.failed:
+            logs.append(("failed to compile [ {0} ]: {1}".format(source, error), LogLevel.WARNING))
+        self._logView.writeLogs(logs)
+
+    @Slot(bool)
+    @stats.timed('MainWindow.setAutoClean')
+    def setAutoClean(self, enabled):
+        if enabled:
+            self._sourceWatcher.start()
+            self._logView.writeLog("watching {0} source files".format(self._sourceWatcher.watchedFileCount()))
+        elif self._sourceWatcher.isWatching():
+            self._sourceWatcher.stop()
+            self._logView.writeLog("stopped watching source files")
+
+    @Slot(object)
+    @stats.timed('MainWindow.onSourcesChanged')
+    def onSourcesChanged(self, modules):
+        result = self._vacuum(modules, cascade=False, ignoreInternal=False)
+        logs = [("source changed, cleaned module: [ {0} ]".format(m), LogLevel.NORMAL) for m in result.cleaned]
+        self._logView.writeLogs(logs)
+
+    def _validateFilter(self, filterContent, isFuzzy):
+        filterInput = self._clearBySelectionWidgets.filterInput
+        if not isFuzzy:
+            try:
+                module.compileFilter(filterContent)
+            except module.InvalidFilterException as e:
+                filterInput.setStyleSheet("QLineEdit { border: 1px solid #FF7A6B }")
+                filterInput.setToolTip(str(e))
+                return False
+
+        filterInput.setStyleSheet("")
+        filterInput.setToolTip(FILTER_TOOLTIP)
+        return True
+
+    @Slot()
+    @stats.timed('MainWindow.updateModuleList')
     def updateModuleList(self):
         filterContent = self._clearBySelectionWidgets.filterInput.text().strip()
         ignoreInternal = self._clearBySelectionWidgets.ignoreInternalCheck.isChecked()
+        isFuzzy = self._clearBySelectionWidgets.fuzzyCheck.isChecked()
+        moduleView = self._getModuleView()
+
+        if not self._validateFilter(filterContent, isFuzzy):
+            self._queryPipeline.cancel()
+        elif len(filterContent) > 0:
+            query = (filterContent, ignoreInternal, isFuzzy)
+            delta = None
+            if query == self._listQuery and not isFuzzy:
+                delta = module.getModuleChanges(self._listGeneration)
+
+            if delta is not None:
+                # same query, only filter what changed since the list was built
+                added = module.filterModules(filterContent, ignoreInternal=ignoreInternal, names=delta.added)
+                moduleView.updateItems(added, delta.removed)
+                self._listGeneration = delta.generation
+                # package sizes of surviving rows may have changed as well
+                self._analyzeSizes(moduleView.getItems())
+                self._updateImportTimes(added)
+            else:
+                # ranked results can't be patched, fuzzy lists are always rebuilt
+                self._queryPipeline.submit(filterContent, ignoreInternal, debounce=False, fuzzy=isFuzzy)
+        else:
+            self._queryPipeline.cancel()
+            moduleView.clear()
+            self._listQuery = None
+
+    @Slot()
+    @stats.timed('MainWindow.onFilterChanged')
+    def onFilterChanged(self):
+        filterContent = self._clearBySelectionWidgets.filterInput.text().strip()
+        ignoreInternal = self._clearBySelectionWidgets.ignoreInternalCheck.isChecked()
+        isFuzzy = self._clearBySelectionWidgets.fuzzyCheck.isChecked()
+
+        if not self._validateFilter(filterContent, isFuzzy):
+            self._queryPipeline.cancel()
+        elif len(filterContent) > 0:
+            self._queryPipeline.submit(filterContent, ignoreInternal, fuzzy=isFuzzy)
+        else:
+            self._queryPipeline.cancel()
+            self._getModuleView().clear()
+            self._listQuery = None
+
+    @Slot(object, object)
+    @stats.timed('MainWindow.onModuleQueryResults')
+    def onModuleQueryResults(self, query, result):
+        self._getModuleView().setItems(result)
+        self._listQuery = (query.filterContent, query.ignoreInternal, query.isFuzzy())
+        self._listGeneration = query.generation
+        self._analyzeSizes(result)
+        self._updateImportTimes(result)
+
+    def _getModuleView(self):
+        widgetSet = self._clearBySelectionWidgets
+        return widgetSet.treeView if widgetSet.treeBtn.isChecked() else widgetSet.selectionView
+
+    def _isListShown(self):
+        return not self._clearBySelectionWidgets.treeBtn.isChecked()
+
+    def _updateImportTimes(self, names):
+        # the column only exists in the list
+        if self._clearBySelectionWidgets.importTimesBtn.isChecked() and self._isListShown() and names:
+            self._clearBySelectionWidgets.selectionView.setImportTimes(importprofile.getImportTimes(names))
+
+    @Slot(bool)
+    @stats.timed('MainWindow.setShowImportTimes')
+    def setShowImportTimes(self, enabled):
         selectionView = self._clearBySelectionWidgets.selectionView
+        selectionView.setShowImportTimes(enabled)
+        if enabled:
+            if not importprofile.isInstalled():
+                importprofile.install()
+                self._logView.writeLog("import profiler installed, modules imported from now on are timed")
+            self._updateImportTimes(selectionView.getItems())
+
+    @Slot()
+    @stats.timed('MainWindow.reportSlowestImports')
+    def reportSlowestImports(self):
+        listed = set(self._getModuleView().getItems())
+        rows = [r for r in importprofile.slowestImports(limit=None) if r[0] in listed][:SLOWEST_IMPORTS_LIMIT]
+        if not rows:
+            self._logView.writeLog("no import times recorded for listed modules", LogLevel.WARNING)
+            return
+
+        logs = [("slowest imports of {0} listed modules:".format(len(listed)), LogLevel.NORMAL)]
+        for name, inclusive, exclusive in rows:
+            logs.append(("  {0:.1f} ms ({1:.1f} ms own): [ {2} ]".format(inclusive * 1000.0, exclusive * 1000.0, name), LogLevel.NORMAL))
+        self._logView.writeLogs(logs)
+
+    def _analyzeSizes(self, names):
+        if self._clearBySelectionWidgets.sizesBtn.isChecked() and self._isListShown() and names:
+            self._sizePipeline.submit(names)
+
+    @Slot(bool)
+    @stats.timed('MainWindow.setShowSizes')
+    def setShowSizes(self, enabled):
+        widgetSet = self._clearBySelectionWidgets
+        widgetSet.selectionView.setShowSizes(enabled)
+        widgetSet.sortBySizeBtn.setEnabled(enabled)
+        if enabled:
+            self._analyzeSizes(widgetSet.selectionView.getItems())
+        else:
+            widgetSet.sortBySizeBtn.setChecked(False)
+            self._sizePipeline.cancel()
+
+    @Slot(object)
+    @stats.timed('MainWindow.onSizesReady')
+    def onSizesReady(self, sizes):
+        self._clearBySelectionWidgets.selectionView.setSizes(sizes)
+
+    @Slot(bool)
+    @stats.timed('MainWindow.setTreeMode')
+    def setTreeMode(self, enabled):
+        # listed modules move over to the view shown, the hidden one is
+        # emptied and gets no updates
+        widgetSet = self._clearBySelectionWidgets
+        if enabled:
+            widgetSet.treeView.setItems(widgetSet.selectionView.getItems())
+            widgetSet.selectionView.clear()
+            widgetSet.viewStack.setCurrentWidget(widgetSet.treeView)
+        else:
+            items = widgetSet.treeView.getItems()
+            widgetSet.treeView.clear()
+            widgetSet.selectionView.setItems(items)
+            widgetSet.viewStack.setCurrentWidget(widgetSet.selectionView)
+            self._analyzeSizes(items)
+            self._updateImportTimes(items)
+            if self._listQuery is not None and self._listQuery[2]:
+                # the tree doesn't keep the ranking of fuzzy results
+                self.updateModuleList()
 
-        if len(filterContent) > 0:
-            selectionView.setItems(module.filterModules(filterContent, ignoreInternal=ignoreInternal))
+    @Slot()
+    @stats.timed('MainWindow.reportReclaim')
+    def reportReclaim(self):
+        results = self._pendingReclaims
+        self._pendingReclaims = []
+        if not results:
+            return
+
+        # only collecting is done here, what keeps survivors alive is traced on
+        # a worker thread
+        report, survivors = reclaim.collect(results)
+        if survivors:
+            self._reclaimPipeline.submit(report, survivors)
         else:
-            selectionView.clear()
+            self.onReclaimReport(report)
+
+    @Slot(object)
+    @stats.timed('MainWindow.onReclaimReport')
+    def onReclaimReport(self, report):
+        released = "{0} blocks".format(report.releasedBlocks)
+        if report.releasedBytes is not None:
+            released += " ({0:.1f} KB)".format(report.releasedBytes / 1024.0)
+
+        logs = [("memory report: {0} modules cleaned, {1} objects collected, {2} released in {3:.1f}ms".format(
+            report.modules, report.collected, released, report.duration * 1000.0), LogLevel.NORMAL)]
+        for name, referrers in report.survivors:
+            logs.append(("module [ {0} ] is still reachable from: {1}".format(name, ', '.join(referrers) or 'unknown'), LogLevel.WARNING))
+        self._logView.writeLogs(logs)
 
     @Slot()
+    @stats.timed('MainWindow.clearLog')
     def clearLog(self):
         self._logView.clearLog()
@@ -0,0 +1,148 @@
+import PySide.QtCore as QtCore
+from PySide.QtCore import Qt, Signal, Slot
+import PySide.QtWidgets as QtWidgets
+import PySide.QtGui as QtGui
+
+
+class TextWidthCache(object):
+    MAX_ENTRIES = 50000
+
+    def __init__(self):
+        self._metrics = None
+        self._widths = {}
+
+    def invalidate(self):
+        self._metrics = None
+        self._widths = {}
+
+    def width(self, font, text):
+        w = self._widths.get(text)
+        if w is None:
+            if len(self._widths) >= TextWidthCache.MAX_ENTRIES:
+                self._widths = {}
+            if self._metrics is None:
+                self._metrics = QtGui.QFontMetrics(font)
+            w = self._widths[text] = self._metrics.horizontalAdvance(text)
+        return w
+
+
+# item delegate of single line text rows, widths are measured once per string
+# and dropped when the font of the view changes
+#
+# in uniform row mode the view only asks for one size hint, the delegate keeps
+# track of the widest row as rows come and go so the horizontal scroll range
+# stays right, models that track their widest text themselves through
+# `widestText()` are never measured row by row
+class TextRowDelegate(QtWidgets.QStyledItemDelegate):
+    ROW_HEIGHT = 20
+    TEXT_PADDING = 3
+
+    def __init__(self, parent=None):
+        super(TextRowDelegate, self).__init__(parent=parent)
+
+        self._widthCache = TextWidthCache()
+        self._uniformRows = False
+        self._model = None
+        self._widthCounts = {}
+        self._maxWidth = 0
+
+        if parent is not None:
+            parent.installEventFilter(self)
+
+    def rowText(self, index):
+        return index.data(Qt.DisplayRole)
+
+    def textWidth(self, text):
+        return self._widthCache.width(self.parent().font(), text) + self.TEXT_PADDING * 2
+
+    def eventFilter(self, obj, event):
+        # the base class takes any watched object for an open editor, the view
+        # itself is only watched for font changes
+        if obj is self.parent():
+            if event.type() == QtCore.QEvent.FontChange:
+                self._widthCache.invalidate()
+                if self._uniformRows:
+                    self._recountAll()
+            return False
+        return super(TextRowDelegate, self).eventFilter(obj, event)
+
+    def setUniformRows(self, enabled, model=None):
+        if self._model is not None:
+            self._model.rowsInserted.disconnect(self._onRowsInserted)
+            self._model.rowsAboutToBeRemoved.disconnect(self._onRowsAboutToBeRemoved)
+            self._model.rowsRemoved.disconnect(self._onRowsRemoved)
+            self._model.modelReset.disconnect(self._recountAll)
+            self._model = None
+
+        self._uniformRows = enabled
+        if enabled and model is not None:
+            self._model = model
+            model.rowsInserted.connect(self._onRowsInserted)
+            model.rowsAboutToBeRemoved.connect(self._onRowsAboutToBeRemoved)
+            model.rowsRemoved.connect(self._onRowsRemoved)
+            model.modelReset.connect(self._recountAll)
+            self._recountAll()
+
+    def isUniformRows(self):
+        return self._uniformRows
+
+    def _countRows(self, first, last, step):
+        model = self._model
+        if hasattr(model, 'widestText'):
+            return
+        if step < 0 and first == 0 and last == model.rowCount() - 1:
+            # everything goes, nothing left to measure
+            self._widthCounts = {}
+            return
+
+        counts = self._widthCounts
+        for row in range(first, last + 1):
+            text = self.rowText(model.index(row, 0))
+            if text is None:
+                continue
+            w = self.textWidth(text)
+            n = counts.get(w, 0) + step
+            if n > 0:
+                counts[w] = n
+            else:
+                counts.pop(w, None)
+
+    def _updateMaxWidth(self):
+        if hasattr(self._model, 'widestText'):
+            maxWidth = self.textWidth(self._model.widestText())
+        else:
+            maxWidth = max(self._widthCounts) if self._widthCounts else 0
+        if maxWidth != self._maxWidth:
+            self._maxWidth = maxWidth
+            if self._model is not None and self._model.rowCount() > 0:
+                self.sizeHintChanged.emit(self._model.index(0, 0))
+
+    @Slot()
+    def _recountAll(self):
+        self._widthCounts = {}
+        if self._model is not None:
+            self._countRows(0, self._model.rowCount() - 1, 1)
+        self._updateMaxWidth()
+
+    @Slot(QtCore.QModelIndex, int, int)
+    def _onRowsInserted(self, parent, first, last):
+        self._countRows(first, last, 1)
+        self._updateMaxWidth()
+
+    @Slot(QtCore.QModelIndex, int, int)
+    def _onRowsAboutToBeRemoved(self, parent, first, last):
+        self._countRows(first, last, -1)
+
+    @Slot(QtCore.QModelIndex, int, int)
+    def _onRowsRemoved(self, parent, first, last):
+        self._updateMaxWidth()
+
+    def sizeHint(self, option, index):
+        if self._uniformRows:
+            return QtCore.QSize(max(self._maxWidth, option.rect.width()), self.ROW_HEIGHT)
+
+        content = self.rowText(index)
+        if content is not None:
+            return QtCore.QSize(max(self.textWidth(content), option.rect.width()), self.ROW_HEIGHT)
+        else:
+            return QtCore.QSize(0, 0)
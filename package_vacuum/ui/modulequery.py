@@ -0,0 +1,151 @@
+import PySide.QtCore as QtCore
+from PySide.QtCore import Qt, Signal, Slot
+
+import package_vacuum.module as module
+import package_vacuum.fuzzy as fuzzy
+
+
+class ModuleQuery(object):
+    def __init__(self, queryId, filterContent, ignoreInternal, generation, names, fuzzyIndex=None):
+        self.queryId = queryId
+        self.filterContent = filterContent
+        self.ignoreInternal = ignoreInternal
+        self.generation = generation
+        self.names = names
+        # set for fuzzy queries, results are ranked instead of sorted
+        self.fuzzyIndex = fuzzyIndex
+
+    def isFuzzy(self):
+        return self.fuzzyIndex is not None
+
+
+class ModuleQueryWorker(QtCore.QObject):
+    CHUNK_SIZE = 2000
+    FUZZY_LIMIT = 200
+
+    resultReady = Signal(object, object, name='resultReady')
+
+    def __init__(self, pipeline):
+        super(ModuleQueryWorker, self).__init__()
+
+        # only read from the worker thread, an attribute read is atomic
+        self._pipeline = pipeline
+        # prefix cache of fuzzy queries, private to the worker thread
+        self._fuzzyCache = fuzzy.FuzzySearchCache()
+
+    def _runFuzzy(self, query):
+        accept = None
+        if query.ignoreInternal:
+            accept = lambda name: not module.isInternalModule(module.gModuleTable.get(name))
+
+        isCancelled = lambda: self._pipeline.isStale(query.queryId)
+        # rebuilt here after the module table changed, not on the gui thread
+        snapshot = query.fuzzyIndex.snapshot()
+        ranked = snapshot.search(query.filterContent, ModuleQueryWorker.FUZZY_LIMIT, accept, isCancelled, self._fuzzyCache)
+        if ranked is not None and not isCancelled():
+            self.resultReady.emit(query, [name for name, _ in ranked])
+
+    @Slot(object)
+    def run(self, query):
+        if query.isFuzzy():
+            self._runFuzzy(query)
+            return
+
+        names = query.names
+        result = []
+
+        for start in range(0, len(names), ModuleQueryWorker.CHUNK_SIZE):
+            if self._pipeline.isStale(query.queryId):
+                return
+
+            chunk = names[start:start + ModuleQueryWorker.CHUNK_SIZE]
+            result.extend(module.filterModules(query.filterContent, ignoreInternal=query.ignoreInternal, names=chunk))
+
+        if not self._pipeline.isStale(query.queryId):
+            # chunks are sorted runs, merging them is cheap
+            result.sort()
+            self.resultReady.emit(query, result)
+
+
+# debounces filter input and runs queries on a background thread, stale queries
+# are dropped as soon as a newer one is submitted
+class ModuleQueryPipeline(QtCore.QObject):
+    DEBOUNCE_INTERVAL = 150
+
+    queryRequested = Signal(object, name='queryRequested')
+    resultsReady = Signal(object, object, name='resultsReady')
+
+    def __init__(self, parent=None):
+        super(ModuleQueryPipeline, self).__init__(parent=parent)
+
+        self._latestId = 0
+        self._pending = None
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(ModuleQueryPipeline.DEBOUNCE_INTERVAL)
+        self._timer.timeout.connect(self._dispatch)
+
+        self._thread = QtCore.QThread(self)
+        self._worker = ModuleQueryWorker(self)
+        self._worker.moveToThread(self._thread)
+        self.queryRequested.connect(self._worker.run, Qt.QueuedConnection)
+        self._worker.resultReady.connect(self._onResultReady, Qt.QueuedConnection)
+
+    def isStale(self, queryId):
+        return queryId != self._latestId
+
+    def submit(self, filterContent, ignoreInternal, debounce=True, fuzzy=False):
+        # invalidate any running query right away, not when the timer fires
+        self._latestId += 1
+        self._pending = (filterContent, ignoreInternal, fuzzy)
+
+        if debounce:
+            self._timer.start()
+        else:
+            self._timer.stop()
+            self._dispatch()
+
+    def cancel(self):
+        self._latestId += 1
+        self._pending = None
+        self._timer.stop()
+
+    @Slot()
+    def _dispatch(self):
+        if self._pending is None:
+            return
+
+        filterContent, ignoreInternal, isFuzzy = self._pending
+        self._pending = None
+
+        # the module table is only refreshed on the gui thread, the worker gets
+        # a private copy of the names or the fuzzy index to take a snapshot of,
+        # it still looks modules up through `ModuleTable.get`, which only
+        # reads, and classifies them through the internal classifier, which
+        # guards its caches with a lock
+        names = None
+        fuzzyIndex = None
+        if isFuzzy:
+            fuzzyIndex = fuzzy.getFuzzyIndex()
+        else:
+            module.refreshModules()
+            names = module.gModuleTable.names()
+        generation = module.gModuleTable.generation()
+
+        # started lazily, the window may be shown again after a shutdown
+        if not self._thread.isRunning():
+            self._thread.start()
+
+        query = ModuleQuery(self._latestId, filterContent, ignoreInternal, generation, names, fuzzyIndex)
+        self.queryRequested.emit(query)
+
+    @Slot(object, object)
+    def _onResultReady(self, query, result):
+        if not self.isStale(query.queryId):
+            self.resultsReady.emit(query, result)
+
+    def shutdown(self):
+        self.cancel()
+        self._thread.quit()
+        self._thread.wait()
@@ -0,0 +1,60 @@
+import PySide.QtCore as QtCore
+from PySide.QtCore import Qt, Signal, Slot
+
+import package_vacuum.precompile as precompile
+
+
+class PrecompileRequest(object):
+    def __init__(self, requestId, sources):
+        self.requestId = requestId
+        self.sources = sources
+
+
+class PrecompileWorker(QtCore.QObject):
+    compiled = Signal(object, object, name='compiled')
+
+    @Slot(object)
+    def run(self, request):
+        self.compiled.emit(request, precompile.compileStale(request.sources))
+
+
+# compiles stale bytecode of cleaned modules on a background thread, which
+# waits on the compile processes, so the gui stays responsive meanwhile, reports
+# of requests made before a shutdown are dropped
+class PrecompilePipeline(QtCore.QObject):
+    compileRequested = Signal(object, name='compileRequested')
+    compiled = Signal(object, name='compiled')
+
+    def __init__(self, parent=None):
+        super(PrecompilePipeline, self).__init__(parent=parent)
+
+        self._latestId = 0
+        # requests up to this id were made before the last shutdown
+        self._droppedId = 0
+
+        self._thread = QtCore.QThread(self)
+        self._worker = PrecompileWorker()
+        self._worker.moveToThread(self._thread)
+        self.compileRequested.connect(self._worker.run, Qt.QueuedConnection)
+        self._worker.compiled.connect(self._onCompiled, Qt.QueuedConnection)
+
+    def submit(self, sources):
+        if not sources:
+            return
+
+        self._latestId += 1
+        if not self._thread.isRunning():
+            self._thread.start()
+        self.compileRequested.emit(PrecompileRequest(self._latestId, list(sources)))
+
+    @Slot(object, object)
+    def _onCompiled(self, request, report):
+        if request.requestId > self._droppedId:
+            self.compiled.emit(report)
+
+    def shutdown(self):
+        # a compile in progress is waited for so no compile process outlives
+        # the window, it starts again with the next request
+        self._droppedId = self._latestId
+        self._thread.quit()
+        self._thread.wait()
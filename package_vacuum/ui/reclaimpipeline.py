@@ -0,0 +1,72 @@
+import PySide.QtCore as QtCore
+from PySide.QtCore import Qt, Signal, Slot
+
+import package_vacuum.reclaim as reclaim
+
+
+class TraceRequest(object):
+    def __init__(self, requestId, report, survivors):
+        self.requestId = requestId
+        # `ReclaimReport` the referrers are filled in
+        self.report = report
+        # (name, weak reference) of cleaned modules still alive
+        self.survivors = survivors
+
+
+class TraceWorker(QtCore.QObject):
+    traced = Signal(object, name='traced')
+
+    def __init__(self, pipeline):
+        super(TraceWorker, self).__init__()
+
+        self._pipeline = pipeline
+
+    @Slot(object)
+    def run(self, request):
+        if self._pipeline.isStale(request.requestId):
+            return
+        reclaim.traceSurvivors(request.report, request.survivors)
+        self.traced.emit(request)
+
+
+# traces referrers of modules that survived a clean on a background thread,
+# the garbage collection and memory numbers are taken on the gui thread before
+class ReclaimPipeline(QtCore.QObject):
+    traceRequested = Signal(object, name='traceRequested')
+    reportReady = Signal(object, name='reportReady')
+
+    def __init__(self, parent=None):
+        super(ReclaimPipeline, self).__init__(parent=parent)
+
+        self._latestId = 0
+        # requests up to this id were cancelled
+        self._cancelledId = 0
+
+        self._thread = QtCore.QThread(self)
+        self._worker = TraceWorker(self)
+        self._worker.moveToThread(self._thread)
+        self.traceRequested.connect(self._worker.run, Qt.QueuedConnection)
+        self._worker.traced.connect(self._onTraced, Qt.QueuedConnection)
+
+    def isStale(self, requestId):
+        return requestId <= self._cancelledId
+
+    def submit(self, report, survivors):
+        # every report is traced in turn, a new one doesn't drop the others
+        self._latestId += 1
+        if not self._thread.isRunning():
+            self._thread.start()
+        self.traceRequested.emit(TraceRequest(self._latestId, report, survivors))
+
+    def cancel(self):
+        self._cancelledId = self._latestId
+
+    @Slot(object)
+    def _onTraced(self, request):
+        if not self.isStale(request.requestId):
+            self.reportReady.emit(request.report)
+
+    def shutdown(self):
+        self.cancel()
+        self._thread.quit()
+        self._thread.wait()
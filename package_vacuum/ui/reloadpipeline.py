@@ -0,0 +1,83 @@
+import time
+
+import PySide.QtCore as QtCore
+from PySide.QtCore import Qt, Signal, Slot
+
+import package_vacuum.reloader as reloader
+
+
+class WarmUpRequest(object):
+    def __init__(self, requestId, result, parallel):
+        self.requestId = requestId
+        # `ReloadResult` the warm-up is recorded on
+        self.result = result
+        # stale bytecode is compiled in a process pool
+        self.parallel = parallel
+
+
+class WarmUpWorker(QtCore.QObject):
+    warmedUp = Signal(object, name='warmedUp')
+
+    def __init__(self, pipeline):
+        super(WarmUpWorker, self).__init__()
+
+        self._pipeline = pipeline
+
+    @Slot(object)
+    def run(self, request):
+        # only touches files, bytecode is written atomically so an import on
+        # the gui thread never reads a partial file
+        started = time.perf_counter()
+        result = request.result
+        isCancelled = lambda: self._pipeline.isStale(request.requestId)
+        result.warmed = reloader.warmSources(result.plan.sources, isCancelled, parallel=request.parallel)
+        result.timings['warm'] = time.perf_counter() - started
+        self.warmedUp.emit(request)
+
+
+# warms up bytecode of a reload plan on a background thread, `warmedUp` hands
+# the result back to the gui thread where modules are cleaned and imported
+class ReloadPipeline(QtCore.QObject):
+    warmUpRequested = Signal(object, name='warmUpRequested')
+    warmedUp = Signal(object, name='warmedUp')
+
+    def __init__(self, parent=None):
+        super(ReloadPipeline, self).__init__(parent=parent)
+
+        self._latestId = 0
+        self._busy = False
+
+        self._thread = QtCore.QThread(self)
+        self._worker = WarmUpWorker(self)
+        self._worker.moveToThread(self._thread)
+        self.warmUpRequested.connect(self._worker.run, Qt.QueuedConnection)
+        self._worker.warmedUp.connect(self._onWarmedUp, Qt.QueuedConnection)
+
+    def isStale(self, requestId):
+        return requestId != self._latestId
+
+    def isBusy(self):
+        return self._busy
+
+    def submit(self, plan, parallel=False):
+        self._latestId += 1
+        self._busy = True
+
+        if not self._thread.isRunning():
+            self._thread.start()
+        self.warmUpRequested.emit(WarmUpRequest(self._latestId, reloader.ReloadResult(plan), parallel))
+
+    def cancel(self):
+        self._latestId += 1
+        self._busy = False
+
+    @Slot(object)
+    def _onWarmedUp(self, request):
+        if not self.isStale(request.requestId):
+            self._busy = False
+            self.warmedUp.emit(request.result)
+
+    def shutdown(self):
+        self.cancel()
+        self._thread.quit()
+        self._thread.wait()
@@ -1,15 +1,124 @@
+import bisect
+
 import PySide.QtCore as QtCore
 from PySide.QtCore import Qt, Signal, Slot
 import PySide.QtWidgets as QtWidgets
 import PySide.QtGui as QtGui
 
+from .metrics import TextRowDelegate
+from .listmerge import canMerge, findRemoveRuns, findInsertRuns
+
+import package_vacuum.footprint as footprint
+
+
+# (module bytes, top-level package bytes) of a row, None until analyzed
+SIZE_ROLE = Qt.UserRole + 1
+# (inclusive, exclusive) import seconds of a row, None unless profiled
+IMPORT_TIME_ROLE = Qt.UserRole + 2
+
+
+def formatImportTime(seconds):
+    return '{0:.1f} ms'.format(seconds * 1000.0)
+
+
+# row selection flags packed in a bytearray, membership is an index lookup and
+# bulk operations run as slice assignments or byte translations
+class SelectionSet(object):
+    INVERT_TABLE = bytes(bytearray([1, 0]) + bytearray(254))
+
+    def __init__(self, size=0):
+        self._flags = bytearray(size)
+        self._count = 0
+        # last selected row, used as the anchor of shift selection
+        self.anchor = -1
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, row):
+        return 0 <= row < len(self._flags) and self._flags[row] == 1
+
+    def size(self):
+        return len(self._flags)
+
+    def reset(self, size):
+        self._flags = bytearray(size)
+        self._count = 0
+        self.anchor = -1
+
+    def add(self, row):
+        if self._flags[row] == 0:
+            self._flags[row] = 1
+            self._count += 1
+        self.anchor = row
+
+    def discard(self, row):
+        if self._flags[row] == 1:
+            self._flags[row] = 0
+            self._count -= 1
+            if self.anchor == row:
+                self.anchor = self.lastRow()
+
+    def setRange(self, first, last):
+        span = self._flags[first:last + 1]
+        self._count += span.count(b'\x00')
+        self._flags[first:last + 1] = b'\x01' * len(span)
+
+    def clear(self):
+        self.reset(len(self._flags))
+
+    def fill(self):
+        size = len(self._flags)
+        self._flags = bytearray(b'\x01' * size)
+        self._count = size
+        self.anchor = size - 1
+
+    def invert(self):
+        self._flags = self._flags.translate(SelectionSet.INVERT_TABLE)
+        self._count = len(self._flags) - self._count
+        if self.anchor not in self:
+            self.anchor = self.lastRow()
+
+    def insertRows(self, row, count):
+        self._flags[row:row] = bytearray(count)
+        if self.anchor >= row:
+            self.anchor += count
+
+    def removeRows(self, first, last):
+        self._count -= self._flags[first:last + 1].count(b'\x01')
+        del self._flags[first:last + 1]
+
+        if first <= self.anchor <= last:
+            self.anchor = self.lastRow()
+        elif self.anchor > last:
+            self.anchor -= last - first + 1
+
+    def lastRow(self):
+        return self._flags.rfind(b'\x01')
+
+    def rows(self):
+        flags = self._flags
+        row = flags.find(b'\x01')
+        while row >= 0:
+            yield row
+            row = flags.find(b'\x01', row + 1)
+
 
 class SelectionListModel(QtCore.QAbstractListModel):
     def __init__(self, parent=None):
         super(SelectionListModel, self).__init__(parent=parent)
 
         self._items = []
-        self._selections = []
+        self._selections = SelectionSet()
+        # longest item, found again lazily once it is removed
+        self._widest = ''
+        self._widestStale = False
+
+        # name: (module bytes, package bytes)
+        self._sizes = {}
+        # name: (inclusive seconds, exclusive seconds)
+        self._importTimes = {}
+        self._sortBySize = False
 
     # overrides #
 
@@ -17,11 +126,28 @@ class SelectionListModel(QtCore.QAbstractListModel):
         return len(self._items)
 
     def data(self, index, role=Qt.DisplayRole):
-        if index.isValid() and role == Qt.DisplayRole:
-            return self._items[index.row()]
-        else:
+        if not index.isValid():
             return None
 
+        if role == Qt.DisplayRole:
+            return self._items[index.row()]
+        elif role == SIZE_ROLE:
+            return self._sizes.get(self._items[index.row()])
+        elif role == IMPORT_TIME_ROLE:
+            return self._importTimes.get(self._items[index.row()])
+        elif role == Qt.ToolTipRole:
+            name = self._items[index.row()]
+            lines = []
+            size = self._sizes.get(name)
+            if size is not None:
+                lines.append("module: {0}\npackage {1}: {2}".format(footprint.formatSize(size[0]), name.partition('.')[0], footprint.formatSize(size[1])))
+            importTime = self._importTimes.get(name)
+            if importTime is not None:
+                lines.append("import: {0}, own: {1}".format(formatImportTime(importTime[0]), formatImportTime(importTime[1])))
+            if lines:
+                return '\n'.join(lines)
+        return None
+
     # custom api #
 
     def notifyChange(self, first, last):
@@ -32,41 +158,37 @@ class SelectionListModel(QtCore.QAbstractListModel):
 
     def select(self, index, replace=False):
         if index.isValid():
-            if replace:
-                self._selections = []
+            if replace and len(self._selections) > 0:
+                self._selections.clear()
+                self.notifyChangeAll()
 
             row = index.row()
             if row not in self._selections:
-                self._selections.append(row)
+                self._selections.add(row)
                 self.dataChanged.emit(index, index)
+            else:
+                self._selections.anchor = row
 
     def deselect(self, index):
         if index.isValid():
             row = index.row()
-            try:
-                self._selections.remove(row)
-            except:
-                pass
+            if row in self._selections:
+                self._selections.discard(row)
+                self.dataChanged.emit(index, index)
 
     def selectTo(self, index, replace=False):
         if index.isValid():
-            if len(self._selections) > 0:
-                lastSelect = self._selections[-1]
+            if len(self._selections) > 0 and self._selections.anchor >= 0:
+                lastSelect = self._selections.anchor
                 if replace:
-                    self._selections = []
+                    self._selections.clear()
 
                 newRow = index.row()
                 if lastSelect == newRow:
                     self.select(index)
                 else:
-                    if newRow > lastSelect:
-                        idcs = range(lastSelect, newRow + 1, 1)
-                    else:
-                        idcs = range(lastSelect, newRow - 1, -1)
-
-                    for i in idcs:
-                        if i not in self._selections:
-                            self._selections.append(i)
+                    self._selections.setRange(min(lastSelect, newRow), max(lastSelect, newRow))
+                    self._selections.anchor = newRow
 
                     if replace:
                         self.notifyChangeAll()
@@ -81,12 +203,11 @@ class SelectionListModel(QtCore.QAbstractListModel):
     def selectRange(self, start, end, replace=False):
         if start.isValid() and end.isValid():
             if replace:
-                self._selections = []
+                self._selections.clear()
 
             startRow, endRow = start.row(), end.row()
-            for i in range(startRow, endRow + 1):
-                if i not in self._selections:
-                    self._selections.append(i)
+            self._selections.setRange(startRow, endRow)
+            self._selections.anchor = endRow
 
             if replace:
                 self.notifyChangeAll()
@@ -94,44 +215,168 @@ class SelectionListModel(QtCore.QAbstractListModel):
                 self.notifyChange(startRow, endRow)
 
     def selectAll(self):
-        itemCount = len(self._items)
-        self._selections = range(itemCount)
+        self._selections.fill()
         self.notifyChangeAll()
 
     def invertSelection(self):
-        itemCount = len(self._items)
-        newSelections = [i for i in range(itemCount) if i not in self._selections]
-        self._selections = newSelections
+        self._selections.invert()
         self.notifyChangeAll()
 
     def isSelected(self, index):
         return index.row() in self._selections
 
+    def getItems(self):
+        return list(self._items)
+
+    def widestText(self):
+        if self._widestStale:
+            self._widest = max(self._items, key=len) if self._items else ''
+            self._widestStale = False
+        return self._widest
+
+    def _noteAdded(self, items):
+        if not self._widestStale and items:
+            widest = max(items, key=len)
+            if len(widest) > len(self._widest):
+                self._widest = widest
+
+    def _noteRemoved(self, items):
+        if not self._widestStale and self._widest in items:
+            self._widestStale = True
+
     def getSelectedItems(self):
-        return [self._items[i] for i in self._selections]
+        return [self._items[i] for i in self._selections.rows()]
 
     def clear(self):
         itemCount = len(self._items)
         if itemCount > 0:
-            self.beginRemoveRows(self.index(0, 0), 0, itemCount - 1)
+            self.beginRemoveRows(QtCore.QModelIndex(), 0, itemCount - 1)
             self._items = []
-            self._selections = []
+            self._selections.reset(0)
+            self._widest = ''
+            self._widestStale = False
             self.endRemoveRows()
 
-    def setItems(self, items):
-        if len(self._selections) > 0:
-            self._selections = []
-
+    def _resetItems(self, newItems, keepSelection=False):
+        selected = set(self.getSelectedItems()) if keepSelection else None
         self.clear()
 
-        newItems = list(items)
         newItemCount = len(newItems)
         if newItemCount > 0:
-            self.beginInsertRows(self.index(0, 0), newItemCount, newItemCount + 1)
+            self.beginInsertRows(QtCore.QModelIndex(), 0, newItemCount - 1)
             self._items = newItems
+            self._selections.reset(newItemCount)
+            self._noteAdded(newItems)
+            if selected:
+                for row, item in enumerate(newItems):
+                    if item in selected:
+                        self._selections.add(row)
+            self.endInsertRows()
+
+    def _sizeKey(self, item):
+        # heaviest packages first, heaviest modules first inside a package,
+        # rows not analyzed yet go last
+        size = self._sizes.get(item)
+        if size is None:
+            return (1, 0, 0, item)
+        return (0, -size[1], -size[0], item)
+
+    def setItems(self, items):
+        newItems = list(items)
+        if self._sortBySize:
+            newItems.sort(key=self._sizeKey)
+            self._resetItems(newItems, keepSelection=True)
+        elif canMerge(self._items, newItems):
+            self._mergeItems(newItems)
+        else:
+            self._resetItems(newItems)
+
+    def isSortedBySize(self):
+        return self._sortBySize
+
+    def setSortBySize(self, enabled):
+        # name order is what merges and change sets rely on, it is restored
+        # when size sorting is turned off
+        if enabled == self._sortBySize:
+            return
+        self._sortBySize = enabled
+        self._resetItems(sorted(self._items, key=self._sizeKey if enabled else None), keepSelection=True)
+
+    def setSizes(self, sizes):
+        self._sizes.update(sizes)
+        if self._sortBySize:
+            self._resetItems(sorted(self._items, key=self._sizeKey), keepSelection=True)
+        elif self._items:
+            self.notifyChangeAll()
+
+    def setImportTimes(self, times):
+        self._importTimes.update(times)
+        if self._items:
+            self.notifyChangeAll()
+
+    def clearImportTimes(self):
+        self._importTimes = {}
+        if self._items:
+            self.notifyChangeAll()
+
+    def clearSizes(self):
+        self._sizes = {}
+        if self._items:
+            self.notifyChangeAll()
+
+    def _mergeItems(self, newItems):
+        # both lists are sorted, so the surviving old items form a subsequence
+        # of the new ones: drop stale runs bottom-up, then fill in the gaps
+        # top-down, selections stay with surviving items
+        items = self._items
+        parent = QtCore.QModelIndex()
+
+        for first, last in reversed(findRemoveRuns(items, set(newItems))):
+            self.beginRemoveRows(parent, first, last)
+            self._noteRemoved(items[first:last + 1])
+            del items[first:last + 1]
+            self._selections.removeRows(first, last)
+            self.endRemoveRows()
+
+        for first, last in findInsertRuns(list(items), newItems):
+            self.beginInsertRows(parent, first, last)
+            items[first:first] = newItems[first:last + 1]
+            self._noteAdded(newItems[first:last + 1])
+            self._selections.insertRows(first, last - first + 1)
+            self.endInsertRows()
+
+    def updateItems(self, added, removed):
+        # apply a change set to the sorted item list, only touched rows are
+        # inserted or removed and selections follow their items
+        items = self._items
+
+        if self._sortBySize:
+            removed = set(removed)
+            present = set(items)
+            newItems = [i for i in items if i not in removed] + [i for i in added if i not in present]
+            self.setItems(newItems)
+            return
+
+        for item in removed:
+            row = bisect.bisect_left(items, item)
+            if row < len(items) and items[row] == item:
+                self.beginRemoveRows(QtCore.QModelIndex(), row, row)
+                self._noteRemoved((item,))
+                del items[row]
+                self._selections.removeRows(row, row)
+                self.endRemoveRows()
+
+        for item in added:
+            row = bisect.bisect_left(items, item)
+            if row < len(items) and items[row] == item:
+                continue
+            self.beginInsertRows(QtCore.QModelIndex(), row, row)
+            items.insert(row, item)
+            self._selections.insertRows(row, 1)
+            self._noteAdded((item,))
             self.endInsertRows()
 
-class SelectionListDelegate(QtWidgets.QStyledItemDelegate):
+class SelectionListDelegate(TextRowDelegate):
     class SelectionRange(object):
         def __init__(self, start):
             self.start = QtCore.QPersistentModelIndex(start)
@@ -171,25 +416,54 @@ class SelectionListDelegate(QtWidgets.QStyledItemDelegate):
     SELECTED_ITEM_PEN = QtGui.QPen(QtGui.QColor('#242424'))
     UNSELECTED_ITEM_BRUSH = QtGui.QBrush(Qt.transparent)
     UNSELECTED_ITEM_PEN = QtGui.QPen(Qt.white)
+    COLUMN_PEN = QtGui.QPen(QtGui.QColor('#9A9A9A'))
     TEXT_PADDING = 3
+    SIZE_WIDTH = 70
+    IMPORT_TIME_WIDTH = 70
 
     def __init__(self, parent=None):
         super(SelectionListDelegate, self).__init__(parent=parent)
 
         self._selectionRange = None
+        self._showSizes = False
+        self._showImportTimes = False
+
+    def _columnTexts(self, index):
+        # (width, text) of the columns right of the name, rightmost first
+        columns = []
+        if self._showSizes:
+            size = index.data(SIZE_ROLE)
+            columns.append((SelectionListDelegate.SIZE_WIDTH, footprint.formatSize(size[0]) if size is not None else '...'))
+        if self._showImportTimes:
+            importTime = index.data(IMPORT_TIME_ROLE)
+            columns.append((SelectionListDelegate.IMPORT_TIME_WIDTH, formatImportTime(importTime[0]) if importTime is not None else '-'))
+        return columns
+
+    def textWidth(self, text):
+        width = super(SelectionListDelegate, self).textWidth(text)
+        if self._showSizes:
+            width += SelectionListDelegate.SIZE_WIDTH
+        if self._showImportTimes:
+            width += SelectionListDelegate.IMPORT_TIME_WIDTH
+        return width
+
+    def _columnsChanged(self):
+        if self.isUniformRows():
+            self._recountAll()
+
+    def setShowSizes(self, enabled):
+        if enabled != self._showSizes:
+            self._showSizes = enabled
+            self._columnsChanged()
+
+    def setShowImportTimes(self, enabled):
+        if enabled != self._showImportTimes:
+            self._showImportTimes = enabled
+            self._columnsChanged()
 
     def isDragSelection(self):
         return self._selectionRange is not None
 
-    def sizeHint(self, option, index):
-        content = index.data(Qt.DisplayRole)
-        if content is not None:
-            metrics = QtGui.QFontMetrics(self.parent().font())
-            contentWidth = metrics.horizontalAdvance(content) + SelectionListDelegate.TEXT_PADDING * 2
-            return QtCore.QSize(max(contentWidth, option.rect.width()), 20)
-        else:
-            return QtCore.QSize(0, 0)
-
     def editorEvent(self, event, model, option, index):
         evtType = event.type()
         btn = event.button()
@@ -242,11 +516,25 @@ class SelectionListDelegate(QtWidgets.QStyledItemDelegate):
 
         # text
         item = index.data(Qt.DisplayRole)
+        rowRect = QtCore.QRect(option.rect)
 
         textRect = option.rect
         textRect.setLeft(textRect.left() + SelectionListDelegate.TEXT_PADDING)
         textRect.setWidth(textRect.width() + SelectionListDelegate.TEXT_PADDING * 2)
 
+        # extra columns, right aligned from the row end
+        columns = self._columnTexts(index)
+        if columns:
+            painter.setPen(SelectionListDelegate.COLUMN_PEN if brush is SelectionListDelegate.UNSELECTED_ITEM_BRUSH else pen)
+            right = rowRect.right()
+            for width, text in columns:
+                columnRect = QtCore.QRect(rowRect)
+                columnRect.setLeft(right - width)
+                columnRect.setRight(right - SelectionListDelegate.TEXT_PADDING)
+                painter.drawText(columnRect, Qt.AlignRight|Qt.AlignVCenter, text)
+                right -= width
+            textRect.setRight(right - SelectionListDelegate.TEXT_PADDING)
+
         painter.setPen(pen)
         painter.drawText(textRect, Qt.AlignLeft|Qt.AlignVCenter, item)
 
@@ -267,6 +555,12 @@ class SelectionView(QtWidgets.QListView):
         delegate.dragSelectionChange.connect(self.onDragSelectionUpdate)
         self.setItemDelegate(delegate)
 
+        self.setUniformRows(True)
+
+    def setUniformRows(self, enabled):
+        self.setUniformItemSizes(enabled)
+        self.itemDelegate().setUniformRows(enabled, self.model())
+
     def keyPressEvent(self, event):
         if (event.type() == QtCore.QEvent.KeyPress and
             event.key() == Qt.Key_A and
@@ -307,5 +601,33 @@ class SelectionView(QtWidgets.QListView):
     def setItems(self, items):
         self.model().setItems(items)
 
+    def updateItems(self, added, removed):
+        self.model().updateItems(added, removed)
+
+    def getItems(self):
+        return self.model().getItems()
+
+    def setShowSizes(self, enabled):
+        self.itemDelegate().setShowSizes(enabled)
+        if not enabled:
+            self.model().setSortBySize(False)
+            self.model().clearSizes()
+        self.viewport().update()
+
+    def setSortBySize(self, enabled):
+        self.model().setSortBySize(enabled)
+
+    def setShowImportTimes(self, enabled):
+        self.itemDelegate().setShowImportTimes(enabled)
+        if not enabled:
+            self.model().clearImportTimes()
+        self.viewport().update()
+
+    def setImportTimes(self, times):
+        self.model().setImportTimes(times)
+
+    def setSizes(self, sizes):
+        self.model().setSizes(sizes)
+
     def getSelection(self):
         return self.model().getSelectedItems()
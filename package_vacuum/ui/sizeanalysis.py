@@ -0,0 +1,117 @@
+import time
+
+import PySide.QtCore as QtCore
+from PySide.QtCore import Qt, Signal, Slot
+
+import package_vacuum.module as module
+import package_vacuum.footprint as footprint
+
+
+# only names are held, a module cleaned while the request waits is not kept
+# alive by it
+class SizeRequest(object):
+    def __init__(self, requestId, names, packages):
+        self.requestId = requestId
+        self.names = names
+        # top-level package name: module names of the package
+        self.packages = packages
+
+
+class SizeAnalysisWorker(QtCore.QObject):
+    # seconds between partial results
+    BATCH_INTERVAL = 0.2
+
+    sizesReady = Signal(object, object, name='sizesReady')
+
+    def __init__(self, pipeline):
+        super(SizeAnalysisWorker, self).__init__()
+
+        self._pipeline = pipeline
+
+    @Slot(object)
+    def run(self, request):
+        # created by `submit` on the gui thread
+        analyzer = footprint.gFootprintAnalyzer
+        moduleIds = footprint.getModuleIds()
+        table = module.gModuleTable
+
+        sizes = {}
+        lastEmit = time.perf_counter()
+        for name in request.names:
+            if self._pipeline.isStale(request.requestId):
+                return
+
+            # looked up as late as possible, cleaned modules are skipped
+            mod = table.get(name)
+            if mod is None:
+                continue
+            top = name.partition('.')[0]
+            moduleSize = analyzer.moduleSize(name, mod, moduleIds)
+            packageSize = analyzer.packageSize(top, [table.get(n) for n in request.packages[top]], moduleIds)
+            if moduleSize is not None:
+                sizes[name] = (moduleSize, packageSize)
+
+            if time.perf_counter() - lastEmit > SizeAnalysisWorker.BATCH_INTERVAL:
+                self.sizesReady.emit(request, sizes)
+                sizes = {}
+                lastEmit = time.perf_counter()
+
+        if sizes and not self._pipeline.isStale(request.requestId):
+            self.sizesReady.emit(request, sizes)
+
+
+# estimates module sizes on a background thread, results come in batches
+# through `sizesReady`, a new request drops the one in progress
+class SizeAnalysisPipeline(QtCore.QObject):
+    analysisRequested = Signal(object, name='analysisRequested')
+    sizesReady = Signal(object, name='sizesReady')
+
+    def __init__(self, parent=None):
+        super(SizeAnalysisPipeline, self).__init__(parent=parent)
+
+        self._latestId = 0
+
+        self._thread = QtCore.QThread(self)
+        self._worker = SizeAnalysisWorker(self)
+        self._worker.moveToThread(self._thread)
+        self.analysisRequested.connect(self._worker.run, Qt.QueuedConnection)
+        self._worker.sizesReady.connect(self._onSizesReady, Qt.QueuedConnection)
+
+    def isStale(self, requestId):
+        return requestId != self._latestId
+
+    def submit(self, names):
+        self._latestId += 1
+
+        # package members are listed on the gui thread, the worker only reads
+        # modules through `ModuleTable.get`
+        footprint.getFootprintAnalyzer()
+        loaded = []
+        packages = {}
+        for name in names:
+            if name not in module.gModuleTable:
+                continue
+            loaded.append(name)
+            top = name.partition('.')[0]
+            if top not in packages:
+                packages[top] = list(module.gModuleIndex.iterNamespace(top))
+
+        if not loaded:
+            return
+
+        if not self._thread.isRunning():
+            self._thread.start()
+        self.analysisRequested.emit(SizeRequest(self._latestId, loaded, packages))
+
+    def cancel(self):
+        self._latestId += 1
+
+    @Slot(object, object)
+    def _onSizesReady(self, request, sizes):
+        if not self.isStale(request.requestId):
+            self.sizesReady.emit(sizes)
+
+    def shutdown(self):
+        self.cancel()
+        self._thread.quit()
+        self._thread.wait()
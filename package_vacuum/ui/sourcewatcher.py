@@ -0,0 +1,154 @@
+import os.path
+
+import PySide.QtCore as QtCore
+from PySide.QtCore import Qt, Signal, Slot
+
+import package_vacuum.module as module
+from package_vacuum.watch import SourceWatchIndex, PollingWatcher
+
+
+# watches source files of loaded non-internal modules and their directories,
+# file watches catch saves writing in place, directory watches saves replacing
+# the file, directories the native watcher refuses for themselves or for one of
+# their files (e.g. past the system watch limit) fall back to a polling thread,
+# changed modules are reported through `modulesChanged`
+class SourceWatcher(QtCore.QObject):
+    SYNC_INTERVAL = 2000
+    NOTIFY_DELAY = 300
+
+    modulesChanged = Signal(object, name='modulesChanged')
+    _polledChanges = Signal(object, name='_polledChanges')
+
+    def __init__(self, excludes=(), parent=None):
+        super(SourceWatcher, self).__init__(parent=parent)
+
+        self._excludes = tuple(excludes)
+        self._index = None
+        self._fsWatcher = None
+        self._poller = None
+        self._polledDirs = set()
+
+        self._pendingDirs = set()
+        self._pendingFiles = set()
+        self._pendingModules = set()
+
+        self._syncTimer = QtCore.QTimer(self)
+        self._syncTimer.setInterval(SourceWatcher.SYNC_INTERVAL)
+        self._syncTimer.timeout.connect(self.sync)
+
+        self._notifyTimer = QtCore.QTimer(self)
+        self._notifyTimer.setSingleShot(True)
+        self._notifyTimer.setInterval(SourceWatcher.NOTIFY_DELAY)
+        self._notifyTimer.timeout.connect(self._flush)
+
+        self._polledChanges.connect(self._onPolledChanges, Qt.QueuedConnection)
+
+    def isWatching(self):
+        return self._index is not None
+
+    def watchedFileCount(self):
+        return self._index.fileCount() if self._index is not None else 0
+
+    def start(self):
+        if self.isWatching():
+            return
+
+        self._index = SourceWatchIndex(self._excludes)
+        self._fsWatcher = QtCore.QFileSystemWatcher(self)
+        self._fsWatcher.directoryChanged.connect(self._onDirectoryChanged)
+        self._fsWatcher.fileChanged.connect(self._onFileChanged)
+
+        self.sync()
+        self._syncTimer.start()
+
+    def stop(self):
+        if not self.isWatching():
+            return
+
+        self._syncTimer.stop()
+        self._notifyTimer.stop()
+
+        if self._poller is not None:
+            self._poller.stop()
+            self._poller = None
+
+        self._fsWatcher.deleteLater()
+        self._fsWatcher = None
+        self._index = None
+        self._polledDirs = set()
+        self._pendingDirs = set()
+        self._pendingFiles = set()
+        self._pendingModules = set()
+
+    @Slot()
+    def sync(self):
+        # picks up modules imported or removed since last sync, cost follows
+        # the module table churn
+        addedDirs, removedDirs, addedFiles, removedFiles = self._index.sync()
+
+        watchedRemoved = [d for d in removedDirs if d not in self._polledDirs] + removedFiles
+        if watchedRemoved:
+            self._fsWatcher.removePaths(watchedRemoved)
+        self._polledDirs.difference_update(removedDirs)
+
+        if addedDirs or addedFiles:
+            self._watchPaths(addedDirs + addedFiles)
+
+        if self._polledDirs:
+            if self._poller is None:
+                self._poller = PollingWatcher(self._index, self._polledChanges.emit, list(self._polledDirs))
+                self._poller.start()
+            else:
+                self._poller.setDirectories(self._polledDirs)
+        elif self._poller is not None:
+            self._poller.stop()
+            self._poller = None
+
+    def _watchPaths(self, paths):
+        # a refused file gets its directory polled, watching the directory
+        # alone misses writes in place
+        for path in self._fsWatcher.addPaths(paths):
+            self._polledDirs.add(path if self._index.hasDirectory(path) else os.path.dirname(path))
+
+    @Slot(str)
+    def _onDirectoryChanged(self, directory):
+        # editors often save several times in a row, changes are collected and
+        # checked once things settle down
+        self._pendingDirs.add(directory)
+        self._notifyTimer.start()
+
+    @Slot(str)
+    def _onFileChanged(self, path):
+        self._pendingFiles.add(path)
+        self._notifyTimer.start()
+
+    @Slot(object)
+    def _onPolledChanges(self, names):
+        self._pendingModules.update(names)
+        self._notifyTimer.start()
+
+    @Slot()
+    def _flush(self):
+        if not self.isWatching():
+            return
+
+        names = self._pendingModules
+        for directory in self._pendingDirs:
+            names.update(self._index.checkDirectory(directory))
+        if self._pendingFiles:
+            files = sorted(self._pendingFiles)
+            names.update(self._index.checkFiles(files))
+            # a file replaced on save is dropped by the native watcher, the
+            # new one is watched again
+            watched = set(self._fsWatcher.files())
+            dropped = [f for f in files if f not in watched and self._index.hasFile(f) and os.path.isfile(f)]
+            if dropped:
+                self._watchPaths(dropped)
+
+        self._pendingDirs = set()
+        self._pendingFiles = set()
+        self._pendingModules = set()
+
+        names = [n for n in names if module.hasModule(n)]
+        if names:
+            self.modulesChanged.emit(sorted(names, key=len))
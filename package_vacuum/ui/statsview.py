@@ -0,0 +1,110 @@
+import PySide.QtCore as QtCore
+from PySide.QtCore import Qt, Signal, Slot
+import PySide.QtWidgets as QtWidgets
+import PySide.QtGui as QtGui
+
+import package_vacuum.stats as stats
+
+
+HISTOGRAM_WIDTH = 30
+
+
+def formatHistogram(callStats):
+    # one text bar per bucket, scaled to the fullest bucket
+    peak = max(callStats.buckets) or 1
+    bounds = stats.BUCKET_BOUNDS
+    lines = []
+    for i, n in enumerate(callStats.buckets):
+        if i < len(bounds):
+            label = '&lt;= {0:g} ms'.format(bounds[i])
+        else:
+            label = '&gt; {0:g} ms'.format(bounds[-1])
+        bar = '#' * int(round(HISTOGRAM_WIDTH * n / float(peak)))
+        lines.append('{0:<15} {1:<{2}} {3}'.format(label, bar, HISTOGRAM_WIDTH, n))
+    return '<pre>{0}</pre>'.format('\n'.join(lines))
+
+
+# table of recorded call statistics, refreshed periodically while visible
+class StatsView(QtWidgets.QWidget):
+    REFRESH_INTERVAL = 1000
+    COLUMNS = ('name', 'calls', 'total ms', 'mean ms', 'p95 ms', 'max ms')
+
+    def __init__(self, parent=None):
+        super(StatsView, self).__init__(parent=parent)
+
+        layout = QtWidgets.QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.setLayout(layout)
+
+        toolLayout = QtWidgets.QHBoxLayout()
+        layout.addLayout(toolLayout)
+
+        recordCheck = QtWidgets.QCheckBox('Record', self)
+        recordCheck.setToolTip("time calls of module functions and window actions")
+        recordCheck.setChecked(stats.isEnabled())
+        recordCheck.toggled.connect(self.setRecording)
+        toolLayout.addWidget(recordCheck)
+        toolLayout.addStretch()
+
+        resetBtn = QtWidgets.QPushButton('Reset', self)
+        resetBtn.setFixedHeight(20)
+        resetBtn.clicked.connect(self.resetStats)
+        toolLayout.addWidget(resetBtn)
+
+        table = QtWidgets.QTreeWidget(self)
+        table.setRootIsDecorated(False)
+        table.setUniformRowHeights(True)
+        table.setHeaderLabels(StatsView.COLUMNS)
+        table.header().setStretchLastSection(False)
+        table.header().setSectionResizeMode(0, QtWidgets.QHeaderView.Stretch)
+        layout.addWidget(table)
+        self._table = table
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setInterval(StatsView.REFRESH_INTERVAL)
+        self._timer.timeout.connect(self.refresh)
+
+    def showEvent(self, event):
+        self.refresh()
+        self._timer.start()
+        super(StatsView, self).showEvent(event)
+
+    def hideEvent(self, event):
+        self._timer.stop()
+        super(StatsView, self).hideEvent(event)
+
+    @Slot(bool)
+    def setRecording(self, enabled):
+        if enabled:
+            stats.enable()
+        else:
+            stats.disable()
+
+    @Slot()
+    def resetStats(self):
+        stats.reset()
+        self.refresh()
+
+    @Slot()
+    def refresh(self):
+        table = self._table
+        table.setUpdatesEnabled(False)
+        table.clear()
+
+        items = []
+        for s in stats.getStats():
+            item = QtWidgets.QTreeWidgetItem([
+                s.name,
+                str(s.count),
+                '{0:.2f}'.format(s.total * 1000.0),
+                '{0:.3f}'.format(s.mean() * 1000.0),
+                '{0:.3f}'.format(s.percentile(95) * 1000.0),
+                '{0:.3f}'.format(s.max * 1000.0),
+            ])
+            for column in range(1, len(StatsView.COLUMNS)):
+                item.setTextAlignment(column, Qt.AlignRight|Qt.AlignVCenter)
+            item.setToolTip(0, formatHistogram(s))
+            items.append(item)
+
+        table.addTopLevelItems(items)
+        table.setUpdatesEnabled(True)
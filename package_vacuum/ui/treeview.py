@@ -0,0 +1,408 @@
+import bisect
+
+import PySide.QtCore as QtCore
+from PySide.QtCore import Qt, Signal, Slot
+import PySide.QtWidgets as QtWidgets
+import PySide.QtGui as QtGui
+
+
+# one dotted name segment, `terminal` marks a listed module while other nodes
+# only group their descendants
+class ModuleTreeNode(object):
+    __slots__ = ('segment', 'parent', 'children', 'order', 'fetched', 'terminal', 'count', 'row')
+
+    def __init__(self, segment, parent):
+        self.segment = segment
+        self.parent = parent
+        self.children = {}
+        # child segments in display order, sorted on first fetch
+        self.order = None
+        # children exposed to the view so far
+        self.fetched = 0
+        self.terminal = False
+        # listed modules below this node
+        self.count = 0
+        self.row = 0
+
+    def name(self):
+        parts = []
+        node = self
+        while node.parent is not None:
+            parts.append(node.segment)
+            node = node.parent
+        return '.'.join(reversed(parts))
+
+    def childAt(self, row):
+        return self.children[self.order[row]]
+
+    def iterModules(self):
+        # names of listed modules in the subtree, pre-order and alphabetical
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if node.terminal:
+                yield node.name()
+            for segment in sorted(node.children, reverse=True):
+                stack.append(node.children[segment])
+
+
+# modules grouped by dotted namespace, the view only receives rows of expanded
+# nodes and those in batches through `canFetchMore`/`fetchMore`
+#
+# list changes are patched into the tree row by row, it is only rebuilt when
+# most of it changes at once
+class ModuleTreeModel(QtCore.QAbstractItemModel):
+    FETCH_BATCH = 200
+    REBUILD_RATIO = 0.5
+    GROUP_BRUSH = QtGui.QBrush(QtGui.QColor('#9A9A9A'))
+
+    def __init__(self, parent=None):
+        super(ModuleTreeModel, self).__init__(parent=parent)
+
+        self._root = ModuleTreeNode('', None)
+        self._names = set()
+
+    def _node(self, index):
+        return index.internalPointer() if index.isValid() else self._root
+
+    def _indexOf(self, node):
+        if node is self._root:
+            return QtCore.QModelIndex()
+        return self.createIndex(node.row, 0, node)
+
+    def _isExposed(self, node):
+        # the root or a row the view was given, along with all its ancestors
+        while node.parent is not None:
+            parent = node.parent
+            if parent.children.get(node.segment) is not node or node.row >= parent.fetched:
+                return False
+            node = parent
+        return True
+
+    # overrides #
+
+    def index(self, row, column, parent=QtCore.QModelIndex()):
+        node = self._node(parent)
+        if column != 0 or row < 0 or row >= node.fetched:
+            return QtCore.QModelIndex()
+        return self.createIndex(row, column, node.childAt(row))
+
+    def parent(self, index):
+        if not index.isValid():
+            return QtCore.QModelIndex()
+        parentNode = index.internalPointer().parent
+        if parentNode is None or parentNode is self._root:
+            return QtCore.QModelIndex()
+        return self.createIndex(parentNode.row, 0, parentNode)
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        if parent.column() > 0:
+            return 0
+        return self._node(parent).fetched
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 1
+
+    def hasChildren(self, parent=QtCore.QModelIndex()):
+        return bool(self._node(parent).children)
+
+    def canFetchMore(self, parent):
+        node = self._node(parent)
+        return node.fetched < len(node.children)
+
+    def fetchMore(self, parent):
+        node = self._node(parent)
+        if node.order is None:
+            node.order = sorted(node.children)
+            for row, segment in enumerate(node.order):
+                node.children[segment].row = row
+
+        remaining = len(node.children) - node.fetched
+        if remaining <= 0:
+            return
+
+        count = min(remaining, ModuleTreeModel.FETCH_BATCH)
+        self.beginInsertRows(parent, node.fetched, node.fetched + count - 1)
+        node.fetched += count
+        self.endInsertRows()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        node = index.internalPointer()
+        if role == Qt.DisplayRole:
+            descendants = node.count - (1 if node.terminal else 0)
+            if descendants > 0:
+                return '{0}  ({1})'.format(node.segment, descendants)
+            return node.segment
+        elif role == Qt.ToolTipRole:
+            return node.name()
+        elif role == Qt.ForegroundRole and not node.terminal:
+            return ModuleTreeModel.GROUP_BRUSH
+        return None
+
+    # custom api #
+
+    def _rebuild(self, names):
+        root = ModuleTreeNode('', None)
+        for name in names:
+            node = root
+            node.count += 1
+            for segment in name.split('.'):
+                child = node.children.get(segment)
+                if child is None:
+                    child = node.children[segment] = ModuleTreeNode(segment, node)
+                node = child
+                node.count += 1
+            node.terminal = True
+
+        self.beginResetModel()
+        self._root = root
+        self._names = names
+        self.endResetModel()
+
+    def _attach(self, parent, segment):
+        child = ModuleTreeNode(segment, parent)
+        if parent.order is None:
+            # rows are ordered on the first fetch
+            parent.children[segment] = child
+            return child
+
+        row = bisect.bisect_left(parent.order, segment)
+        exposed = row <= parent.fetched and self._isExposed(parent)
+        if exposed:
+            self.beginInsertRows(self._indexOf(parent), row, row)
+        parent.children[segment] = child
+        parent.order.insert(row, segment)
+        for r in range(row, len(parent.order)):
+            parent.children[parent.order[r]].row = r
+        if row <= parent.fetched:
+            parent.fetched += 1
+        if exposed:
+            self.endInsertRows()
+        return child
+
+    def _detach(self, node):
+        parent = node.parent
+        if parent.order is None:
+            del parent.children[node.segment]
+            return
+
+        row = node.row
+        exposed = row < parent.fetched and self._isExposed(parent)
+        if exposed:
+            self.beginRemoveRows(self._indexOf(parent), row, row)
+        del parent.children[node.segment]
+        del parent.order[row]
+        for r in range(row, len(parent.order)):
+            parent.children[parent.order[r]].row = r
+        if row < parent.fetched:
+            parent.fetched -= 1
+        if exposed:
+            self.endRemoveRows()
+
+    def _addName(self, name, touched):
+        node = self._root
+        node.count += 1
+        for segment in name.split('.'):
+            child = node.children.get(segment)
+            if child is None:
+                child = self._attach(node, segment)
+            node = child
+            node.count += 1
+            touched.add(node)
+        node.terminal = True
+
+    def _removeName(self, name, touched):
+        path = []
+        node = self._root
+        for segment in name.split('.'):
+            node = node.children[segment]
+            path.append(node)
+
+        path[-1].terminal = False
+        self._root.count -= 1
+        for node in path:
+            node.count -= 1
+
+        # the topmost node left without modules goes with its whole subtree
+        for node in path:
+            if node.count == 0:
+                self._detach(node)
+                break
+            touched.add(node)
+
+    def setItems(self, names):
+        names = set(names)
+        removed = self._names - names
+        added = names - self._names
+        if not removed and not added:
+            return
+
+        if len(removed) + len(added) > len(self._names) * ModuleTreeModel.REBUILD_RATIO:
+            self._rebuild(names)
+        else:
+            self.updateItems(added, removed)
+
+    def updateItems(self, added, removed):
+        # removals first, a replaced module is in both
+        touched = set()
+        for name in removed:
+            if name in self._names:
+                self._names.discard(name)
+                self._removeName(name, touched)
+        for name in added:
+            if name not in self._names:
+                self._names.add(name)
+                self._addName(name, touched)
+
+        # group counts and terminal flags of rows that stayed
+        for node in touched:
+            if self._isExposed(node):
+                index = self._indexOf(node)
+                self.dataChanged.emit(index, index)
+
+    def clear(self):
+        self.setItems(())
+
+    def getItems(self):
+        return sorted(self._names)
+
+    def moduleCount(self):
+        return self._root.count
+
+    def indexForName(self, name):
+        # fetches rows along the path as needed, invalid if the name is not in
+        # the tree
+        node = self._root
+        parent = QtCore.QModelIndex()
+        for segment in name.split('.'):
+            child = node.children.get(segment)
+            if child is None:
+                return QtCore.QModelIndex()
+            if node.order is None:
+                self.fetchMore(parent)
+            while node.fetched <= child.row:
+                self.fetchMore(parent)
+            parent = self.createIndex(child.row, 0, child)
+            node = child
+        return parent
+
+    def nameOf(self, index):
+        return self._node(index).name()
+
+    def fetchAll(self, parent=QtCore.QModelIndex()):
+        while self.canFetchMore(parent):
+            self.fetchMore(parent)
+
+    def modulesUnder(self, index):
+        return self._node(index).iterModules()
+
+
+# tree of listed modules, a selected package stands for its whole subtree so
+# selecting it never needs its children as rows
+class ModuleTreeView(QtWidgets.QTreeView):
+    RESTORE_LIMIT = 200
+
+    def __init__(self, parent=None):
+        super(ModuleTreeView, self).__init__(parent=parent)
+
+        self.setHeaderHidden(True)
+        self.setUniformRowHeights(True)
+        self.setSelectionMode(QtWidgets.QAbstractItemView.ExtendedSelection)
+        self.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAsNeeded)
+
+        self._expandedNames = []
+        self._selectedNames = []
+
+        model = ModuleTreeModel(parent=self)
+        self.setModel(model)
+        model.modelAboutToBeReset.connect(self._saveState)
+        model.modelReset.connect(self._restoreState)
+
+    def _isCovered(self, index):
+        # selected itself or through a selected ancestor
+        selectionModel = self.selectionModel()
+        while index.isValid():
+            if selectionModel.isSelected(index):
+                return True
+            index = index.parent()
+        return False
+
+    def drawRow(self, painter, option, index):
+        if not option.state & QtWidgets.QStyle.State_Selected and self._isCovered(index.parent()):
+            option = QtWidgets.QStyleOptionViewItem(option)
+            option.state |= QtWidgets.QStyle.State_Selected
+        super(ModuleTreeView, self).drawRow(painter, option, index)
+
+    def selectionChanged(self, selected, deselected):
+        super(ModuleTreeView, self).selectionChanged(selected, deselected)
+        # descendants shown as covered need a repaint as well
+        self.viewport().update()
+
+    def selectAll(self):
+        # top-level rows cover every module once all of them are fetched
+        self.model().fetchAll()
+        super(ModuleTreeView, self).selectAll()
+
+    def clear(self):
+        self.model().clear()
+
+    @Slot()
+    def _saveState(self):
+        # expanded and selected nodes survive a rebuild, as far as a few
+        # hundred of them
+        model = self.model()
+        self._selectedNames = [model.nameOf(i) for i in self.selectionModel().selectedRows()]
+        self._expandedNames = []
+        stack = [QtCore.QModelIndex()]
+        while stack and len(self._expandedNames) < ModuleTreeView.RESTORE_LIMIT:
+            parent = stack.pop()
+            for row in range(model.rowCount(parent)):
+                index = model.index(row, 0, parent)
+                if self.isExpanded(index):
+                    self._expandedNames.append(model.nameOf(index))
+                    stack.append(index)
+
+    @Slot()
+    def _restoreState(self):
+        model = self.model()
+        for name in self._expandedNames:
+            index = model.indexForName(name)
+            if index.isValid():
+                self.expand(index)
+
+        selection = QtCore.QItemSelection()
+        for name in self._selectedNames[:ModuleTreeView.RESTORE_LIMIT]:
+            index = model.indexForName(name)
+            if index.isValid():
+                selection.select(index, index)
+        self.selectionModel().select(selection, QtCore.QItemSelectionModel.ClearAndSelect)
+
+        self._expandedNames = []
+        self._selectedNames = []
+
+    def setItems(self, items):
+        self.model().setItems(items)
+
+    def updateItems(self, added, removed):
+        self.model().updateItems(added, removed)
+
+    def getItems(self):
+        return self.model().getItems()
+
+    def getSelection(self):
+        # listed modules of every selected subtree, each once
+        model = self.model()
+        names = []
+        seen = set()
+        for index in sorted(self.selectionModel().selectedRows(), key=lambda i: model.nameOf(i)):
+            if self._isCovered(index.parent()):
+                continue
+            for name in model.modulesUnder(index):
+                if name not in seen:
+                    seen.add(name)
+                    names.append(name)
+        return names
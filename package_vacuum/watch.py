@@ -0,0 +1,205 @@
+import os
+import os.path
+import threading
+import time
+
+import package_vacuum.module as module
+
+
+def getSourcePath(mod):
+    mpath = getattr(mod, module.KEY_MODULE_PATH, None)
+    if not mpath:
+        return None
+
+    if mpath.endswith(('.pyc', '.pyo')) and os.path.exists(mpath[:-1]):
+        mpath = mpath[:-1]
+    return module.normalizePath(mpath)
+
+def statFile(path):
+    try:
+        st = os.stat(path)
+        return (st.st_mtime, st.st_size)
+    except OSError:
+        return None
+
+
+# maps source files of non-internal modules to the modules loaded from them,
+# grouped by directory so a change notification only stats one directory's
+# worth of files
+#
+# shared between the gui thread and a polling thread, every access is locked
+class SourceWatchIndex(object):
+    def __init__(self, excludes=()):
+        self._lock = threading.Lock()
+        self._excludes = tuple(excludes)
+        self._files = {}
+        self._dirs = {}
+        self._moduleFiles = {}
+        self._generation = -1
+
+    def _isExcluded(self, name):
+        return any(name == e or name.startswith(e + '.') for e in self._excludes)
+
+    def _addModule(self, name, mod, addedFiles, addedDirs):
+        if self._isExcluded(name) or module.isInternalModule(mod):
+            return
+
+        path = getSourcePath(mod)
+        if path is None:
+            return
+
+        self._moduleFiles[name] = path
+        entry = self._files.get(path)
+        if entry is not None:
+            entry[1].add(name)
+            return
+
+        self._files[path] = [statFile(path), set([name])]
+        addedFiles.add(path)
+
+        directory = os.path.dirname(path)
+        files = self._dirs.get(directory)
+        if files is None:
+            self._dirs[directory] = set([path])
+            addedDirs.add(directory)
+        else:
+            files.add(path)
+
+    def _removeModule(self, name, removedFiles, removedDirs):
+        path = self._moduleFiles.pop(name, None)
+        if path is None:
+            return
+
+        entry = self._files[path]
+        entry[1].discard(name)
+        if entry[1]:
+            return
+
+        del self._files[path]
+        removedFiles.add(path)
+
+        directory = os.path.dirname(path)
+        files = self._dirs[directory]
+        files.discard(path)
+        if not files:
+            del self._dirs[directory]
+            removedDirs.add(directory)
+
+    def sync(self):
+        # follows the module table, returns (added, removed) directories that
+        # started and stopped holding watched files, then (added, removed)
+        # watched files
+        delta = None
+        if self._generation >= 0:
+            delta = module.getModuleChanges(self._generation)
+        else:
+            module.refreshModules()
+
+        table = module.gModuleTable
+        addedDirs = set()
+        removedDirs = set()
+        addedFiles = set()
+        removedFiles = set()
+
+        with self._lock:
+            if delta is None:
+                removedDirs.update(self._dirs)
+                removedFiles.update(self._files)
+                self._files = {}
+                self._dirs = {}
+                self._moduleFiles = {}
+                added = list(table.names())
+                removed = []
+            else:
+                added = delta.added
+                removed = delta.removed
+
+            for name in removed:
+                self._removeModule(name, removedFiles, removedDirs)
+
+            for name in added:
+                self._addModule(name, table.get(name), addedFiles, addedDirs)
+
+            self._generation = table.generation()
+
+        return (sorted(addedDirs - removedDirs), sorted(removedDirs - addedDirs),
+                sorted(addedFiles - removedFiles), sorted(removedFiles - addedFiles))
+
+    def directories(self):
+        with self._lock:
+            return list(self._dirs)
+
+    def fileCount(self):
+        with self._lock:
+            return len(self._files)
+
+    def hasFile(self, path):
+        with self._lock:
+            return path in self._files
+
+    def hasDirectory(self, directory):
+        with self._lock:
+            return directory in self._dirs
+
+    def checkFiles(self, paths):
+        # stats the given files and returns names of modules whose source changed
+        # since last check, stat calls run outside the lock
+        stats = [(p, statFile(p)) for p in paths]
+
+        changed = set()
+        with self._lock:
+            for path, stat in stats:
+                entry = self._files.get(path)
+                if entry is not None and entry[0] != stat:
+                    entry[0] = stat
+                    changed.update(entry[1])
+        return sorted(changed)
+
+    def checkDirectory(self, directory):
+        with self._lock:
+            paths = list(self._dirs.get(directory, ()))
+        return self.checkFiles(paths)
+
+
+# stat-polling fallback where no native file system notification is available,
+# files are stat-ed in small batches on a background thread and changes are
+# reported through `callback(names)` from that thread
+class PollingWatcher(threading.Thread):
+    BATCH_SIZE = 200
+    BATCH_PAUSE = 0.01
+    SWEEP_INTERVAL = 1.0
+
+    def __init__(self, index, callback, directories=None):
+        super(PollingWatcher, self).__init__(name='PackageVacuumPoller')
+        self.daemon = True
+
+        self._index = index
+        self._callback = callback
+        self._directories = directories
+        self._stopEvent = threading.Event()
+
+    def setDirectories(self, directories):
+        # None polls every directory of the index
+        self._directories = list(directories) if directories is not None else None
+
+    def stop(self):
+        self._stopEvent.set()
+
+    def run(self):
+        while not self._stopEvent.is_set():
+            started = time.time()
+
+            directories = self._directories
+            if directories is None:
+                directories = self._index.directories()
+
+            for i in range(0, len(directories), PollingWatcher.BATCH_SIZE):
+                changed = []
+                for directory in directories[i:i + PollingWatcher.BATCH_SIZE]:
+                    changed.extend(self._index.checkDirectory(directory))
+                if changed:
+                    self._callback(changed)
+                if self._stopEvent.wait(PollingWatcher.BATCH_PAUSE):
+                    return
+
+            self._stopEvent.wait(max(0.0, PollingWatcher.SWEEP_INTERVAL - (time.time() - started)))
@@ -0,0 +1,34 @@
+import os
+import sys
+import types
+
+import pytest
+
+# the package is used from a checkout, as Maya does through its script paths
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def fakeModules(monkeypatch):
+    # registers module objects in `sys.modules` for the duration of a test,
+    # returns the module registered last
+    def register(*names, **attributes):
+        mod = None
+        for name in names:
+            mod = types.ModuleType(name)
+            for key, value in attributes.items():
+                setattr(mod, key, value)
+            monkeypatch.setitem(sys.modules, name, mod)
+        return mod
+    return register
+
+
+@pytest.fixture(scope='session')
+def qtApplication():
+    # Qt tests run offscreen against the maya stand-ins of the benchmarks
+    from benchmarks import standins
+
+    if standins.findQtBinding() is None:
+        pytest.skip("no PySide2 or PySide6 found")
+    standins.installMayaStandins()
+    return standins.createApplication()
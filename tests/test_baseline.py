@@ -0,0 +1,55 @@
+import pytest
+
+import package_vacuum.module as module
+import package_vacuum.baseline as baseline
+
+
+@pytest.fixture(autouse=True)
+def baselines(monkeypatch):
+    monkeypatch.setattr(baseline, 'gBaselines', {})
+    return baseline.gBaselines
+
+
+def test_new_modules_are_the_ones_loaded_since_recording(fakeModules):
+    fakeModules('pvtest_before')
+    baseline.record('test')
+    fakeModules('pvtest_after.b', 'pvtest_after')
+
+    assert baseline.findNewModules('test') == ['pvtest_after', 'pvtest_after.b']
+
+def test_modules_of_this_tool_are_never_new(fakeModules):
+    baseline.record('test')
+    fakeModules('pvtest_after', module.SELF_MODULE_NAME + '.pvtest_lazy')
+
+    assert baseline.findNewModules('test') == ['pvtest_after']
+
+def test_recording_again_replaces_the_baseline(fakeModules):
+    baseline.record('test')
+    baseline.record('other')
+    fakeModules('pvtest_after')
+    baseline.record('test')
+
+    assert baseline.getBaselineNames() == ['other', 'test']
+    assert baseline.findNewModules('test') == []
+    assert baseline.findNewModules('other') == ['pvtest_after']
+
+def test_unknown_baseline_raises():
+    with pytest.raises(baseline.BaselineNotFoundException):
+        baseline.findNewModules('missing')
+
+    baseline.record('test')
+    assert baseline.removeBaseline('test')
+    assert not baseline.removeBaseline('test')
+
+def test_vacuum_to_baseline_cleans_new_modules(fakeModules):
+    baseline.record('test')
+    fakeModules('pvtest_after', 'pvtest_after.b', module.SELF_MODULE_NAME + '.pvtest_lazy')
+
+    result = baseline.vacuumToBaseline('test', ignoreInternal=False, dryRun=True)
+    assert result.cleaned == ['pvtest_after', 'pvtest_after.b']
+    assert result.skipped == []
+
+    result = baseline.vacuumToBaseline('test', ignoreInternal=False)
+    assert result.cleaned == ['pvtest_after', 'pvtest_after.b']
+    assert not module.hasModule('pvtest_after')
+    assert module.hasModule(module.SELF_MODULE_NAME + '.pvtest_lazy')
@@ -0,0 +1,65 @@
+import os
+import threading
+import types
+
+import package_vacuum.module as module
+
+
+def makeModule(name, path):
+    mod = types.ModuleType(name)
+    mod.__file__ = path
+    return mod
+
+
+def test_modules_under_a_root_are_internal(tmp_path):
+    root = str(tmp_path / 'maya')
+    classifier = module.InternalModuleClassifier([root])
+
+    assert classifier.isInternal(makeModule('a', os.path.join(root, 'lib', 'a.py')))
+    assert not classifier.isInternal(makeModule('b', str(tmp_path / 'studio' / 'b.py')))
+    # builtins have no file and are never cleaned
+    assert classifier.isInternal(types.ModuleType('c'))
+
+def test_root_changes_invalidate_cached_answers(tmp_path):
+    root = str(tmp_path / 'studio')
+    mod = makeModule('a', os.path.join(root, 'a.py'))
+    classifier = module.InternalModuleClassifier()
+
+    assert not classifier.isInternal(mod)
+    classifier.addRoot(root)
+    assert classifier.isInternal(mod)
+    classifier.removeRoot(root)
+    assert not classifier.isInternal(mod)
+
+def test_seeded_paths_are_trusted(tmp_path):
+    path = str(tmp_path / 'a.py')
+    classifier = module.InternalModuleClassifier()
+    classifier.seed({path: True})
+
+    assert classifier.isInternal(makeModule('a', path))
+    classifier.setRoots([])
+    assert not classifier.isInternal(makeModule('a', path))
+
+def test_classifying_while_roots_change_leaves_no_stale_answers(tmp_path):
+    root = str(tmp_path / 'studio')
+    modules = [makeModule('m{0}'.format(i), os.path.join(root, 'pkg{0}'.format(i % 7), 'm{0}.py'.format(i)))
+               for i in range(500)]
+    classifier = module.InternalModuleClassifier()
+    stop = threading.Event()
+
+    def classify():
+        while not stop.is_set():
+            for mod in modules:
+                classifier.isInternal(mod)
+
+    worker = threading.Thread(target=classify)
+    worker.start()
+    try:
+        for _ in range(50):
+            classifier.addRoot(root)
+            classifier.removeRoot(root)
+    finally:
+        stop.set()
+        worker.join()
+
+    assert not any(classifier.isInternal(mod) for mod in modules)
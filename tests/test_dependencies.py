@@ -0,0 +1,63 @@
+import sys
+
+import package_vacuum.module as module
+
+
+def makeGraph(fakeModules, references):
+    # `references` maps module names to the module names held in their globals
+    modules = dict((name, fakeModules(name)) for name in references)
+    for name, targets in references.items():
+        for target in targets:
+            setattr(modules[name], target.replace('.', '_'), modules[target])
+
+    table = module.ModuleTable()
+    table.refresh()
+    graph = module.DependencyGraph(table)
+    graph.update()
+    return graph
+
+
+def test_references_in_globals_are_dependencies(fakeModules):
+    graph = makeGraph(fakeModules, {'pvtest_app': ['pvtest_lib'], 'pvtest_lib': []})
+
+    assert graph.dependencies('pvtest_app') == set(['pvtest_lib'])
+    assert graph.dependents('pvtest_lib') == set(['pvtest_app'])
+
+def test_names_imported_from_a_module_are_dependencies(fakeModules):
+    graph = makeGraph(fakeModules, {'pvtest_app': [], 'pvtest_lib': []})
+    sys.modules['pvtest_app'].Thing = type('Thing', (object,), {'__module__': 'pvtest_lib'})
+    graph.update()
+
+    assert graph.dependencies('pvtest_app') == set(['pvtest_lib'])
+
+def test_removal_order_puts_dependents_first(fakeModules):
+    graph = makeGraph(fakeModules, {
+        'pvtest_ui': ['pvtest_rig', 'pvtest_core'],
+        'pvtest_rig': ['pvtest_core'],
+        'pvtest_core': [],
+    })
+
+    assert graph.removalOrder(['pvtest_core', 'pvtest_rig', 'pvtest_ui']) == ['pvtest_ui', 'pvtest_rig', 'pvtest_core']
+    # dependencies outside the given names don't take part
+    assert graph.removalOrder(['pvtest_core', 'pvtest_ui']) == ['pvtest_ui', 'pvtest_core']
+
+def test_removal_order_breaks_cycles(fakeModules):
+    graph = makeGraph(fakeModules, {
+        'pvtest_a': ['pvtest_b'],
+        'pvtest_b': ['pvtest_a'],
+        'pvtest_c': ['pvtest_a'],
+    })
+
+    order = graph.removalOrder(['pvtest_a', 'pvtest_b', 'pvtest_c'])
+    assert sorted(order) == ['pvtest_a', 'pvtest_b', 'pvtest_c']
+    assert order.index('pvtest_c') < order.index('pvtest_a')
+
+def test_closure_collects_transitive_dependents(fakeModules):
+    graph = makeGraph(fakeModules, {
+        'pvtest_ui': ['pvtest_rig'],
+        'pvtest_rig': ['pvtest_core'],
+        'pvtest_core': [],
+        'pvtest_other': [],
+    })
+
+    assert graph.closure(['pvtest_core']) == set(['pvtest_core', 'pvtest_rig', 'pvtest_ui'])
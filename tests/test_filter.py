@@ -0,0 +1,42 @@
+import pytest
+
+import package_vacuum.module as module
+
+
+def matching(expression, names):
+    match = module.compileFilter(expression)
+    return [name for name in names if match(name)]
+
+
+NAMES = ['rig', 'rig.core', 'rig.tests', 'rig.core.tests', 'anim.rig2', 'anim.curves']
+
+
+def test_plain_text_matches_anywhere_in_names():
+    assert matching('rig', NAMES) == ['rig', 'rig.core', 'rig.tests', 'rig.core.tests', 'anim.rig2']
+
+def test_glob_matches_whole_names():
+    assert matching('rig.*', NAMES) == ['rig.core', 'rig.tests', 'rig.core.tests']
+    assert matching('anim.rig?', NAMES) == ['anim.rig2']
+
+def test_regular_expressions_match_anywhere():
+    assert matching(r're:rig\d', NAMES) == ['anim.rig2']
+    assert matching(r'/^anim\./', NAMES) == ['anim.rig2', 'anim.curves']
+
+def test_negated_terms_drop_matches():
+    assert matching('rig, !*.tests', NAMES) == ['rig', 'rig.core', 'anim.rig2']
+    # only negations keep everything else
+    assert matching('!rig*', NAMES) == ['anim.rig2', 'anim.curves']
+
+def test_any_positive_term_is_enough():
+    assert matching('curves, rig.core', NAMES) == ['rig.core', 'rig.core.tests', 'anim.curves']
+
+def test_empty_expression_matches_everything():
+    assert matching('', NAMES) == NAMES
+    assert matching(' , ', NAMES) == NAMES
+
+def test_invalid_regular_expression_raises():
+    with pytest.raises(module.InvalidFilterException):
+        module.compileFilter('re:rig(')
+
+def test_compiled_filters_are_reused():
+    assert module.compileFilter('rig, !*.tests') is module.compileFilter('rig, !*.tests')
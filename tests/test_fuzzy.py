@@ -0,0 +1,144 @@
+import sys
+import random
+import threading
+
+import package_vacuum.module as module
+import package_vacuum.fuzzy as fuzzy
+
+
+NAMES = [
+    'rig',
+    'rig.controls',
+    'rig.controls.ctrl_utils',
+    'rig.core',
+    'anim.core',
+    'anim.curves.util',
+    'tools.mesh_tools.retopo',
+]
+
+
+def makeSnapshot(names=NAMES):
+    names = sorted(names)
+    lowers = [n.lower() for n in names]
+    return fuzzy.FuzzySnapshot(names, lowers, [fuzzy.getBoundaries(l) for l in lowers])
+
+def bruteForceIsSubsequence(lower, query):
+    it = iter(lower)
+    return all(c in it for c in query)
+
+
+def test_match_prefers_segment_starts():
+    lower = 'rig.controls.ctrl_utils'
+    assert fuzzy.matchPositions(lower, fuzzy.getBoundaries(lower), 'cu') == [4, 18]
+
+def test_match_keeps_the_rest_of_the_query_fitting():
+    # the segment start `c` of `core` would leave no room for `x`
+    lower = 'a.cx.core'
+    assert fuzzy.matchPositions(lower, fuzzy.getBoundaries(lower), 'cx') == [2, 3]
+
+def test_match_of_missing_query_is_none():
+    assert fuzzy.matchPositions('rig.core', fuzzy.getBoundaries('rig.core'), 'zz') is None
+    assert fuzzy.score('rig.core', fuzzy.getBoundaries('rig.core'), 'eo') is None
+
+def test_candidate_pattern_matches_subsequences():
+    for query in ('rc', 'r.c', 'ctu', 'oo', 'z', 'a]-^\\'):
+        match = fuzzy.compileCandidatePattern(query).match
+        for lower in NAMES + ['a]b-^\\c']:
+            assert (match(lower) is not None) == bruteForceIsSubsequence(lower, query)
+
+def test_search_ranks_segment_matches_first():
+    names = [name for name, _ in makeSnapshot().search('core')]
+    assert names[:2] == ['anim.core', 'rig.core']
+
+    names = [name for name, _ in makeSnapshot().search('ctu')]
+    assert names[0] == 'rig.controls.ctrl_utils'
+
+def test_search_breaks_ties_by_name():
+    names = [name for name, _ in makeSnapshot(['b.x', 'a.x', 'c.x']).search('x')]
+    assert names == ['a.x', 'b.x', 'c.x']
+
+def test_search_ignores_case_and_whitespace_and_honours_limit():
+    snapshot = makeSnapshot()
+    assert snapshot.search('RIG core') == snapshot.search('rigcore')
+    assert len(snapshot.search('r', limit=2)) == 2
+    assert snapshot.search('  ') == []
+
+def test_search_accept_vetoes_names():
+    names = [name for name, _ in makeSnapshot().search('core', accept=lambda name: name.startswith('anim'))]
+    assert names == ['anim.core']
+
+def test_search_cancelled_returns_none():
+    assert makeSnapshot().search('r', isCancelled=lambda: True) is None
+
+def test_prefix_cache_belongs_to_the_caller():
+    snapshot = makeSnapshot()
+    first = fuzzy.FuzzySearchCache()
+    second = fuzzy.FuzzySearchCache()
+
+    snapshot.search('an', cache=first)
+    assert first.query == 'an'
+    assert second.query is None
+
+    # an unrelated search of another caller doesn't change what the first
+    # one's extended query finds
+    snapshot.search('rig', cache=second)
+    assert snapshot.search('anc', cache=first) == snapshot.search('anc')
+
+def test_prefix_cache_of_another_snapshot_is_not_used():
+    cache = fuzzy.FuzzySearchCache()
+    makeSnapshot(['anim.core']).search('a', cache=cache)
+
+    names = [name for name, _ in makeSnapshot().search('an', cache=cache)]
+    assert names == [name for name, _ in makeSnapshot().search('an')]
+
+def test_concurrent_searches_with_own_caches_agree():
+    snapshot = makeSnapshot()
+    expected = snapshot.search('rc')
+    results = []
+
+    def search():
+        cache = fuzzy.FuzzySearchCache()
+        for query in ('r', 'rc', 'a', 'rc'):
+            result = snapshot.search(query, cache=cache)
+        results.append(result)
+
+    threads = [threading.Thread(target=search) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == [expected] * 4
+
+def test_index_snapshot_follows_table_deltas(fakeModules, monkeypatch):
+    table = module.ModuleTable()
+    table.refresh()
+    index = fuzzy.FuzzyIndex(table)
+
+    snapshot = index.snapshot()
+    assert index.snapshot() is snapshot
+
+    fakeModules('pvtest_fuzzy.widget')
+    table.refresh()
+    snapshot = index.snapshot()
+    assert [name for name, _ in snapshot.search('pvtestfuzzywidget')] == ['pvtest_fuzzy.widget']
+
+    monkeypatch.delitem(sys.modules, 'pvtest_fuzzy.widget')
+    table.refresh()
+    assert index.snapshot().search('pvtestfuzzywidget') == []
+    # snapshots taken before stay as they were
+    assert len(snapshot.search('pvtestfuzzywidget')) == 1
+
+def test_pruned_search_matches_full_ranking():
+    generator = random.Random(7)
+    names = sorted({'.'.join(''.join(generator.choice('abc_') for _ in range(generator.randint(1, 4)))
+                             for _ in range(generator.randint(1, 4))) for _ in range(400)})
+    snapshot = makeSnapshot(names)
+
+    for query in ('a', 'ab', 'b.c', 'abc', 'c_a', 'bb'):
+        ranked = []
+        for name in names:
+            s = fuzzy.score(name, fuzzy.getBoundaries(name), query)
+            if s is not None:
+                ranked.append((-s, name))
+        expected = [(name, -s) for s, name in sorted(ranked)[:20]]
+        assert snapshot.search(query, limit=20) == expected
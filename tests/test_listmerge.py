@@ -0,0 +1,49 @@
+import itertools
+import random
+
+import pytest
+
+from package_vacuum.ui.listmerge import isSortedUnique, canMerge, findRemoveRuns, findInsertRuns, mergeSorted
+
+
+def test_is_sorted_unique():
+    assert isSortedUnique([])
+    assert isSortedUnique(['a', 'b', 'c'])
+    assert not isSortedUnique(['b', 'a'])
+    assert not isSortedUnique(['a', 'a'])
+
+def test_ranked_list_is_never_merged():
+    # fuzzy results are ranked, a sorted list following them must rebuild
+    assert not canMerge(['b', 'a'], ['a', 'b'])
+    assert not canMerge(['a', 'b'], ['b', 'a'])
+    assert not canMerge([], ['a'])
+    assert canMerge(['a', 'c'], ['a', 'b'])
+
+def test_runs():
+    items = ['a', 'b', 'c', 'd', 'e']
+    assert findRemoveRuns(items, {'a', 'd'}) == [(1, 2), (4, 4)]
+    assert findInsertRuns(['b', 'd'], ['a', 'b', 'c', 'd', 'e', 'f']) == [(0, 0), (2, 2), (4, 5)]
+
+@pytest.mark.parametrize('seed', range(20))
+def test_merge_matches_new_items(seed):
+    rng = random.Random(seed)
+    names = ['m{0:02d}'.format(i) for i in range(40)]
+    old = sorted(rng.sample(names, rng.randint(1, 40)))
+    new = sorted(rng.sample(names, rng.randint(1, 40)))
+    assert mergeSorted(old, new) == new
+
+def test_merge_keeps_survivor_order():
+    for old, new in itertools.product([['a'], ['a', 'c'], ['b', 'c', 'd']], [['a', 'b'], ['c'], ['a', 'b', 'c', 'd']]):
+        assert mergeSorted(old, new) == new
+
+
+def test_selection_model_rebuilds_after_ranked_items(qtApplication):
+    # regression: a sorted list following ranked fuzzy results was merged into
+    # them, leaving duplicated and stale rows
+    from package_vacuum.ui.selectionview import SelectionListModel
+
+    model = SelectionListModel()
+    model.setItems(['b', 'a'])
+    model.setItems(['a', 'b'])
+    assert model.getItems() == ['a', 'b']
+    assert model.rowCount() == 2
@@ -0,0 +1,69 @@
+import os
+
+import pytest
+
+from package_vacuum.ui.logstore import LogStore
+
+
+@pytest.fixture
+def store():
+    store = LogStore()
+    yield store
+    store.close()
+
+
+def makeRecords(start, stop):
+    return [('message {0}'.format(i), i % 4) for i in range(start, stop)]
+
+
+def test_rows_are_paged_back_from_disk(store):
+    count = LogStore.PAGE_SIZE * (LogStore.CACHED_PAGES + 2) + 10
+    store.append(makeRecords(0, count))
+
+    assert len(store) == count
+    # every page read once, in both directions, the cache stays bounded
+    for row in list(range(0, count, 97)) + list(range(count - 1, 0, -131)):
+        assert store.get(row) == ('message {0}'.format(row), row % 4)
+    assert len(store._pages) <= LogStore.CACHED_PAGES
+
+def test_appends_across_a_page_boundary(store):
+    store.append(makeRecords(0, LogStore.PAGE_SIZE - 1))
+    store.append(makeRecords(LogStore.PAGE_SIZE - 1, LogStore.PAGE_SIZE + 1))
+
+    assert store.get(LogStore.PAGE_SIZE - 1) == makeRecords(LogStore.PAGE_SIZE - 1, LogStore.PAGE_SIZE)[0]
+    assert store.get(LogStore.PAGE_SIZE) == makeRecords(LogStore.PAGE_SIZE, LogStore.PAGE_SIZE + 1)[0]
+
+def test_line_breaks_and_backslashes_survive(store):
+    messages = ['two\nlines', 'C:\\temp\\new', 'tab\tand\r\n', u'caf\u00e9']
+    store.append([(m, 0) for m in messages] + makeRecords(0, LogStore.PAGE_SIZE))
+
+    assert [store.get(row)[0] for row in range(len(messages))] == messages
+
+def test_search_is_case_insensitive(store):
+    store.append([('Cleaned module: [ rig ]', 0), ('skipped', 1), ('cleaned module: [ anim ]', 0)])
+
+    assert list(store.search('CLEANED')) == [0, 2]
+
+def test_clear_starts_over(store):
+    store.append(makeRecords(0, LogStore.PAGE_SIZE * 2))
+    store.clear()
+    store.append([('fresh', 1)])
+
+    assert len(store) == 1
+    assert store.get(0) == ('fresh', 1)
+    assert list(store.search('message')) == []
+
+def test_closing_removes_a_temporary_file():
+    store = LogStore()
+    path = store.path()
+    store.append(makeRecords(0, 3))
+    store.close()
+
+    assert not os.path.exists(path)
+
+def test_closing_keeps_a_given_file(tmp_path):
+    path = str(tmp_path / 'history.log')
+    store = LogStore(path)
+    store.close()
+
+    assert os.path.exists(path)
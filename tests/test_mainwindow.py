@@ -0,0 +1,41 @@
+import pytest
+
+import package_vacuum.module as module
+
+
+@pytest.fixture
+def window(qtApplication, monkeypatch, tmp_path):
+    from package_vacuum.ui.main import MainWindow
+
+    monkeypatch.setenv('PACKAGE_VACUUM_CACHE', str(tmp_path / 'metadata.sqlite'))
+    window = MainWindow()
+    window.show()
+    yield window
+    window.close()
+    window.deleteLater()
+
+
+def logMessages(window):
+    store = window._logView.model()._store
+    return [store.get(row)[0] for row in range(len(store))]
+
+
+def test_reload_is_available_again_after_reopening(window, fakeModules, tmp_path, monkeypatch):
+    source = tmp_path / 'pvtest_reloaded.py'
+    source.write_text(u'x = 1\n')
+    fakeModules('pvtest_reloaded', __file__=str(source))
+    monkeypatch.setattr(module, 'gInternalClassifier', module.InternalModuleClassifier())
+
+    widgets = window._clearByNameWidgets
+    widgets.userInput.setText('pvtest_reloaded')
+    window.cleanAndReloadByUserInput()
+    assert not widgets.reloadButton.isEnabled()
+
+    # a second click while warming up is logged, not dropped silently
+    window.cleanAndReloadByUserInput()
+    assert "a reload is already running, [ pvtest_reloaded ] is not reloaded" in logMessages(window)
+
+    # closing cancels the warm-up, its result never comes back
+    window.close()
+    window.show()
+    assert widgets.reloadButton.isEnabled()
@@ -0,0 +1,96 @@
+import os
+import time
+import threading
+
+import pytest
+
+import package_vacuum.module as module
+import package_vacuum.metacache as metacache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return metacache.MetadataCache(str(tmp_path / 'cache' / 'metadata.sqlite'))
+
+@pytest.fixture
+def sources(tmp_path, fakeModules, monkeypatch):
+    # two loaded modules with sources in their own directories, the one
+    # under `internal` is internal
+    monkeypatch.setattr(module, 'gInternalClassifier', module.InternalModuleClassifier([str(tmp_path / 'internal')]))
+    paths = {}
+    for name, directory in (('pvtest_meta_studio', 'studio'), ('pvtest_meta_internal', 'internal')):
+        os.makedirs(str(tmp_path / directory))
+        path = str(tmp_path / directory / (name + '.py'))
+        open(path, 'w').close()
+        fakeModules(name, __file__=path)
+        paths[name] = path
+    return paths
+
+
+def test_round_trip(cache, sources):
+    assert cache.save('fp', metacache.collectMetadata(), time.time())
+
+    entries = cache.load('fp')
+    assert entries['pvtest_meta_studio'].path == sources['pvtest_meta_studio']
+    assert not entries['pvtest_meta_studio'].internal
+    assert entries['pvtest_meta_internal'].internal
+    assert entries['pvtest_meta_internal'].parent == ''
+    assert cache.load('other') == {}
+
+def test_changed_directory_invalidates_its_modules(cache, sources):
+    cache.save('fp', metacache.collectMetadata(), time.time())
+
+    studio = os.path.dirname(sources['pvtest_meta_studio'])
+    mtime = os.stat(studio).st_mtime_ns
+    os.utime(studio, ns=(mtime + 10 ** 9, mtime + 10 ** 9))
+
+    entries = cache.load('fp')
+    assert 'pvtest_meta_studio' not in entries
+    assert 'pvtest_meta_internal' in entries
+
+def test_least_recently_saved_fingerprints_are_dropped(cache, sources):
+    entries = metacache.collectMetadata()
+    for i in range(metacache.MAX_FINGERPRINTS + 1):
+        cache.save('fp{0}'.format(i), entries, float(i))
+
+    assert cache.load('fp0') == {}
+    assert cache.load('fp1') != {}
+
+def test_background_store_is_restored(cache, sources, monkeypatch):
+    monkeypatch.setattr(metacache, 'gStoreThread', None)
+    metacache.storeInBackground(cache).join()
+
+    # a fresh session under the same roots
+    monkeypatch.setattr(module, 'gInternalClassifier', module.InternalModuleClassifier(module.getInternalRoots()))
+    assert metacache.restore(cache) >= 2
+    assert module.isInternalModule(module.gModuleTable.get('pvtest_meta_internal'))
+
+    # other roots make another fingerprint, nothing is restored
+    monkeypatch.setattr(module, 'gInternalClassifier', module.InternalModuleClassifier())
+    assert metacache.restore(cache) == 0
+
+def test_disabled_cache_is_neither_read_nor_written(cache, sources, monkeypatch):
+    monkeypatch.setattr(metacache, 'gStoreThread', None)
+    metacache.storeInBackground(cache).join()
+
+    monkeypatch.setenv(metacache.ENV_NO_CACHE, '1')
+    assert metacache.restore(cache) == 0
+    assert metacache.storeInBackground(cache) is None
+
+    monkeypatch.setattr(metacache, 'gEnabled', True)
+    assert metacache.restore(cache) >= 2
+
+def test_store_is_skipped_while_one_is_running(cache, sources, monkeypatch):
+    release = threading.Event()
+    running = threading.Thread(target=release.wait)
+    running.start()
+    monkeypatch.setattr(metacache, 'gStoreThread', running)
+    try:
+        assert metacache.storeInBackground(cache) is None
+    finally:
+        release.set()
+        running.join()
+
+    thread = metacache.storeInBackground(cache)
+    assert thread.daemon
+    thread.join()
@@ -0,0 +1,44 @@
+import pytest
+
+
+@pytest.fixture
+def selectionView(qtApplication):
+    from package_vacuum.ui.selectionview import SelectionView
+    view = SelectionView()
+    yield view
+    view.deleteLater()
+
+
+def test_view_events_never_reach_the_editor_filter(selectionView):
+    import PySide.QtCore as QtCore
+    import PySide.QtGui as QtGui
+
+    delegate = selectionView.itemDelegate()
+    closed = []
+    delegate.commitData.connect(closed.append)
+    delegate.closeEditor.connect(lambda *args: closed.append(args))
+
+    assert not delegate.eventFilter(selectionView, QtGui.QFocusEvent(QtCore.QEvent.FocusOut))
+    assert closed == []
+
+def test_widest_text_follows_the_items(selectionView):
+    model = selectionView.model()
+    model.setItems(['a', 'bbb', 'cc'])
+    assert model.widestText() == 'bbb'
+
+    model.updateItems(['dddd'], [])
+    assert model.widestText() == 'dddd'
+    model.updateItems([], ['dddd', 'bbb'])
+    assert model.widestText() == 'cc'
+    model.clear()
+    assert model.widestText() == ''
+
+def test_uniform_rows_are_sized_by_the_widest_text(selectionView):
+    model = selectionView.model()
+    delegate = selectionView.itemDelegate()
+    model.setItems(['a', 'a' * 40])
+    wide = delegate._maxWidth
+
+    model.updateItems([], ['a' * 40])
+    assert delegate._maxWidth < wide
+    assert delegate._maxWidth == delegate.textWidth('a')
@@ -0,0 +1,137 @@
+import gc
+import sys
+import types
+import weakref
+
+import package_vacuum.module as module
+
+
+def makeTable():
+    table = module.ModuleTable()
+    table.refresh()
+    return table
+
+
+def test_refresh_reports_added_and_removed_names(fakeModules, monkeypatch):
+    table = makeTable()
+    fakeModules('pvtest_a', 'pvtest_a.b')
+
+    delta = table.refresh()
+    assert delta.added == ['pvtest_a', 'pvtest_a.b']
+    assert delta.removed == []
+
+    monkeypatch.delitem(sys.modules, 'pvtest_a.b')
+    delta = table.refresh()
+    assert delta.added == []
+    assert delta.removed == ['pvtest_a.b']
+    assert 'pvtest_a.b' not in table
+
+def test_refresh_without_changes_is_empty():
+    table = makeTable()
+    assert table.refresh().isEmpty()
+    assert table.generation() == table.refresh().generation
+
+def test_replaced_module_is_removed_and_added(fakeModules):
+    table = makeTable()
+    first = fakeModules('pvtest_replaced')
+    table.refresh()
+
+    second = fakeModules('pvtest_replaced')
+    delta = table.refresh()
+    assert delta.added == ['pvtest_replaced']
+    assert delta.removed == ['pvtest_replaced']
+    assert table.get('pvtest_replaced') is second
+    assert first is not second
+
+def test_replaced_module_reusing_id_is_detected(fakeModules):
+    table = makeTable()
+    fakeModules('pvtest_reused')
+    table.refresh()
+
+    # what the weak reference callback reports once the old module is gone
+    table._collected.add('pvtest_reused')
+    delta = table.refresh()
+    assert delta.added == ['pvtest_reused']
+    assert delta.removed == ['pvtest_reused']
+
+def test_table_keeps_no_module_alive():
+    table = makeTable()
+    sys.modules['pvtest_released'] = types.ModuleType('pvtest_released')
+    table.refresh()
+
+    ref = weakref.ref(sys.modules.pop('pvtest_released'))
+    gc.collect()
+    assert ref() is None
+    assert table.get('pvtest_released') is None
+
+def test_get_resolves_live_module(fakeModules):
+    table = makeTable()
+    fakeModules('pvtest_live')
+    table.refresh()
+
+    live = types.ModuleType('pvtest_live')
+    sys.modules['pvtest_live'] = live
+    assert table.get('pvtest_live') is live
+
+def test_discard_notifies_listeners_and_history(fakeModules, monkeypatch):
+    table = makeTable()
+    fakeModules('pvtest_discarded')
+    table.refresh()
+    generation = table.generation()
+
+    deltas = []
+    table.addListener(deltas.append)
+    monkeypatch.delitem(sys.modules, 'pvtest_discarded')
+    table.discard('pvtest_discarded')
+    assert [d.removed for d in deltas] == [['pvtest_discarded']]
+
+    table.refresh()
+    assert table.changesSince(generation).removed == ['pvtest_discarded']
+
+def test_changes_since_merges_history(fakeModules, monkeypatch):
+    table = makeTable()
+    generation = table.generation()
+
+    fakeModules('pvtest_one')
+    table.refresh()
+    fakeModules('pvtest_two')
+    table.refresh()
+    monkeypatch.delitem(sys.modules, 'pvtest_one')
+    table.refresh()
+
+    delta = table.changesSince(generation)
+    assert delta.added == ['pvtest_two']
+    assert delta.removed == []
+
+def test_changes_since_too_old_generation():
+    table = makeTable()
+    for i in range(module.ModuleTable.HISTORY_SIZE + 2):
+        sys.modules['pvtest_history'] = types.ModuleType('pvtest_history')
+        table.refresh()
+    del sys.modules['pvtest_history']
+    table.refresh()
+    assert table.changesSince(0) is None
+
+
+def test_index_follows_table_deltas(fakeModules, monkeypatch):
+    table = makeTable()
+    index = module.ModuleIndex()
+    table.addListener(index.applyDelta)
+
+    fakeModules('pvtest_ns', 'pvtest_ns.a', 'pvtest_ns.a.b', 'pvtest_ns.c')
+    table.refresh()
+    assert list(index.iterNamespace('pvtest_ns')) == ['pvtest_ns', 'pvtest_ns.a', 'pvtest_ns.a.b', 'pvtest_ns.c']
+
+    monkeypatch.delitem(sys.modules, 'pvtest_ns.a.b')
+    table.refresh()
+    assert list(index.iterNamespace('pvtest_ns.a')) == ['pvtest_ns.a']
+    assert list(index.iterNamespace('pvtest_ns.a.b')) == []
+
+def test_names_are_a_snapshot(fakeModules):
+    table = makeTable()
+    names = table.names()
+
+    fakeModules('pvtest_later')
+    table.refresh()
+    assert 'pvtest_later' not in names
+    assert 'pvtest_later' in table.names()
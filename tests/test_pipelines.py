@@ -0,0 +1,78 @@
+import time
+
+
+def waitFor(condition, timeout=5.0):
+    import PySide.QtCore as QtCore
+
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        QtCore.QCoreApplication.processEvents()
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def test_precompile_works_again_after_a_shutdown(qtApplication, tmp_path):
+    from package_vacuum.ui.precompilepipeline import PrecompilePipeline
+
+    source = tmp_path / 'pvtest_precompiled.py'
+    source.write_text(u'x = 1\n')
+    pipeline = PrecompilePipeline()
+    reports = []
+    pipeline.compiled.connect(reports.append)
+
+    pipeline.submit([str(source)])
+    assert waitFor(lambda: reports)
+    pipeline.shutdown()
+
+    # the window is shown again with the same pipeline
+    del reports[:]
+    pipeline.submit([str(source)])
+    assert waitFor(lambda: reports)
+    pipeline.shutdown()
+
+def test_reclaim_reports_come_back_traced(qtApplication, fakeModules):
+    import weakref
+
+    import package_vacuum.reclaim as reclaim
+    from package_vacuum.ui.reclaimpipeline import ReclaimPipeline
+
+    held = fakeModules('pvtest_traced')
+    report = reclaim.ReclaimReport()
+    report.survivors = [('pvtest_traced', [])]
+    pipeline = ReclaimPipeline()
+    reports = []
+    pipeline.reportReady.connect(reports.append)
+
+    pipeline.submit(report, [('pvtest_traced', weakref.ref(held))])
+    assert waitFor(lambda: reports)
+    assert reports[0].survivors[0][1] != []
+
+    # reports still being traced when the window closes are dropped
+    del reports[:]
+    pipeline.submit(report, [('pvtest_traced', weakref.ref(held))])
+    pipeline.shutdown()
+    waitFor(lambda: reports, timeout=0.2)
+    assert reports == []
+
+def test_size_requests_hold_no_modules(qtApplication, fakeModules):
+    import types
+
+    import package_vacuum.module as module
+    from package_vacuum.ui.sizeanalysis import SizeAnalysisPipeline
+
+    fakeModules('pvtest_sized', 'pvtest_sized.a')
+    module.refreshModules()
+    pipeline = SizeAnalysisPipeline()
+    requests = []
+    pipeline.analysisRequested.connect(requests.append)
+    try:
+        pipeline.submit(['pvtest_sized.a', 'pvtest_absent'])
+    finally:
+        pipeline.shutdown()
+
+    # a module cleaned while the request waits for the worker can go
+    request = requests[0]
+    assert request.names == ['pvtest_sized.a']
+    assert request.packages == {'pvtest_sized': ['pvtest_sized', 'pvtest_sized.a']}
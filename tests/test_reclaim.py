@@ -0,0 +1,37 @@
+import weakref
+
+import package_vacuum.module as module
+import package_vacuum.reclaim as reclaim
+
+
+def cleanHeld(fakeModules, monkeypatch, tmp_path, count=1):
+    # cleans `count` modules while a module left loaded keeps them alive
+    monkeypatch.setattr(module, 'gInternalClassifier', module.InternalModuleClassifier())
+    holder = fakeModules('pvtest_holder', __file__=str(tmp_path / 'holder.py'))
+    for i in range(count):
+        name = 'pvtest_held{0}'.format(i)
+        setattr(holder, name, fakeModules(name, __file__=str(tmp_path / (name + '.py'))))
+    return module.vacuum(['pvtest_held{0}'.format(i) for i in range(count)], reclaim=True)
+
+
+def test_collect_only_lists_survivors(fakeModules, monkeypatch, tmp_path):
+    result = cleanHeld(fakeModules, monkeypatch, tmp_path)
+
+    report, survivors = reclaim.collect([result])
+    assert report.modules == 1
+    assert report.survivors == [('pvtest_held0', [])]
+    assert [(name, type(ref)) for name, ref in survivors] == [('pvtest_held0', weakref.ref)]
+
+def test_traced_survivors_name_their_referrers(fakeModules, monkeypatch, tmp_path):
+    result = cleanHeld(fakeModules, monkeypatch, tmp_path)
+
+    report = reclaim.traceSurvivors(*reclaim.collect([result]))
+    assert report.survivors == [('pvtest_held0', ["global 'pvtest_held0' of [ pvtest_holder ]"])]
+
+def test_only_a_few_survivors_are_traced(fakeModules, monkeypatch, tmp_path):
+    result = cleanHeld(fakeModules, monkeypatch, tmp_path, count=reclaim.MAX_TRACED + 2)
+
+    report = reclaim.measure([result])
+    traced = [name for name, referrers in report.survivors if referrers]
+    assert len(report.survivors) == reclaim.MAX_TRACED + 2
+    assert len(traced) == reclaim.MAX_TRACED
@@ -0,0 +1,71 @@
+import os
+import sys
+import time
+
+import package_vacuum.module as module
+from package_vacuum.watch import SourceWatchIndex
+
+
+def writeSource(path, text):
+    # rewrites the file in place, as editors saving without a temporary file do
+    with open(path, 'r+' if os.path.exists(path) else 'w') as f:
+        f.seek(0)
+        f.truncate()
+        f.write(text)
+
+def waitFor(condition, timeout=5.0):
+    import PySide.QtCore as QtCore
+
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        QtCore.QCoreApplication.processEvents()
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def test_index_sync_reports_files_and_directories(fakeModules, tmp_path, monkeypatch):
+    source = tmp_path / 'pvtest_watched.py'
+    writeSource(str(source), 'x = 1\n')
+    monkeypatch.setattr(module, 'gInternalClassifier', module.InternalModuleClassifier())
+
+    index = SourceWatchIndex()
+    index.sync()
+    fakeModules('pvtest_watched', __file__=str(source))
+
+    addedDirs, removedDirs, addedFiles, removedFiles = index.sync()
+    path = module.normalizePath(str(source))
+    assert addedDirs == [os.path.dirname(path)]
+    assert addedFiles == [path]
+    assert removedDirs == removedFiles == []
+    assert index.hasFile(path)
+
+    monkeypatch.delitem(sys.modules, 'pvtest_watched')
+    assert index.sync() == ([], [os.path.dirname(path)], [], [path])
+    assert not index.hasFile(path)
+
+def test_writes_in_place_are_reported(qtApplication, fakeModules, tmp_path, monkeypatch):
+    from package_vacuum.ui.sourcewatcher import SourceWatcher
+
+    source = tmp_path / 'pvtest_inplace.py'
+    writeSource(str(source), 'x = 1\n')
+    monkeypatch.setattr(module, 'gInternalClassifier', module.InternalModuleClassifier())
+    fakeModules('pvtest_inplace', __file__=str(source))
+
+    watcher = SourceWatcher()
+    changed = []
+    watcher.modulesChanged.connect(changed.extend)
+    watcher.start()
+    try:
+        # a different size tells the change apart even within one mtime tick
+        writeSource(str(source), 'x = 22\n')
+        assert waitFor(lambda: changed)
+        assert changed == ['pvtest_inplace']
+
+        # the file stays watched after the first change
+        del changed[:]
+        writeSource(str(source), 'x = 333\n')
+        assert waitFor(lambda: changed)
+    finally:
+        watcher.stop()
@@ -0,0 +1,50 @@
+import pytest
+
+import package_vacuum.module as module
+import package_vacuum.stats as stats
+
+
+@pytest.fixture
+def recording():
+    stats.reset()
+    stats.enable()
+    yield
+    stats.disable()
+    stats.reset()
+
+
+def test_every_public_module_function_is_timed(recording):
+    names = stats.getModuleFunctions()
+    assert 'vacuum' in names and 'refreshModules' in names
+    assert not [name for name in names if name.startswith('_')]
+    # classes and imported helpers are left alone
+    assert 'ModuleTable' not in names and 'InternalModuleClassifier' not in names
+
+    for name in names:
+        assert getattr(module, name).__wrapped__ is stats.gPatched[name]
+
+def test_disable_restores_the_original_functions():
+    original = module.vacuum
+    stats.enable()
+    stats.disable()
+    assert module.vacuum is original
+
+def test_timed_calls_are_recorded(recording):
+    module.hasModule('sys')
+    assert [s.count for s in stats.getStats() if s.name == 'module.hasModule'] == [1]
+
+def test_timed_slots_drop_extra_signal_arguments(recording):
+    class Window(object):
+        @stats.timed('Window.onChanged')
+        def onChanged(self):
+            return True
+
+        @stats.timed('Window.onText')
+        def onText(self, *args):
+            return args
+
+    window = Window()
+    # a signal with a text argument connected to a slot taking none
+    assert Window.onChanged(window, 'text')
+    assert window.onText('a', 'b') == ('a', 'b')
+    assert sorted(s.name for s in stats.getStats()) == ['Window.onChanged', 'Window.onText']
@@ -0,0 +1,110 @@
+import random
+
+import pytest
+
+
+@pytest.fixture
+def treeModel(qtApplication):
+    from package_vacuum.ui.treeview import ModuleTreeModel
+    return ModuleTreeModel()
+
+
+def visibleRows(model, parent=None):
+    # (name, display text) of every row the view was given, depth first
+    import PySide.QtCore as QtCore
+
+    parent = parent or QtCore.QModelIndex()
+    rows = []
+    for row in range(model.rowCount(parent)):
+        index = model.index(row, 0, parent)
+        rows.append((model.nameOf(index), model.data(index)))
+        rows.extend(visibleRows(model, index))
+    return rows
+
+def fetchEverything(model, parent=None):
+    import PySide.QtCore as QtCore
+
+    parent = parent or QtCore.QModelIndex()
+    model.fetchAll(parent)
+    for row in range(model.rowCount(parent)):
+        fetchEverything(model, model.index(row, 0, parent))
+
+
+def test_small_changes_are_patched_without_a_reset(treeModel):
+    treeModel.setItems(['a', 'a.b', 'a.c', 'd'])
+    fetchEverything(treeModel)
+
+    resets = []
+    inserted = []
+    removed = []
+    treeModel.modelReset.connect(lambda: resets.append(True))
+    treeModel.rowsInserted.connect(lambda parent, first, last: inserted.append(treeModel.nameOf(treeModel.index(first, 0, parent))))
+    treeModel.rowsAboutToBeRemoved.connect(lambda parent, first, last: removed.append(treeModel.nameOf(treeModel.index(first, 0, parent))))
+
+    treeModel.updateItems(['a.bb'], ['a.c'])
+    assert resets == []
+    assert inserted == ['a.bb']
+    assert removed == ['a.c']
+    assert visibleRows(treeModel) == [('a', 'a  (2)'), ('a.b', 'b'), ('a.bb', 'bb'), ('d', 'd')]
+
+def test_patched_tree_matches_a_rebuilt_one(qtApplication):
+    from package_vacuum.ui.treeview import ModuleTreeModel
+
+    generator = random.Random(3)
+    universe = sorted(set('.'.join(generator.choice('abcd') for _ in range(generator.randint(1, 4))) for _ in range(400)))
+    patched = ModuleTreeModel()
+    names = set(universe[::2])
+    patched.setItems(names)
+    fetchEverything(patched)
+
+    for _ in range(20):
+        added = set(generator.sample(universe, 5)) - names
+        removed = set(generator.sample(sorted(names), 5))
+        patched.updateItems(added, removed)
+        names = (names - removed) | added
+        assert patched.getItems() == sorted(names)
+        assert patched.moduleCount() == len(names)
+
+    rebuilt = ModuleTreeModel()
+    rebuilt.setItems(names)
+    fetchEverything(rebuilt)
+    fetchEverything(patched)
+    assert visibleRows(patched) == visibleRows(rebuilt)
+
+def test_unfetched_rows_are_patched_quietly(treeModel):
+    import PySide.QtCore as QtCore
+
+    treeModel.setItems(['pkg.{0:03d}'.format(i) for i in range(10)])
+    signals = []
+    treeModel.rowsInserted.connect(lambda *args: signals.append(args))
+
+    # children of `pkg` were never fetched, the view hears nothing of them
+    treeModel.updateItems(['pkg.new'], ['pkg.003'])
+    assert signals == []
+
+    package = treeModel.indexForName('pkg')
+    treeModel.fetchAll(package)
+    names = [treeModel.nameOf(treeModel.index(r, 0, package)) for r in range(treeModel.rowCount(package))]
+    assert 'pkg.new' in names and 'pkg.003' not in names
+
+def test_emptied_package_is_removed_with_its_subtree(treeModel):
+    treeModel.setItems(['a.b.c', 'a.b.d', 'e'])
+    fetchEverything(treeModel)
+
+    treeModel.updateItems([], ['a.b.c', 'a.b.d'])
+    assert visibleRows(treeModel) == [('e', 'e')]
+
+def test_view_keeps_expanded_rows_across_updates(qtApplication):
+    from package_vacuum.ui.treeview import ModuleTreeView
+
+    view = ModuleTreeView()
+    view.setItems(['a.b', 'a.c', 'd'])
+    model = view.model()
+    view.expand(model.indexForName('a'))
+
+    view.updateItems(['a.e'], ['a.c'])
+    assert view.isExpanded(model.indexForName('a'))
+
+    # most of the tree changing rebuilds it, expanded rows are restored
+    view.setItems(['a.b', 'a.x', 'f', 'g', 'h'])
+    assert view.isExpanded(model.indexForName('a'))
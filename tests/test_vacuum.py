@@ -0,0 +1,64 @@
+import sys
+
+import pytest
+
+import package_vacuum.module as module
+
+
+@pytest.fixture
+def studio(fakeModules, monkeypatch, tmp_path):
+    # `pvtest_rig` under a studio path, `pvtest_rig.maya` under the internal root
+    monkeypatch.setattr(module, 'gInternalClassifier', module.InternalModuleClassifier([str(tmp_path / 'maya')]))
+    fakeModules('pvtest_rig', 'pvtest_rig.core', __file__=str(tmp_path / 'studio' / 'rig.py'))
+    fakeModules('pvtest_rig.maya', __file__=str(tmp_path / 'maya' / 'rig.py'))
+
+
+def test_namespace_is_cleaned_without_internal_modules(studio):
+    result = module.vacuum('pvtest_rig')
+
+    assert result.cleaned == ['pvtest_rig', 'pvtest_rig.core']
+    assert result.skipped == [('pvtest_rig.maya', module.SkipReason.INTERNAL)]
+    assert 'pvtest_rig.core' not in sys.modules
+    assert 'pvtest_rig.maya' in sys.modules
+
+def test_internal_modules_are_cleaned_when_asked(studio):
+    result = module.vacuum('pvtest_rig', ignoreInternal=False)
+
+    assert result.cleaned == ['pvtest_rig', 'pvtest_rig.core', 'pvtest_rig.maya']
+    assert result.skipped == []
+
+def test_modules_of_this_tool_are_never_cleaned(studio):
+    result = module.vacuum(['package_vacuum', 'package_vacuum.module', 'pvtest_rig.core'], cascade=False)
+
+    assert result.cleaned == ['pvtest_rig.core']
+    assert result.skipped == [('package_vacuum', module.SkipReason.SELF),
+                              ('package_vacuum.module', module.SkipReason.SELF)]
+    assert 'package_vacuum.module' in sys.modules
+
+def test_patterns_without_modules_are_missing(studio):
+    result = module.vacuum(['pvtest_absent', ' ', 'pvtest_rig.co'])
+
+    assert result.cleaned == []
+    assert result.missing == ['pvtest_absent', 'pvtest_rig.co']
+
+def test_without_cascade_only_exact_names_are_cleaned(studio):
+    result = module.vacuum('pvtest_rig', cascade=False)
+
+    assert result.cleaned == ['pvtest_rig']
+    assert 'pvtest_rig.core' in sys.modules
+
+def test_dependents_are_cleaned_before_their_dependencies(studio, fakeModules, tmp_path):
+    tool = fakeModules('pvtest_tool', __file__=str(tmp_path / 'studio' / 'tool.py'))
+    tool.core = sys.modules['pvtest_rig.core']
+
+    result = module.vacuum('pvtest_rig.core', dependents=True)
+
+    assert result.cleaned == ['pvtest_tool', 'pvtest_rig.core']
+    assert 'pvtest_tool' not in sys.modules
+
+def test_dry_run_leaves_modules_loaded(studio):
+    result = module.vacuum('pvtest_rig', dryRun=True)
+
+    assert result.dryRun
+    assert result.cleaned == ['pvtest_rig', 'pvtest_rig.core']
+    assert 'pvtest_rig' in sys.modules and 'pvtest_rig.core' in sys.modules
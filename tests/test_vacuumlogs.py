@@ -0,0 +1,31 @@
+import package_vacuum.module as module
+
+
+def formatLogs(result):
+    from package_vacuum.ui.main import MainWindow
+    return MainWindow._formatVacuumLogs(None, result, "module [ {0} ] is not loaded")
+
+
+def test_all_internal_matches_warn_that_nothing_was_cleaned(qtApplication):
+    from package_vacuum.ui.logview import LogLevel
+
+    result = module.VacuumResult()
+    result.skipped = [('maya.cmds', module.SkipReason.INTERNAL), ('maya.mel', module.SkipReason.INTERNAL)]
+
+    assert formatLogs(result) == [("nothing cleaned, 2 matching modules are internal", LogLevel.WARNING)]
+
+def test_internal_skips_beside_cleaned_modules_are_quiet(qtApplication):
+    result = module.VacuumResult()
+    result.cleaned = ['rig']
+    result.skipped = [('maya.cmds', module.SkipReason.INTERNAL)]
+
+    assert [message for message, _ in formatLogs(result)] == ["cleaned module: [ rig ]"]
+
+def test_vacuum_of_internal_namespace_reports_internal_skips(fakeModules, monkeypatch, tmp_path):
+    fakeModules('pvtest_internal', 'pvtest_internal.b', __file__=str(tmp_path / 'maya' / 'm.py'))
+    monkeypatch.setattr(module, 'gInternalClassifier', module.InternalModuleClassifier([str(tmp_path / 'maya')]))
+
+    result = module.vacuum('pvtest_internal', ignoreInternal=True)
+    assert result.cleaned == []
+    assert result.skipped == [('pvtest_internal', module.SkipReason.INTERNAL),
+                              ('pvtest_internal.b', module.SkipReason.INTERNAL)]